@@ -1,3 +1,4 @@
+import os
 import sys
 
 from rich.panel import Panel
@@ -8,9 +9,12 @@ from src.utils.print import (
     console,
     print_blank,
     print_confirm,
+    print_llm_summary,
     print_prompt,
     print_text,
 )
+from src.utils.personality_pool import pool_from_env
+from src.utils.tracing import tracer
 
 console.clear()
 
@@ -53,7 +57,7 @@ def main():
         print_text("Please enter a number between 1 and 5")
 
     print_text(f"Adding {player_count} AI players to the game...")
-    handler = ResistanceCoupGameHandler(int(player_count))
+    handler = ResistanceCoupGameHandler(int(player_count), personality_pool=pool_from_env())
 
     console.print()
     game_ready = print_confirm("Ready to start?")
@@ -88,6 +92,12 @@ def main():
 
             end_state = handler.handle_turn(turn_count)
 
+        # Where the time and tokens of this game went
+        print_llm_summary(tracer.summary())
+        if trace_file := os.environ.get("COUP_LLM_TRACE_FILE"):
+            tracer.export_jsonl(trace_file)
+        tracer.clear()
+
         console.print()
         game_ready = print_confirm("Want to play again?")
 
@@ -0,0 +1,47 @@
+import argparse
+
+from rich.table import Table
+
+from src.handler.tournament import run_tournament
+from src.utils.print import print_table, print_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a headless tournament of AI-only games")
+    parser.add_argument("--players", type=int, default=4, help="Number of AI players per game")
+    parser.add_argument("--games", type=int, default=10000, help="Number of games to play")
+    parser.add_argument("--seed", default="0", help="Tournament seed")
+    parser.add_argument(
+        "--processes", type=int, default=None, help="Worker processes (defaults to CPU count)"
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="Run games on the compact array-backed engine"
+    )
+    parser.add_argument(
+        "--batch", action="store_true", help="Run games on the vectorized NumPy simulator"
+    )
+    args = parser.parse_args()
+
+    print_text(f"Playing {args.games} games with {args.players} AI players...")
+    if args.batch:
+        # Imported here as numpy is an optional dependency
+        from src.handler.batch_simulation import simulate_batch
+
+        stats = simulate_batch(args.players, args.games, seed=args.seed)
+    else:
+        stats = run_tournament(
+            args.players, args.games, seed=args.seed, processes=args.processes, compact=args.compact
+        )
+
+    table = Table("Player", "Wins", "Win rate")
+    for name, win_rate in stats.win_rates.items():
+        table.add_row(name, str(stats.wins[name]), f"{win_rate:.2%}")
+    print_table(table)
+
+    print_text(f"Average turns per game: {stats.average_turns:.2f}")
+    if stats.unfinished_games:
+        print_text(f"Unfinished games (turn limit reached): {stats.unfinished_games}")
+
+
+if __name__ == "__main__":
+    main()
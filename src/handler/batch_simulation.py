@@ -0,0 +1,355 @@
+"""
+Vectorized simulator that plays thousands of AI-only games in lockstep as NumPy arrays.
+
+Every array has one row per game that is still running: coins and hands per player (cards as codes
+of CompactGameState, -1 marks lost influence), the number of cards of each type in the deck, the
+treasury and the current player. Each step plays one turn of every game with the random policy of
+AIPlayer, resolving challenges, counters and actions with masks instead of branches. Shuffled deck
+draws are drawn from the deck composition, which gives the same distribution.
+
+NumPy is an optional dependency, it is only needed when this module is imported.
+"""
+import random
+from typing import Dict, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError(
+        "The batch simulator needs numpy, install it with `poetry install --extras batch`"
+    ) from error
+
+from src.handler.simulation import DEFAULT_MAX_TURNS, ai_player_name, simulate_games
+from src.handler.tournament import TournamentStats
+from src.models.compact_state import (
+    ACTION_CAN_BE_CHALLENGED,
+    ACTION_CAN_BE_COUNTERED,
+    ACTION_CARD,
+    ACTION_REQUIRES_TARGET,
+    ACTIONS,
+    ASSASSINATE,
+    COUNTER_CARD,
+    COUP,
+    DECK_COMPOSITION,
+    EXCHANGE,
+    FOREIGN_AID,
+    HAND_SIZE,
+    INCOME,
+    STEAL,
+    TAX,
+    available_actions,
+)
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Same odds as AIPlayer
+CHALLENGE_PROBABILITY = 0.2
+COUNTER_PROBABILITY = 0.1
+
+_LOST = -1
+
+# Available actions per coin bracket (< 3, < 7, < 10, 10+), padded to the longest list
+_BRACKET_COINS = (0, 3, 7, 10)
+_BRACKET_ACTIONS = [available_actions(coins) for coins in _BRACKET_COINS]
+_ACTION_TABLE = np.array(
+    [list(actions) + [actions[0]] * (len(ACTIONS) - len(actions)) for actions in _BRACKET_ACTIONS]
+)
+_ACTION_COUNTS = np.array([len(actions) for actions in _BRACKET_ACTIONS])
+
+_CAN_BE_CHALLENGED = np.array(ACTION_CAN_BE_CHALLENGED)
+_CAN_BE_COUNTERED = np.array(ACTION_CAN_BE_COUNTERED)
+_REQUIRES_TARGET = np.array(ACTION_REQUIRES_TARGET)
+_ACTION_CARD = np.frombuffer(ACTION_CARD, dtype=np.uint8).astype(np.int64)
+_COUNTER_CARD = np.frombuffer(COUNTER_CARD, dtype=np.uint8).astype(np.int64)
+
+
+class _BatchGames:
+    """The state of a batch of games, see the module docstring"""
+
+    def __init__(self, number_of_players: int, number_of_games: int, rng: "np.random.Generator"):
+        self.rng = rng
+        self.number_of_players = number_of_players
+
+        deck = np.repeat(np.arange(len(DECK_COMPOSITION)), DECK_COMPOSITION)
+        shuffled = rng.permuted(np.tile(deck, (number_of_games, 1)), axis=1)
+        dealt = HAND_SIZE * number_of_players
+
+        self.hands = shuffled[:, :dealt].reshape(number_of_games, number_of_players, HAND_SIZE)
+        self.deck = np.zeros((number_of_games, len(DECK_COMPOSITION)), dtype=np.int64)
+        for card in range(len(DECK_COMPOSITION)):
+            self.deck[:, card] = (shuffled[:, dealt:] == card).sum(axis=1)
+
+        self.coins = np.full((number_of_games, number_of_players), 2, dtype=np.int64)
+        self.treasury = np.full(number_of_games, 50 - 2 * number_of_players, dtype=np.int64)
+        self.current = rng.integers(0, number_of_players, number_of_games)
+
+    def __len__(self) -> int:
+        return len(self.current)
+
+    def keep(self, rows: "np.ndarray") -> None:
+        """Drop every game but the given ones"""
+        for name in ("hands", "deck", "coins", "treasury", "current"):
+            setattr(self, name, getattr(self, name)[rows])
+
+    def influence(self) -> "np.ndarray":
+        return (self.hands != _LOST).sum(axis=2)
+
+    def _pick(self, eligible: "np.ndarray") -> "np.ndarray":
+        """A uniformly random eligible column of every row"""
+        count = eligible.sum(axis=1)
+        nth = self.rng.integers(0, np.maximum(count, 1)) + 1
+        return ((eligible.cumsum(axis=1) == nth[:, None]) & eligible).argmax(axis=1)
+
+    def _others(self, rows: "np.ndarray", players: "np.ndarray") -> "np.ndarray":
+        """Active players of the given games, except the given players"""
+        eligible = (self.hands[rows] != _LOST).any(axis=2)
+        eligible[np.arange(len(rows)), players] = False
+        return eligible
+
+    def choose_actions(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        rows = np.arange(len(self))
+        coins = self.coins[rows, self.current]
+        bracket = np.searchsorted(_BRACKET_COINS, coins, side="right") - 1
+        others = self._others(rows, self.current)
+
+        actions = np.empty(len(rows), dtype=np.int64)
+        targets = np.empty(len(rows), dtype=np.int64)
+        pending = rows
+        while len(pending):
+            # Can't steal from player with 0 coins, draw again like AIPlayer does
+            index = self.rng.integers(0, _ACTION_COUNTS[bracket[pending]])
+            actions[pending] = _ACTION_TABLE[bracket[pending], index]
+            targets[pending] = self._pick(others[pending])
+            invalid = (actions[pending] == STEAL) & (self.coins[pending, targets[pending]] == 0)
+            pending = pending[invalid]
+
+        targets[~_REQUIRES_TARGET[actions]] = _LOST
+        return actions, targets
+
+    def poll(self, rows: "np.ndarray", excluded: "np.ndarray", probability: float) -> "np.ndarray":
+        """The first player in seat order that says yes, -1 if nobody does"""
+        eligible = self._others(rows, excluded)
+        yes = eligible & (self.rng.random(eligible.shape) < probability)
+        return np.where(yes.any(axis=1), yes.argmax(axis=1), _LOST)
+
+    def has_card(
+        self, rows: "np.ndarray", players: "np.ndarray", cards: "np.ndarray"
+    ) -> "np.ndarray":
+        return (self.hands[rows, players] == cards[:, None]).any(axis=1)
+
+    def lose_card(self, rows: "np.ndarray", players: "np.ndarray") -> None:
+        """Remove a random card of the given players, if they have any left"""
+        live = self.hands[rows, players] != _LOST
+        both = live.all(axis=1)
+        slots = np.where(both, self.rng.integers(0, HAND_SIZE, len(rows)), live.argmax(axis=1))
+        has_any = live.any(axis=1)
+        self.hands[rows[has_any], players[has_any], slots[has_any]] = _LOST
+
+    def draw(self, rows: "np.ndarray") -> "np.ndarray":
+        deck = self.deck[rows]
+        position = self.rng.integers(0, deck.sum(axis=1))
+        cards = (deck.cumsum(axis=1) > position[:, None]).argmax(axis=1)
+        self.deck[rows, cards] -= 1
+        return cards
+
+    def swap_card(self, rows: "np.ndarray", players: "np.ndarray", cards: "np.ndarray") -> None:
+        """The revealed card goes back into the deck and the player draws a new one"""
+        slots = (self.hands[rows, players] == cards[:, None]).argmax(axis=1)
+        self.deck[rows, cards] += 1
+        self.hands[rows, players, slots] = self.draw(rows)
+
+    def challenge(
+        self, rows: "np.ndarray", claimants: "np.ndarray", cards: "np.ndarray"
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Resolve the challenges of the given claims, returns who challenged and who was right"""
+        challengers = self.poll(rows, claimants, CHALLENGE_PROBABILITY)
+        challenged = challengers != _LOST
+        held = np.zeros(len(rows), dtype=bool)
+        held[challenged] = self.has_card(rows[challenged], claimants[challenged], cards[challenged])
+
+        defended = challenged & held
+        self.lose_card(rows[defended], challengers[defended])
+        self.swap_card(rows[defended], claimants[defended], cards[defended])
+
+        bluffed = challenged & ~held
+        self.lose_card(rows[bluffed], claimants[bluffed])
+        return challenged, held
+
+    def take_coins(self, rows: "np.ndarray", amount: int) -> None:
+        taken = np.minimum(amount, self.treasury[rows])
+        self.treasury[rows] -= taken
+        self.coins[rows, self.current[rows]] += taken
+
+    def exchange(self, rows: "np.ndarray") -> None:
+        players = self.current[rows]
+        hands = self.hands[rows, players]
+        live = hands != _LOST
+        kept = live.sum(axis=1)
+
+        # Keep a random subset of the hand and the 2 drawn cards, like AIPlayer's shuffle
+        cards = np.concatenate([hands, self.draw(rows)[:, None], self.draw(rows)[:, None]], axis=1)
+        keys = self.rng.random(cards.shape)
+        keys[:, :HAND_SIZE][~live] = 2.0
+        shuffled = np.take_along_axis(cards, keys.argsort(axis=1), axis=1)
+
+        index = np.arange(len(rows))
+        for offset in range(2):
+            returned = shuffled[index, kept + offset]
+            self.deck[rows, returned] += 1
+
+        first_slot = np.where(kept == 2, 0, live.argmax(axis=1))
+        self.hands[rows, players, first_slot] = shuffled[:, 0]
+        both = kept == 2
+        self.hands[rows[both], players[both], 1] = shuffled[both, 1]
+
+    def execute(
+        self,
+        rows: "np.ndarray",
+        actions: "np.ndarray",
+        targets: "np.ndarray",
+        countered: "np.ndarray",
+    ) -> None:
+        actors = self.current[rows]
+
+        self.take_coins(rows[actions == INCOME], 1)
+        self.take_coins(rows[(actions == FOREIGN_AID) & ~countered], 2)
+        self.take_coins(rows[actions == TAX], 3)
+
+        for action, cost in ((COUP, 7), (ASSASSINATE, 3)):
+            paid = actions == action
+            self.coins[rows[paid], actors[paid]] -= cost
+            self.treasury[rows[paid]] += cost
+
+            hit = paid & ~countered
+            self.lose_card(rows[hit], targets[hit])
+
+        steal = (actions == STEAL) & ~countered
+        stolen = np.minimum(self.coins[rows[steal], targets[steal]], 2)
+        self.coins[rows[steal], targets[steal]] -= stolen
+        self.coins[rows[steal], actors[steal]] += stolen
+
+        self.exchange(rows[actions == EXCHANGE])
+
+    def play_turn(self) -> "np.ndarray":
+        """Play a turn of every game, returns the chosen actions"""
+        rows = np.arange(len(self))
+        actors = self.current
+        actions, targets = self.choose_actions()
+
+        # Opportunity to challenge the action, a failed challenge skips the counter phase
+        execute = np.ones(len(rows), dtype=bool)
+        countered = np.zeros(len(rows), dtype=bool)
+        may_counter = _CAN_BE_COUNTERED[actions]
+
+        claimed = _CAN_BE_CHALLENGED[actions]
+        challenged, held = self.challenge(
+            rows[claimed], actors[claimed], _ACTION_CARD[actions[claimed]]
+        )
+        execute[claimed] = ~challenged | held
+        may_counter[claimed] &= ~challenged
+
+        # Opportunity to counter, and to challenge the counter
+        countering = np.full(len(rows), _LOST)
+        countering[may_counter] = self.poll(
+            rows[may_counter], actors[may_counter], COUNTER_PROBABILITY
+        )
+        countered_rows = rows[countering != _LOST]
+        counter_challenged, counter_held = self.challenge(
+            countered_rows, countering[countered_rows], _COUNTER_CARD[actions[countered_rows]]
+        )
+        countered[countered_rows] = ~counter_challenged | counter_held
+
+        self.execute(rows[execute], actions[execute], targets[execute], countered[execute])
+
+        # Defeated players give their coins back to the treasury
+        defeated = self.influence() == 0
+        self.treasury += (self.coins * defeated).sum(axis=1)
+        self.coins[defeated] = 0
+
+        # Next active player
+        offsets = (
+            self.current[:, None] + np.arange(1, self.number_of_players + 1)
+        ) % self.number_of_players
+        alive = ~np.take_along_axis(defeated, offsets, axis=1)
+        self.current = offsets[rows, alive.argmax(axis=1)]
+        return actions
+
+
+def _numpy_seed(seed: Optional[Union[int, str]]) -> Optional[int]:
+    # String seeds (e.g. game_seed) are reduced to an int the same way random.Random does
+    return None if seed is None else random.Random(seed).getrandbits(64)
+
+
+def simulate_batch(
+    number_of_players: int,
+    number_of_games: int,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    seed: Optional[Union[int, str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> TournamentStats:
+    """Play AI-only games in batches of `batch_size` vectorized games and aggregate the results"""
+    rng = np.random.default_rng(_numpy_seed(seed))
+    stats = TournamentStats()
+    histogram = np.zeros(len(ACTIONS), dtype=np.int64)
+    wins = np.zeros(number_of_players, dtype=np.int64)
+
+    for start in range(0, number_of_games, batch_size):
+        games = _BatchGames(number_of_players, min(batch_size, number_of_games - start), rng)
+        stats.games += len(games)
+
+        turn_count = 0
+        while len(games) and turn_count < max_turns:
+            turn_count += 1
+            histogram += np.bincount(games.play_turn(), minlength=len(ACTIONS))
+
+            active = games.influence() > 0
+            finished = active.sum(axis=1) == 1
+            wins += np.bincount(active[finished].argmax(axis=1), minlength=number_of_players)
+            stats.total_turns += turn_count * int(finished.sum())
+            games.keep(np.flatnonzero(~finished))
+
+        stats.unfinished_games += len(games)
+        stats.total_turns += turn_count * len(games)
+
+    stats.wins = {ai_player_name(seat): int(count) for seat, count in enumerate(wins) if count}
+    stats.action_histogram = {
+        ACTIONS[ind].action_type: int(count) for ind, count in enumerate(histogram) if count
+    }
+    return stats
+
+
+def _summary(stats: TournamentStats, number_of_players: int) -> Dict[str, float]:
+    total_actions = sum(stats.action_histogram.values()) or 1
+    summary = {
+        "average_turns": stats.average_turns,
+        "unfinished_rate": stats.unfinished_games / max(stats.games, 1),
+    }
+    for seat in range(number_of_players):
+        name = ai_player_name(seat)
+        summary[f"win_rate[{name}]"] = stats.wins.get(name, 0) / max(stats.games, 1)
+    for action in ACTIONS:
+        summary[f"action_share[{action.action_type.value}]"] = (
+            stats.action_histogram.get(action.action_type, 0) / total_actions
+        )
+    return summary
+
+
+def parity_report(
+    number_of_players: int,
+    number_of_games: int,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    seed: Optional[Union[int, str]] = 0,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Play the same number of games with ResistanceCoupGameHandler and with the batch simulator,
+    and return each statistic (average turns, win rate per seat, share of each action) as a
+    (handler, batch) pair. Both play the random AIPlayer policy, so the pairs only differ by noise.
+    """
+    handler_stats = TournamentStats()
+    for result in simulate_games(number_of_players, number_of_games, max_turns, seed):
+        handler_stats.add_result(result)
+    batch_stats = simulate_batch(number_of_players, number_of_games, max_turns, seed)
+
+    handler_summary = _summary(handler_stats, number_of_players)
+    batch_summary = _summary(batch_stats, number_of_players)
+    return {name: (handler_summary[name], batch_summary[name]) for name in handler_summary}
@@ -1,20 +1,27 @@
+import asyncio
 import random
+from collections import Counter, defaultdict
+from concurrent.futures import Future
 from enum import Enum
-from typing import List, Optional, Tuple, Union
-
-import names
+from typing import Callable, Coroutine, DefaultDict, Dict, List, Optional, Tuple, Union
 
 from src.models.action import Action, ActionType, CounterAction, get_counter_action
 from src.models.card import Card, build_deck
+from src.models.compact_state import CompactGameState, to_cards
+from src.models.event import GameEvent, GameEventType
 from src.models.players.ai import AIPlayer
 from src.models.players.base import BasePlayer
 from src.models.players.human import HumanPlayer
 from src.models.players.agent import AgentPlayer
+from src.models.players.mcts import MCTSPlayer
 from src.utils.game_state import generate_players_table, generate_state_panel, generate_player_panel, generate_str_panel
 
 from src.utils.print import (
     build_action_report_string,
     build_counter_report_string,
+    deferred_output,
+    flush_output,
+    live_panel,
     print_confirm,
     print_panel,
     print_table,
@@ -22,14 +29,15 @@ from src.utils.print import (
     print_texts, print_panel_with_title,
 )
 
-from src.utils.api_interface import client
-from aiohttp import ClientSession
-import os
-import asyncio
+from src.utils.api_interface import llm
+from src.utils.event_log import EventLog
+from src.utils.event_loop import run_sync
+from src.utils.personality_pool import GENDERS, PersonalityPool, generate_personality, random_name
+from src.utils.tracing import held_records, set_trace_turn, trace_context, tracer
 
-from dotenv import load_dotenv
 
-load_dotenv()
+# Maximum number of agent LLM calls that run at the same time while reacting to an event
+DEFAULT_MAX_CONCURRENCY = 8
 
 
 class ChallengeResult(Enum):
@@ -39,61 +47,89 @@ class ChallengeResult(Enum):
 
 
 class ResistanceCoupGameHandler:
-    _players: List[BasePlayer] = []
-    _current_player_index = 0
-    _deck: List[Card] = []
-    _number_of_players: int = 0
-    _treasury: int = 0
+    def __init__(
+            self,
+            number_of_players: int,
+            players: Optional[List[BasePlayer]] = None,
+            seed: Optional[Union[int, str]] = None,
+            max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+            concurrent_polling: bool = False,
+            speculate: bool = True,
+            stream_conversation: bool = True,
+            personality_pool: Optional[PersonalityPool] = None,
+            event_log: Optional[EventLog] = None,
+    ):
 
-    def __init__(self, number_of_players: int):
+        # All game state lives on the instance, so any number of handlers can run side by side
+        self._players: List[BasePlayer] = []
+        self._current_player_index = 0
+        self._deck: List[Card] = []
+        self._number_of_players = number_of_players
+        self._treasury = 0
 
         self.turn_count = None
-        self._number_of_players = number_of_players
-        asyncio.run(self.initialize_players())
+        self._random = random.Random(seed)
+        self._max_concurrency = max_concurrency
+        self._concurrent_polling = concurrent_polling
+        self._stream_conversation = stream_conversation
+        self._personality_pool = personality_pool
+        self._event_log = event_log
+        self._observers: List[BasePlayer] = []
+        # Events the observers only get once the agents reacted to them, see _action_phase
+        self._deferred_events: List[GameEvent] = []
+        self._action_histogram: Counter = Counter()
+
+        # While a human is choosing, agents already react to the action the human most likely picks.
+        # Only human turns are speculated on, so games without a HumanPlayer never speculate
+        self._speculate = speculate
+        self._speculation: Optional[Tuple[tuple, Future]] = None
+        self._player_action_counts: DefaultDict[str, Counter] = defaultdict(Counter)
+        self.speculation_stats: Counter = Counter()
+
+        # Pre-built players (e.g. for headless simulations) skip the personality generation
+        self._pending_players: Optional[Future] = None
+        if players is not None:
+            self._players = list(players)
+            self._number_of_players = len(self._players)
+            return
+
+        # Personalities are generated in the background, setup_game waits for them
+        self._pending_players = llm.submit(self.initialize_players())
+
+    async def initialize_players(self) -> List[AgentPlayer]:
+        # A pool hands out pre-generated personalities instantly, the LLM is only used to top it up
+        if self._personality_pool is not None:
+            personalities = await self._personality_pool.draw(self._number_of_players, self._random)
+            return [
+                AgentPlayer(name=personality.name, personality=personality.personality)
+                for personality in personalities
+            ]
 
-    async def initialize_players(self):
         unique_names = set()
         tasks = []
 
-        async with ClientSession() as session:
-            for i in range(self._number_of_players):
-                gender = random.choice(["male", "female"])
-
-                ai_name = names.get_first_name(gender=gender)
-                while ai_name in unique_names:
-                    ai_name = names.get_first_name(gender=gender)
-
-                unique_names.add(ai_name)
-                task = asyncio.create_task(self.generate_personality(session, ai_name, gender, i))
-                tasks.append(task)
-
-            await asyncio.gather(*tasks)
-
-    async def generate_personality(self, session: ClientSession, name: str, gender: str, player_index: int):
-        system_msg = f"""Generate a personality for a {gender} named {name}. 
-    They are playing the board game Coup, so you can include elements that will make them interesting players. 
-    You can be creative with personalities, ranging from a calm, strategic to a loud, aggressive player.
-    You may even include various emotional tendencies...
-    Just generate the personality. Don't say anything else like 'Sure, here is a personality'."""
-
-        api_key = os.environ.get("OPENAI_API_KEY")
-
-        async with session.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": "gpt-4",
-                    "messages": [{"role": "system", "content": system_msg}],
-                    "temperature": 1.0,
-                },
-        ) as response:
-            result = await response.json()
-            personality = result["choices"][0]["message"]["content"]
-            print_text(f"Initialized Player {player_index + 1}: {name}")
-            self._players.append(AgentPlayer(name=name, personality=personality))
+        for i in range(self._number_of_players):
+            gender = self._random.choice(GENDERS)
+
+            ai_name = random_name(gender, unique_names)
+            unique_names.add(ai_name)
+            tasks.append(self.generate_personality(ai_name, gender, i))
+
+        return list(await asyncio.gather(*tasks))
+
+    def _await_players(self) -> None:
+        """Wait for the players generated in the background, if any"""
+        if self._pending_players is None:
+            return
+
+        self._players = self._pending_players.result()
+        self._pending_players = None
+        for ind, player in enumerate(self._players):
+            print_text(f"Initialized Player {ind + 1}: {player.name}")
+
+    async def generate_personality(self, name: str, gender: str, player_index: int) -> AgentPlayer:
+        personality = await generate_personality(name, gender)
+        return AgentPlayer(name=name, personality=personality)
 
     @property
     def current_player(self) -> BasePlayer:
@@ -104,6 +140,27 @@ class ResistanceCoupGameHandler:
         """Return the only remaining player"""
         return [player for player in self._players if player.is_active][0]
 
+    @property
+    def prompt_tokens_per_turn(self) -> Dict[int, int]:
+        """Return the estimated prompt tokens all agents sent per turn in the current game"""
+        prompt_tokens: Counter = Counter()
+        for player in self._agent_players():
+            prompt_tokens.update(player.memory.prompt_tokens)
+        return dict(sorted(prompt_tokens.items()))
+
+    @property
+    def decision_fallbacks(self) -> Dict[str, int]:
+        """Return how often agents fell back to the rule based policy, per decision type"""
+        fallbacks: Counter = Counter()
+        for player in self._agent_players():
+            fallbacks.update(player.fallback_counts)
+        return dict(fallbacks)
+
+    @property
+    def action_histogram(self) -> Dict[ActionType, int]:
+        """Return how often each action has been chosen in the current game"""
+        return dict(self._action_histogram)
+
     def print_player_state(self, player_index: int) -> None:
         print_panel(generate_player_panel(self._players[player_index]))
 
@@ -111,6 +168,27 @@ class ResistanceCoupGameHandler:
         print_table(generate_players_table(self._players, self._current_player_index))
         print_panel(generate_state_panel(self._deck, self._treasury, self.current_player))
 
+    def to_compact_state(self) -> CompactGameState:
+        """Snapshot the game into the compact representation used by the hot loop"""
+        return CompactGameState.from_models(
+            hands=[player.cards for player in self._players],
+            coins=[player.coins for player in self._players],
+            deck=self._deck,
+            treasury=self._treasury,
+            current_player=self._current_player_index,
+        )
+
+    def load_compact_state(self, state: CompactGameState) -> None:
+        """Restore the game from a compact state, e.g. to display a simulated position"""
+        for ind, player in enumerate(self._players):
+            player.cards = state.hand_cards(ind)
+            player.coins = state.coins[ind]
+            player.is_active = bool(player.cards)
+
+        self._deck = to_cards(state.deck)
+        self._treasury = state.treasury
+        self._current_player_index = state.current_player
+
     def _players_without_player(self, excluded_player: BasePlayer):
         players_copy = self._players.copy()
         return [
@@ -120,16 +198,42 @@ class ResistanceCoupGameHandler:
         ]
 
     def _shuffle_deck(self) -> None:
-        random.shuffle(self._deck)
+        self._random.shuffle(self._deck)
+
+    async def asetup_game(self, seed: Optional[Union[int, str]] = None) -> None:
+        """Async counterpart of setup_game, waits for the background generated players without blocking"""
+        if self._pending_players is not None:
+            await asyncio.wrap_future(self._pending_players)
+        self.setup_game(seed)
+
+    def setup_game(self, seed: Optional[Union[int, str]] = None) -> None:
+        self._await_players()
+
+        # Search and belief tracking players follow the game through its events
+        self._observers = [player for player in self._players if player.observes_events]
+        self._deferred_events = []
+        for player in self._players:
+            if isinstance(player, MCTSPlayer):
+                player.bind(self.to_compact_state, self._seat)
+
+        # Re-seeding makes the whole game (deck, starting player and AI choices) reproducible, every
+        # game gets a seed so it can be replayed from its event log
+        if seed is None:
+            seed = self._random.getrandbits(64)
+        self._random.seed(seed)
+        self.turn_count = 0
+        self._emit(GameEventType.game_start, seed=seed, players=[player.name for player in self._players])
 
-    def setup_game(self) -> None:
         self._deck = build_deck()
         self._shuffle_deck()
 
         self._treasury = 50 - 2 * len(self._players)
+        self._action_histogram.clear()
+        self._discard_speculation()
 
         for player in self._players:
             player.reset_player()
+            player.seed_random(self._random.getrandbits(64))
 
             # Deal 2 cards to each player
             player.cards.append(self._deck.pop())
@@ -141,8 +245,10 @@ class ResistanceCoupGameHandler:
             # Includes the player in the game
             player.is_active = True
 
+            self._emit(GameEventType.deal, player=player, cards=[card.card_type for card in player.cards])
+
         # Random starting player
-        self._current_player_index = random.randint(0, self._number_of_players - 1)
+        self._current_player_index = self._random.randint(0, self._number_of_players - 1)
 
     def _swap_card(self, player: BasePlayer, card: Card) -> None:
         self._deck.append(card)
@@ -172,18 +278,79 @@ class ResistanceCoupGameHandler:
             if not player.cards and player.is_active:
                 player.is_active = False
                 self._give_coin_to_treasury(player, player.coins)
+                self._emit(GameEventType.elimination, player=player)
 
                 return player
         return None
 
+    def _seat(self, player: Optional[BasePlayer]) -> Optional[int]:
+        if player is None:
+            return None
+        return next(ind for ind, seated_player in enumerate(self._players) if seated_player is player)
+
+    def _emit(
+            self,
+            event_type: GameEventType,
+            player: Optional[BasePlayer] = None,
+            target: Optional[BasePlayer] = None,
+            defer: bool = False,
+            **fields,
+    ) -> None:
+        """
+        Write an event to the event log, if there is one, and pass it on to the observers. Deferred
+        events reach the observers on the next call to _notify_observers.
+        """
+        if self._event_log is None and not self._observers:
+            return
+
+        event = GameEvent(
+            event_type=event_type,
+            turn=self.turn_count or 0,
+            player=self._seat(player),
+            target=self._seat(target),
+            **fields,
+        )
+        if self._event_log is not None:
+            self._event_log.write(event)
+        if defer:
+            self._deferred_events.append(event)
+            return
+        for observer in self._observers:
+            observer.observe(event)
+
+    def _notify_observers(self) -> None:
+        events, self._deferred_events = self._deferred_events, []
+        for event in events:
+            for observer in self._observers:
+                observer.observe(event)
+
+    async def _lose_influence(self, player: BasePlayer) -> None:
+        """Let the player remove a card, lost cards are face up so every agent sees them"""
+        card_types = Counter(card.card_type for card in player.cards)
+        await player.aremove_card()
+        card_types.subtract(card.card_type for card in player.cards)
+        for card_type in card_types.elements():
+            self._emit(GameEventType.discard, player=player, card_type=card_type)
+
     def _determine_win_state(self) -> bool:
         return sum(player.is_active for player in self._players) == 1
 
-    def _action_phase(
+    async def _action_phase(
             self, players_without_current: list[BasePlayer]
     ) -> Tuple[Action, Optional[BasePlayer]]:
         # Player chooses action
-        target_action, target_player = self.current_player.choose_action(players_without_current)
+        target_action, target_player = await self.current_player.achoose_action(players_without_current)
+        self._action_histogram[target_action.action_type] += 1
+        # Observers follow the action after the agents reacted to it, a reaction prepared while a human
+        # was choosing is keyed on the agents' prompts, which include their card beliefs
+        self._emit(
+            GameEventType.action,
+            player=self.current_player,
+            target=target_player,
+            defer=True,
+            action_type=target_action.action_type,
+        )
+        self._player_action_counts[self.current_player.name][target_action.action_type] += 1
 
         print_text(
             build_action_report_string(
@@ -194,87 +361,155 @@ class ResistanceCoupGameHandler:
 
         return target_action, target_player
 
-    def _challenge_against_player_failed(
+    async def _challenge_against_player_failed(
             self, player_being_challenged: BasePlayer, card: Card, challenger: BasePlayer, action_being_challenged: Union[Action, CounterAction]
     ):
         # Player being challenged reveals the card
         print_texts(f"{player_being_challenged} reveals their ", (f"{card}", card.style), " card!")
+        self._emit(GameEventType.reveal, player=player_being_challenged, card_type=card.card_type)
         print_text(f"{challenger} loses the challenge")
 
         evt = f"{challenger} challenged {player_being_challenged}'s on attempting action {action_being_challenged}... {player_being_challenged} had the required card so {challenger} loses the challenge"
-        self.send_event_to_players(evt)
+        await self.asend_event_to_players(evt)
 
         # Challenge player loses influence (chooses a card to remove)
-        challenger.remove_card()
+        await self._lose_influence(challenger)
 
         # Player puts card into the deck and gets a new card
         print_text(f"{player_being_challenged} gets a new card")
         self._swap_card(player_being_challenged, card)
 
-    def _challenge_against_player_succeeded(self, player_being_challenged: BasePlayer, action_being_challenged: Action, challenger: BasePlayer):
+    async def _challenge_against_player_succeeded(self, player_being_challenged: BasePlayer, action_being_challenged: Action, challenger: BasePlayer):
         print_text(f"{player_being_challenged} bluffed! They do not have the required card!")
 
         evt = f"{challenger} challenged {player_being_challenged}'s on attempting action {action_being_challenged}... {player_being_challenged} did not have the required card so {challenger} wins the challenge"
-        self.send_event_to_players(evt)
+        await self.asend_event_to_players(evt)
 
         # Player being challenged loses influence (chooses a card to remove)
-        player_being_challenged.remove_card()
+        await self._lose_influence(player_being_challenged)
+
+    async def _poll_players(
+            self,
+            players: list[BasePlayer],
+            ask: Callable[[BasePlayer], Coroutine],
+    ) -> Optional[BasePlayer]:
+        """
+        Ask each player in seat order, returning the first one that says yes.
+
+        With concurrent polling every agent starts deliberating straight away, so the reaction window
+        costs a single LLM round trip. Answers are still resolved in seat order (other players are
+        asked one by one meanwhile) and deliberations that are no longer needed are cancelled. Their
+        output, traced LLM calls and fallbacks are held back until their answer is used, so a
+        discarded deliberation leaves no trace.
+        """
 
-    def _challenge_phase(
+        async def deliberate(player: AgentPlayer):
+            with deferred_output() as output, held_records() as records:
+                return await ask(player), output, records
+
+        tasks = {}
+        fallback_counts = {}
+        if self._concurrent_polling:
+            for player in players:
+                if isinstance(player, AgentPlayer):
+                    fallback_counts[id(player)] = (player, dict(player.fallback_counts))
+                    tasks[id(player)] = asyncio.ensure_future(deliberate(player))
+
+        try:
+            for player in players:
+                task = tasks.pop(id(player), None)
+                if task is None:
+                    answer = await ask(player)
+                else:
+                    answer, output, records = await task
+                    flush_output(output)
+                    tracer.keep(records)
+                if answer:
+                    return player
+            return None
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            for player_id in tasks:
+                player, counts = fallback_counts[player_id]
+                player.fallback_counts = counts
+
+    async def _challenge_phase(
             self,
             other_players: list[BasePlayer],
             player_being_challenged: BasePlayer,
             action_being_challenged: Union[Action, CounterAction],
     ) -> ChallengeResult:
         # Every player can choose to challenge
-        for challenger in other_players:
-            should_challenge = challenger.determine_challenge(player_being_challenged, action_being_challenged)
-            if should_challenge:
-                if challenger.is_ai:
-                    print_text(f"{challenger} is challenging {player_being_challenged}!")
-                # Player being challenged has the card
-                if card := player_being_challenged.find_card(
-                        action_being_challenged.associated_card_type
-                ):
-
-                    self._challenge_against_player_failed(
-                        player_being_challenged=player_being_challenged,
-                        card=card,
-                        challenger=challenger,
-                        action_being_challenged=action_being_challenged,
-                    )
+        challenger = await self._poll_players(
+            other_players,
+            lambda player: player.adetermine_challenge(player_being_challenged, action_being_challenged),
+        )
 
-                    return ChallengeResult.challenge_failed
+        # No challenge happened
+        if challenger is None:
+            return ChallengeResult.no_challenge
+
+        self._emit(
+            GameEventType.challenge,
+            player=challenger,
+            target=player_being_challenged,
+            card_type=action_being_challenged.associated_card_type,
+        )
 
-                # Player being challenged bluffed
-                else:
-                    self._challenge_against_player_succeeded(player_being_challenged, action_being_challenged, challenger)
-                    return ChallengeResult.challenge_succeeded
+        if challenger.is_ai:
+            print_text(f"{challenger} is challenging {player_being_challenged}!")
+        # Player being challenged has the card
+        if card := player_being_challenged.find_card(
+                action_being_challenged.associated_card_type
+        ):
+
+            await self._challenge_against_player_failed(
+                player_being_challenged=player_being_challenged,
+                card=card,
+                challenger=challenger,
+                action_being_challenged=action_being_challenged,
+            )
 
-        # No challenge happened
-        return ChallengeResult.no_challenge
+            return ChallengeResult.challenge_failed
+
+        # Player being challenged bluffed
+        else:
+            await self._challenge_against_player_succeeded(player_being_challenged, action_being_challenged, challenger)
+            return ChallengeResult.challenge_succeeded
 
-    def _counter_phase(
+    async def _counter_phase(
             self, players_without_current: list[BasePlayer], target_action: Action
     ) -> Tuple[Optional[BasePlayer], Optional[CounterAction]]:
         # Every player can choose to counter
-        for countering_player in players_without_current:
-            should_counter = countering_player.determine_counter(self.current_player, target_action)
-            if should_counter:
-                target_counter = get_counter_action(target_action.action_type)
-                print_text(
-                    build_counter_report_string(
-                        target_player=self.current_player,
-                        counter=target_counter,
-                        countering_player=countering_player,
-                    )
-                )
+        current_player = self.current_player
+        countering_player = await self._poll_players(
+            players_without_current,
+            lambda player: player.adetermine_counter(current_player, target_action),
+        )
 
-                return countering_player, target_counter
+        if countering_player is None:
+            return None, None
 
-        return None, None
+        target_counter = get_counter_action(target_action.action_type)
+        self._emit(
+            GameEventType.counter,
+            player=countering_player,
+            target=current_player,
+            action_type=target_action.action_type,
+        )
+        print_text(
+            build_counter_report_string(
+                target_player=current_player,
+                counter=target_counter,
+                countering_player=countering_player,
+            )
+        )
+
+        return countering_player, target_counter
 
-    def _execute_action(
+    async def _execute_action(
             self, action: Action, target_player: BasePlayer, countered: bool = False
     ) -> None:
         match action.action_type:
@@ -296,7 +531,7 @@ class ResistanceCoupGameHandler:
 
                 if target_player.cards:
                     # Target player loses influence
-                    target_player.remove_card()
+                    await self._lose_influence(target_player)
             case ActionType.tax:
                 # Player gets 3 coins
                 self._take_coin_from_treasury(self.current_player, 3)
@@ -306,7 +541,7 @@ class ResistanceCoupGameHandler:
                 self._give_coin_to_treasury(self.current_player, 3)
                 if not countered and target_player.cards:
                     print_text(f"{self.current_player} assassinates {target_player}")
-                    target_player.remove_card()
+                    await self._lose_influence(target_player)
             case ActionType.steal:
                 if not countered:
                     # Take 2 (or all) coins from a player
@@ -319,17 +554,26 @@ class ResistanceCoupGameHandler:
             case ActionType.exchange:
                 # Get 2 random cards from deck
                 cards = [self._deck.pop(), self._deck.pop()]
-                first_card, second_card = self.current_player.choose_exchange_cards(cards)
+                first_card, second_card = await self.current_player.achoose_exchange_cards(cards)
+                self._emit(
+                    GameEventType.exchange,
+                    player=self.current_player,
+                    cards=[first_card.card_type, second_card.card_type],
+                )
                 self._deck.append(first_card)
                 self._deck.append(second_card)
 
-    def _generate_conversation(self, evt: str, player_thoughts: list[str]):
-        print_text(f"Generating conversation for turn {self.turn_count}...")
-
+    async def _generate_conversation(
+            self,
+            players: list[AgentPlayer],
+            evt: str,
+            player_thoughts: list[str],
+            on_text: Optional[Callable[[str], None]] = None,
+    ):
         player_specs = [f"""---{player.name}--- 
 Personality: {player.personality}
 Card count: {len(player.cards)}
-Inner thoughts: {thought}""" for player, thought in zip(self._players, player_thoughts)]
+Inner thoughts: {thought}""" for player, thought in zip(players, player_thoughts)]
 
         player_specs = "\n".join(player_specs)
 
@@ -353,17 +597,17 @@ The purpose of the conversation is for players to convey their inner thoughts to
 DO NOT PLAY THE ACTUAL GAME, JUST THE CONVERSATION PART.
 
 Write the conversation below:"""
-        conversation = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_msg}
-            ],
-            temperature=0.1
-        )
-
-        return conversation.choices[0].message.content
+        messages = [{"role": "system", "content": system_msg}]
+        with trace_context(call_site="conversation"):
+            if on_text is not None:
+                return await llm.astream(messages, on_text, temperature=0.1)
+            return await llm.acomplete(messages, temperature=0.1)
 
     def send_event_to_players(self, event: str):
+        """Blocking variant of asend_event_to_players"""
+        run_sync(self.asend_event_to_players(event))
+
+    async def asend_event_to_players(self, event: str):
         """
         1. Send the action to all players to react
         2. Retrieve their input
@@ -371,38 +615,189 @@ Write the conversation below:"""
         4. Adjust all players internal thoughts based on conversation
         """
 
-        # Send the event to all players to react
-        player_thoughts = []
-        for player in self._players:
-            player_thought = player.react_to_action(event, is_current_player=player == self.current_player)
-            player_thoughts.append(player_thought)
+        # Only agent players react to events, so games without them skip the LLM round trips
+        agent_players = self._agent_players()
+        if not agent_players:
+            return
+
+        speculated = await self._take_speculation(self._speculation_key(agent_players, event))
+        await self._send_event_to_agents(agent_players, event, speculated)
+
+    def _agent_players(self) -> List[AgentPlayer]:
+        return [player for player in self._players if isinstance(player, AgentPlayer)]
+
+    def _action_event(self, target_action: Action, target_player: Optional[BasePlayer]) -> str:
+        if target_player:
+            return "Player {} is attempting to perform action {} on player {}".format(self.current_player, target_action, target_player)
+        return "Player {} is attempting to perform action {}".format(self.current_player, target_action)
+
+    def _predict_action(
+            self, players_without_current: list[BasePlayer]
+    ) -> Tuple[Action, Optional[BasePlayer]]:
+        """Guess the current player's action from their history, defaulting to income"""
+        counts = self._player_action_counts[self.current_player.name]
+        target_action = max(
+            self.current_player.available_actions(), key=lambda action: counts[action.action_type]
+        )
+
+        target_player = None
+        if target_action.requires_target:
+            # Humans tend to go after the richest opponent
+            target_player = max(players_without_current, key=lambda player: player.coins)
+
+        return target_action, target_player
+
+    def _speculation_key(self, agent_players: List[AgentPlayer], event: str) -> tuple:
+        """Everything a speculative reaction depends on, a mismatch means the result is stale"""
+        return (
+            event,
+            self.turn_count,
+            self.current_player.name,
+            tuple((player.name, player.memory_prompt, len(player.cards)) for player in agent_players),
+        )
+
+    def _start_speculation(self, players_without_current: list[BasePlayer]) -> None:
+        """Let the agents react in the background to the action the human will most likely choose"""
+        agent_players = self._agent_players()
+        if not agent_players:
+            return
+
+        event = self._action_event(*self._predict_action(players_without_current))
+        self._discard_speculation()
+        self._speculation = (
+            self._speculation_key(agent_players, event),
+            llm.submit(self._react_to_event(agent_players, event)),
+        )
+
+    async def _take_speculation(self, key: tuple) -> Optional[Tuple[str, List[str]]]:
+        """Return the speculative reaction if it was computed for this exact event and state"""
+        if self._speculation is None:
+            return None
+
+        speculation_key, future = self._speculation
+        self._speculation = None
+        if speculation_key != key:
+            future.cancel()
+            self.speculation_stats["misses"] += 1
+            return None
+
+        try:
+            speculated = await asyncio.wrap_future(future)
+        except Exception:
+            # Failed speculations are simply recomputed
+            self.speculation_stats["errors"] += 1
+            return None
+
+        self.speculation_stats["hits"] += 1
+        return speculated
+
+    def _discard_speculation(self) -> None:
+        if self._speculation is not None:
+            self._speculation[1].cancel()
+            self._speculation = None
+
+    async def _gather_limited(self, coroutines: List[Coroutine]) -> list:
+        """Await all coroutines concurrently, with at most max_concurrency of them in flight"""
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def _limited(coroutine: Coroutine):
+            async with semaphore:
+                return await coroutine
+
+        return await asyncio.gather(*[_limited(coroutine) for coroutine in coroutines])
+
+    async def _send_event_to_agents(
+            self,
+            agent_players: List[AgentPlayer],
+            event: str,
+            speculated: Optional[Tuple[str, List[str]]] = None,
+    ) -> None:
+        if speculated is None:
+            print_text(f"Generating conversation for turn {self.turn_count}...")
+            if self._stream_conversation:
+                # The script shows up line by line instead of after the whole completion
+                with live_panel("Conversation") as on_text:
+                    conversation = await self._converse(agent_players, event, on_text)
+            else:
+                conversation = await self._converse(agent_players, event)
+                print_panel_with_title("Conversation", conversation, justify="left")
+            inner_thoughts = await self._adjusted_inner_thoughts(agent_players, event, conversation)
+        else:
+            conversation, inner_thoughts = speculated
+            print_panel_with_title("Conversation", conversation, justify="left")
+
+        for player, thoughts in zip(agent_players, inner_thoughts):
+            player.inner_thoughts = thoughts
+
+    async def _react_to_event(self, agent_players: List[AgentPlayer], event: str) -> Tuple[str, List[str]]:
+        """Return the conversation and adjusted inner thoughts following an event, without applying them"""
+        conversation = await self._converse(agent_players, event)
+        return conversation, await self._adjusted_inner_thoughts(agent_players, event, conversation)
+
+    async def _converse(
+            self,
+            agent_players: List[AgentPlayer],
+            event: str,
+            on_text: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        current_player = self.current_player
+
+        # Send the event to all players to react, players react independently so this runs concurrently
+        player_thoughts = await self._gather_limited(
+            [
+                player.areact_to_action(event, is_current_player=player == current_player)
+                for player in agent_players
+            ]
+        )
 
         # Construct a conversation
-        conversation = self._generate_conversation(event, player_thoughts)
+        return await self._generate_conversation(agent_players, event, player_thoughts, on_text)
 
-        print_panel_with_title("Conversation", conversation, justify="left")
+    async def _adjusted_inner_thoughts(
+            self, agent_players: List[AgentPlayer], event: str, conversation: str
+    ) -> List[str]:
+        current_player = self.current_player
 
         # Adjust all players internal thoughts based on conversation following event
-        for player, player_thought in zip(self._players, player_thoughts):
-            player.adjust_internal_thoughts(event, is_current_player=player == self.current_player, conversation=conversation)
+        return await self._gather_limited(
+            [
+                player.aadjusted_internal_thoughts(
+                    event, is_current_player=player == current_player, conversation=conversation
+                )
+                for player in agent_players
+            ]
+        )
 
     def handle_turn(self, turn_count: int) -> bool:
+        """Play a turn, returns whether the game is over"""
+        return run_sync(self.ahandle_turn(turn_count))
+
+    async def ahandle_turn(self, turn_count: int) -> bool:
+        """Play a turn, interleaving with other games on the same event loop while players decide"""
         self.turn_count = turn_count
+        set_trace_turn(turn_count)
         players_without_current = self._players_without_player(self.current_player)
 
+        for agent in self._agent_players():
+            agent.memory.start_turn(
+                turn_count,
+                {player.name: player.coins for player in self._players_without_player(agent)},
+            )
+
+        # Agents get a head start on their reaction while the human makes up their mind
+        if self._speculate and not self.current_player.is_ai:
+            self._start_speculation(players_without_current)
+
         # Choose an action to perform
-        target_action, target_player = self._action_phase(players_without_current)
+        target_action, target_player = await self._action_phase(players_without_current)
 
-        if target_player:
-            evt = "Player {} is attempting to perform action {} on player {}".format(self.current_player, target_action, target_player)
-        else:
-            evt = "Player {} is attempting to perform action {}".format(self.current_player, target_action)
-        self.send_event_to_players(evt)
+        await self.asend_event_to_players(self._action_event(target_action, target_player))
+        self._notify_observers()
 
         # Opportunity to challenge action
         challenge_result = ChallengeResult.no_challenge
         if target_action.can_be_challenged:
-            challenge_result = self._challenge_phase(
+            challenge_result = await self._challenge_phase(
                 other_players=players_without_current,
                 player_being_challenged=self.current_player,
                 action_being_challenged=target_action,
@@ -413,16 +808,16 @@ Write the conversation below:"""
             pass
         elif challenge_result == ChallengeResult.challenge_failed:
             # Challenge failed and the action is still resolved
-            self._execute_action(target_action, target_player)
+            await self._execute_action(target_action, target_player)
         elif challenge_result == ChallengeResult.no_challenge:
 
             # Action can't be countered
             if not target_action.can_be_countered:
-                self._execute_action(target_action, target_player)
+                await self._execute_action(target_action, target_player)
 
             # Opportunity to counter
             else:
-                countering_player, counter = self._counter_phase(
+                countering_player, counter = await self._counter_phase(
                     players_without_current, target_action
                 )
 
@@ -432,7 +827,7 @@ Write the conversation below:"""
                     players_without_countering_player = self._players_without_player(
                         countering_player
                     )
-                    counter_challenge_result = self._challenge_phase(
+                    counter_challenge_result = await self._challenge_phase(
                         other_players=players_without_countering_player,
                         player_being_challenged=countering_player,
                         action_being_challenged=counter,
@@ -444,11 +839,11 @@ Write the conversation below:"""
                     ChallengeResult.challenge_failed,
                 ]:
 
-                    self._execute_action(target_action, target_player, countered=True)
+                    await self._execute_action(target_action, target_player, countered=True)
                 # No counter occurred
                 else:
 
-                    self._execute_action(target_action, target_player)
+                    await self._execute_action(target_action, target_player)
 
         # Is any player out of the game?
         while player := self._remove_defeated_player():
@@ -457,8 +852,9 @@ Write the conversation below:"""
             else:
                 # Our human was defeated
                 print_text("You were defeated! :skull: :skull: :skull:", with_markup=True)
-                end_game = print_confirm("Do you want to end the game early?")
+                end_game = await asyncio.to_thread(print_confirm, "Do you want to end the game early?")
                 if end_game:
+                    self._emit(GameEventType.game_end)
                     return True
 
         # Have we reached a winner?
@@ -467,6 +863,7 @@ Write the conversation below:"""
                 f":raising_hands: Congratulations {self.remaining_player}! You are the final survivor!",
                 with_markup=True,
             )
+            self._emit(GameEventType.game_end, player=self.remaining_player)
             return True
 
         self._next_player()
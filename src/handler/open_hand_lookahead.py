@@ -0,0 +1,337 @@
+from itertools import combinations
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.models.compact_state import (
+    ACTION_CAN_BE_CHALLENGED,
+    ACTION_CAN_BE_COUNTERED,
+    ACTION_CARD,
+    ACTION_REQUIRES_TARGET,
+    ASSASSINATE,
+    COUNTER_CARD,
+    COUP,
+    DECK_COMPOSITION,
+    EXCHANGE,
+    FOREIGN_AID,
+    INCOME,
+    STEAL,
+    TAX,
+    CompactGameState,
+    available_actions,
+)
+
+DEFAULT_DEPTH = 3
+
+# A node is (hands, coins, deck, treasury, current player) for the two remaining players, hands are
+# sorted tuples of card codes and the deck is the number of cards of each type it holds (its order
+# is unknown to the players, so every draw is a chance node). The player to move at the root is
+# player 0 and every score is from the point of view of player 0.
+Node = Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], Tuple[int, int], Tuple[int, ...], int, int]
+
+
+def _pick(player: int, scores: Sequence[float]) -> float:
+    return max(scores) if player == 0 else min(scores)
+
+
+def _with_hand(
+    node: Node, player: int, hand: Sequence[int], deck: Optional[Tuple[int, ...]] = None
+) -> Node:
+    hands, coins, old_deck, treasury, current = node
+    hands = (tuple(sorted(hand)), hands[1]) if player == 0 else (hands[0], tuple(sorted(hand)))
+    return hands, coins, old_deck if deck is None else deck, treasury, current
+
+
+def _with_coins(node: Node, player: int, amount: int, treasury_change: int = 0) -> Node:
+    hands, coins, deck, treasury, current = node
+    coins = (coins[0] + amount, coins[1]) if player == 0 else (coins[0], coins[1] + amount)
+    return hands, coins, deck, treasury + treasury_change, current
+
+
+def _without_card(node: Node, player: int, card: int) -> Node:
+    hand = list(node[0][player])
+    hand.remove(card)
+    return _with_hand(node, player, hand)
+
+
+def _draws(deck: Tuple[int, ...]) -> List[Tuple[float, int, Tuple[int, ...]]]:
+    """Probability, card and remaining deck of every card that can be drawn"""
+    total = sum(deck)
+    draws = []
+    for card, count in enumerate(deck):
+        if count:
+            remaining = list(deck)
+            remaining[card] -= 1
+            draws.append((count / total, card, tuple(remaining)))
+    return draws
+
+
+def heuristic_score(node: Node) -> float:
+    """
+    Score of player 0 at the depth limit, between 0 and 1: influence first, then coins. A hand
+    tuned guess, not a win probability.
+    """
+    hands, coins = node[0], node[1]
+    score = len(hands[0]) - len(hands[1]) + 0.1 * (min(coins[0], 7) - min(coins[1], 7))
+    return min(max(0.5 + 0.25 * score, 0.0), 1.0)
+
+
+class OpenHandLookahead:
+    """
+    Depth limited open-hand expectiminimax lookahead in two-player endgames on the rules of
+    CompactGameHandler.
+
+    This is a heuristic for exploring positions, not a solver and not a grader of decisions. Both
+    hands are treated as known to both players (a bluff only pays off when it isn't worth calling),
+    so its scores rely on the opponent's actual hand, which the player to move can't see, and the
+    lookahead stops after `depth` turns. Card draws (after a successful defence and when
+    exchanging) are chance nodes over the deck composition. Scores are between 0 and 1: exactly 1
+    or 0 when every line within the depth ends the game, otherwise an expectation over
+    heuristic_score at the depth limit. Scores of different depths aren't comparable. To play (or
+    compare play) on what a player can actually see, use MCTSPlayer's information set search.
+
+    Scores are memoized by position and remaining depth, so transpositions are searched once and
+    the table is reused across calls.
+    """
+
+    def __init__(self, depth: int = DEFAULT_DEPTH):
+        self.depth = depth
+        self._memo: Dict[Tuple[Node, int], float] = {}
+
+    @property
+    def positions(self) -> int:
+        """Number of memoized positions"""
+        return len(self._memo)
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+    def action_scores(
+        self, state: CompactGameState, depth: Optional[int] = None
+    ) -> Dict[Tuple[int, Optional[int]], float]:
+        """
+        Score of the current player after each of their available (action, target) pairs,
+        assuming best play within the depth. The state must have exactly two active players.
+        """
+        seats, node = _root(state)
+        depth = self.depth if depth is None else depth
+
+        return {
+            (action, seats[1] if ACTION_REQUIRES_TARGET[action] else None): self._action(
+                node, action, depth
+            )
+            for action in _available_actions(node)
+        }
+
+    def best_action(
+        self, state: CompactGameState, depth: Optional[int] = None
+    ) -> Tuple[Tuple[int, Optional[int]], float]:
+        """The best scoring (action, target) pair of the current player and its score"""
+        scores = self.action_scores(state, depth)
+        best = max(scores, key=scores.get)
+        return best, scores[best]
+
+    def score(self, state: CompactGameState, depth: Optional[int] = None) -> float:
+        """Score of the current player with best play within the depth"""
+        _, node = _root(state)
+        return self._score(node, self.depth if depth is None else depth)
+
+    def _score(self, node: Node, depth: int) -> float:
+        hands = node[0]
+        if not hands[1]:
+            return 1.0
+        if not hands[0]:
+            return 0.0
+        if depth == 0:
+            return heuristic_score(node)
+
+        key = (node, depth)
+        score = self._memo.get(key)
+        if score is None:
+            score = _pick(
+                node[4], [self._action(node, action, depth) for action in _available_actions(node)]
+            )
+            self._memo[key] = score
+        return score
+
+    def _action(self, node: Node, action: int, depth: int) -> float:
+        actor = node[4]
+        if not ACTION_CAN_BE_CHALLENGED[action]:
+            return self._unchallenged(node, action, depth)
+
+        # The opponent lets the claim stand or challenges it. A failed challenge skips the counter phase
+        return _pick(
+            1 - actor,
+            [
+                self._unchallenged(node, action, depth),
+                self._challenge(
+                    node,
+                    actor,
+                    ACTION_CARD[action],
+                    defended=lambda after: self._execute(after, action, False, depth),
+                    bluffed=lambda after: self._end_turn(after, depth),
+                ),
+            ],
+        )
+
+    def _unchallenged(self, node: Node, action: int, depth: int) -> float:
+        if not ACTION_CAN_BE_COUNTERED[action]:
+            return self._execute(node, action, False, depth)
+
+        actor = node[4]
+        opponent = 1 - actor
+
+        # The actor accepts a counter or challenges it
+        countered = _pick(
+            actor,
+            [
+                self._execute(node, action, True, depth),
+                self._challenge(
+                    node,
+                    opponent,
+                    COUNTER_CARD[action],
+                    defended=lambda after: self._execute(after, action, True, depth),
+                    bluffed=lambda after: self._execute(after, action, False, depth),
+                ),
+            ],
+        )
+        return _pick(opponent, [self._execute(node, action, False, depth), countered])
+
+    def _challenge(
+        self,
+        node: Node,
+        claimant: int,
+        card: int,
+        defended: Callable[[Node], float],
+        bluffed: Callable[[Node], float],
+    ) -> float:
+        challenger = 1 - claimant
+        hands = node[0]
+
+        if card not in hands[claimant]:
+            return _pick(
+                claimant,
+                [bluffed(_without_card(node, claimant, lost)) for lost in set(hands[claimant])],
+            )
+
+        # The challenger loses a card of their choice, then the claimant swaps the revealed card
+        return _pick(
+            challenger,
+            [
+                self._swap(_without_card(node, challenger, lost), claimant, card, defended)
+                for lost in set(hands[challenger])
+            ],
+        )
+
+    def _swap(self, node: Node, player: int, card: int, then: Callable[[Node], float]) -> float:
+        hand = list(node[0][player])
+        hand.remove(card)
+        deck = list(node[2])
+        deck[card] += 1
+
+        return sum(
+            probability * then(_with_hand(node, player, hand + [drawn], remaining))
+            for probability, drawn, remaining in _draws(tuple(deck))
+        )
+
+    def _lose_card(self, node: Node, player: int, depth: int) -> float:
+        hand = node[0][player]
+        if not hand:
+            return self._end_turn(node, depth)
+        return _pick(
+            player, [self._end_turn(_without_card(node, player, lost), depth) for lost in set(hand)]
+        )
+
+    def _execute(self, node: Node, action: int, countered: bool, depth: int) -> float:
+        hands, coins, deck, treasury, actor = node
+        if not hands[0] or not hands[1]:
+            return self._end_turn(node, depth)
+
+        opponent = 1 - actor
+        if action == INCOME:
+            taken = min(1, treasury)
+            return self._end_turn(_with_coins(node, actor, taken, -taken), depth)
+        if action == FOREIGN_AID:
+            taken = 0 if countered else min(2, treasury)
+            return self._end_turn(_with_coins(node, actor, taken, -taken), depth)
+        if action == TAX:
+            taken = min(3, treasury)
+            return self._end_turn(_with_coins(node, actor, taken, -taken), depth)
+        if action == COUP:
+            return self._lose_card(_with_coins(node, actor, -7, 7), opponent, depth)
+        if action == ASSASSINATE:
+            paid = _with_coins(node, actor, -3, 3)
+            if countered:
+                return self._end_turn(paid, depth)
+            return self._lose_card(paid, opponent, depth)
+        if action == STEAL:
+            if countered:
+                return self._end_turn(node, depth)
+            stolen = min(coins[opponent], 2)
+            return self._end_turn(
+                _with_coins(_with_coins(node, opponent, -stolen), actor, stolen), depth
+            )
+        if action == EXCHANGE:
+            return self._exchange(node, depth)
+        raise ValueError(f"Unknown action {action}")
+
+    def _exchange(self, node: Node, depth: int) -> float:
+        actor = node[4]
+        hand = node[0][actor]
+
+        # Drawing a then b or b then a leads to the same choice
+        draws: Dict[Tuple[int, int], float] = {}
+        remaining_decks: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        for first_probability, first, deck in _draws(node[2]):
+            for second_probability, second, remaining in _draws(deck):
+                drawn = (min(first, second), max(first, second))
+                draws[drawn] = draws.get(drawn, 0.0) + first_probability * second_probability
+                remaining_decks[drawn] = remaining
+
+        value = 0.0
+        for drawn, probability in draws.items():
+            cards = list(hand) + list(drawn)
+            options = []
+            for returned in set(combinations(sorted(cards), 2)):
+                kept = list(cards)
+                deck = list(remaining_decks[drawn])
+                for card in returned:
+                    kept.remove(card)
+                    deck[card] += 1
+                options.append(self._end_turn(_with_hand(node, actor, kept, tuple(deck)), depth))
+            value += probability * _pick(actor, options)
+        return value
+
+    def _end_turn(self, node: Node, depth: int) -> float:
+        hands, coins, deck, treasury, current = node
+        return self._score((hands, coins, deck, treasury, 1 - current), depth - 1)
+
+
+def _available_actions(node: Node) -> List[int]:
+    coins, actor = node[1], node[4]
+
+    # Can't steal from player with 0 coins
+    return [
+        action for action in available_actions(coins[actor]) if action != STEAL or coins[1 - actor]
+    ]
+
+
+def _root(state: CompactGameState) -> Tuple[Tuple[int, int], Node]:
+    """Seats of the two remaining players (the current player first) and the root node"""
+    active_players = state.active_players()
+    if len(active_players) != 2 or state.current_player not in active_players:
+        raise ValueError("The lookahead needs exactly two active players, one of them to move")
+
+    current = state.current_player
+    seats = (current, next(player for player in active_players if player != current))
+
+    deck = [0] * len(DECK_COMPOSITION)
+    for card in state.deck:
+        deck[card] += 1
+
+    node = (
+        (tuple(sorted(state.hand(seats[0]))), tuple(sorted(state.hand(seats[1])))),
+        (state.coins[seats[0]], state.coins[seats[1]]),
+        tuple(deck),
+        state.treasury,
+        0,
+    )
+    return seats, node
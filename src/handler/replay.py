@@ -0,0 +1,52 @@
+from typing import List, Sequence
+
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.handler.simulation import DEFAULT_MAX_TURNS
+from src.models.event import GameEvent, GameEventType
+from src.models.players.replay import ReplayCursor, ReplayError, ReplayPlayer
+from src.utils.event_log import MemoryEventLog
+from src.utils.event_loop import run_sync
+from src.utils.print import quiet_output
+
+
+def replay_game(events: Sequence[GameEvent], max_turns: int = DEFAULT_MAX_TURNS) -> List[GameEvent]:
+    """
+    Re-run a recorded game through ResistanceCoupGameHandler and return the events it produces.
+
+    The recorded seed reproduces the deck and every shuffle, the recorded decisions are played back
+    by ReplayPlayers, so no LLM (or AI) is involved.
+    """
+    if not events or events[0].event_type != GameEventType.game_start:
+        raise ReplayError("A recorded game starts with a game_start event")
+
+    start = events[0]
+    cursor = ReplayCursor(events)
+    players = [ReplayPlayer(name=name, seat=seat) for seat, name in enumerate(start.players)]
+    for player in players:
+        player.bind(cursor)
+
+    event_log = MemoryEventLog()
+    handler = ResistanceCoupGameHandler(
+        len(players), players=players, speculate=False, event_log=event_log
+    )
+
+    async def play() -> None:
+        turn_count = 0
+        end_state = False
+        while not end_state and not cursor.exhausted and turn_count < max_turns:
+            turn_count += 1
+            end_state = await handler.ahandle_turn(turn_count)
+
+    with quiet_output():
+        handler.setup_game(start.seed)
+        run_sync(play())
+
+    return event_log.events
+
+
+def verify_replay(events: Sequence[GameEvent], max_turns: int = DEFAULT_MAX_TURNS) -> bool:
+    """Whether replaying a recorded game reproduces exactly the same events"""
+    try:
+        return replay_game(events, max_turns) == list(events)
+    except ReplayError:
+        return False
@@ -0,0 +1,123 @@
+from typing import Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+from src.handler.compact_handler import CompactGameHandler
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.models.action import ActionType
+from src.models.compact_state import ACTIONS
+from src.models.players.ai import AIPlayer
+from src.utils.event_log import EventLog
+from src.utils.event_loop import run_sync
+from src.utils.print import quiet_output
+
+DEFAULT_MAX_TURNS = 1000
+
+
+class GameResult(BaseModel):
+    winner: Optional[str] = None
+    turn_count: int
+    action_histogram: Dict[ActionType, int]
+
+
+def game_seed(seed: Union[int, str], game_id: int) -> str:
+    """Derive the seed of a single game, so any game id can be replayed on its own"""
+    return f"{seed}:{game_id}"
+
+
+def ai_player_name(seat: int) -> str:
+    return f"AI {seat + 1}"
+
+
+def build_ai_players(number_of_players: int) -> List[AIPlayer]:
+    """Build AI players that don't pause to 'think' between actions"""
+    return [AIPlayer(name=ai_player_name(ind), think_delay=0) for ind in range(number_of_players)]
+
+
+def simulate_game(
+    handler: ResistanceCoupGameHandler,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    seed: Optional[Union[int, str]] = None,
+) -> GameResult:
+    """Play a single game to completion without any console output"""
+    return run_sync(asimulate_game(handler, max_turns, seed))
+
+
+async def asimulate_game(
+    handler: ResistanceCoupGameHandler,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    seed: Optional[Union[int, str]] = None,
+) -> GameResult:
+    """
+    Async counterpart of simulate_game, a single event loop can play many games at once with e.g.
+    asyncio.gather (each game needs its own handler)
+    """
+    with quiet_output():
+        await handler.asetup_game(seed)
+
+        turn_count = 0
+        end_state = False
+        while not end_state and turn_count < max_turns:
+            turn_count += 1
+            end_state = await handler.ahandle_turn(turn_count)
+
+    return GameResult(
+        winner=handler.remaining_player.name if end_state else None,
+        turn_count=turn_count,
+        action_histogram=handler.action_histogram,
+    )
+
+
+def simulate_games(
+    number_of_players: int,
+    number_of_games: int,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    seed: Optional[Union[int, str]] = None,
+    event_log: Optional[EventLog] = None,
+) -> List[GameResult]:
+    """Play a batch of AI-only games headlessly and return the result of each game"""
+    handler = ResistanceCoupGameHandler(
+        number_of_players, players=build_ai_players(number_of_players), event_log=event_log
+    )
+
+    return [
+        simulate_game(handler, max_turns, None if seed is None else game_seed(seed, game_id))
+        for game_id in range(number_of_games)
+    ]
+
+
+def simulate_compact_game(
+    handler: CompactGameHandler,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    seed: Optional[Union[int, str]] = None,
+) -> GameResult:
+    """Play a single game on the compact representation (the same game for the same seed, about 4x faster)"""
+    handler.setup_game(seed)
+    winner, turn_count = handler.play_game(max_turns)
+
+    return GameResult(
+        winner=None if winner is None else ai_player_name(winner),
+        turn_count=turn_count,
+        action_histogram={
+            ACTIONS[ind].action_type: count
+            for ind, count in enumerate(handler.action_histogram)
+            if count
+        },
+    )
+
+
+def simulate_compact_games(
+    number_of_players: int,
+    number_of_games: int,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    seed: Optional[Union[int, str]] = None,
+) -> List[GameResult]:
+    """Compact counterpart of simulate_games"""
+    handler = CompactGameHandler(number_of_players)
+
+    return [
+        simulate_compact_game(
+            handler, max_turns, None if seed is None else game_seed(seed, game_id)
+        )
+        for game_id in range(number_of_games)
+    ]
@@ -0,0 +1,154 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from src.handler.compact_handler import CompactGameHandler
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.handler.simulation import (
+    DEFAULT_MAX_TURNS,
+    GameResult,
+    build_ai_players,
+    game_seed,
+    simulate_compact_game,
+    simulate_game,
+)
+from src.models.action import ActionType
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class TournamentStats(BaseModel):
+    games: int = 0
+    unfinished_games: int = 0
+    total_turns: int = 0
+    wins: Dict[str, int] = Field(default_factory=dict)
+    action_histogram: Dict[ActionType, int] = Field(default_factory=dict)
+
+    @property
+    def win_rates(self) -> Dict[str, float]:
+        if not self.games:
+            return {}
+        return {name: wins / self.games for name, wins in sorted(self.wins.items())}
+
+    @property
+    def average_turns(self) -> float:
+        if not self.games:
+            return 0.0
+        return self.total_turns / self.games
+
+    def add_result(self, result: GameResult) -> None:
+        self.games += 1
+        self.total_turns += result.turn_count
+
+        if result.winner is None:
+            self.unfinished_games += 1
+        else:
+            self.wins[result.winner] = self.wins.get(result.winner, 0) + 1
+
+        for action_type, count in result.action_histogram.items():
+            self.action_histogram[action_type] = self.action_histogram.get(action_type, 0) + count
+
+    def merge(self, other: "TournamentStats") -> None:
+        """Fold the statistics of another batch of games into these ones"""
+        self.games += other.games
+        self.unfinished_games += other.unfinished_games
+        self.total_turns += other.total_turns
+
+        for name, wins in other.wins.items():
+            self.wins[name] = self.wins.get(name, 0) + wins
+
+        for action_type, count in other.action_histogram.items():
+            self.action_histogram[action_type] = self.action_histogram.get(action_type, 0) + count
+
+
+def play_game(
+    number_of_players: int,
+    seed: Union[int, str],
+    game_id: int,
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> GameResult:
+    """Replay a single tournament game from its id"""
+    handler = ResistanceCoupGameHandler(
+        number_of_players, players=build_ai_players(number_of_players)
+    )
+    return simulate_game(handler, max_turns, game_seed(seed, game_id))
+
+
+def _play_games_chunk(
+    number_of_players: int,
+    seed: Union[int, str],
+    first_game_id: int,
+    last_game_id: int,
+    max_turns: int,
+    compact: bool,
+) -> TournamentStats:
+    stats = TournamentStats()
+
+    if compact:
+        compact_handler = CompactGameHandler(number_of_players)
+        for game_id in range(first_game_id, last_game_id):
+            stats.add_result(
+                simulate_compact_game(compact_handler, max_turns, game_seed(seed, game_id))
+            )
+        return stats
+
+    handler = ResistanceCoupGameHandler(
+        number_of_players, players=build_ai_players(number_of_players)
+    )
+    for game_id in range(first_game_id, last_game_id):
+        stats.add_result(simulate_game(handler, max_turns, game_seed(seed, game_id)))
+
+    return stats
+
+
+def run_tournament(
+    number_of_players: int,
+    number_of_games: int,
+    seed: Union[int, str] = 0,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    compact: bool = False,
+) -> TournamentStats:
+    """
+    Spread headless games over a process pool and merge their statistics.
+
+    Every game is seeded from (seed, game_id) alone, so the merged statistics are identical
+    regardless of the number of processes or the order in which chunks finish. With compact=True
+    the games run on CompactGameHandler instead of the pydantic models.
+    """
+    processes = processes or os.cpu_count() or 1
+    chunks = [
+        (first_game_id, min(first_game_id + chunk_size, number_of_games))
+        for first_game_id in range(0, number_of_games, chunk_size)
+    ]
+
+    stats = TournamentStats()
+    if processes == 1:
+        for first_game_id, last_game_id in chunks:
+            stats.merge(
+                _play_games_chunk(
+                    number_of_players, seed, first_game_id, last_game_id, max_turns, compact
+                )
+            )
+        return stats
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(
+                _play_games_chunk,
+                number_of_players,
+                seed,
+                first_game_id,
+                last_game_id,
+                max_turns,
+                compact,
+            )
+            for first_game_id, last_game_id in chunks
+        ]
+        for future in futures:
+            stats.merge(future.result())
+
+    return stats
@@ -1,12 +1,12 @@
 from enum import Enum
-from typing import List, Optional
+from types import MappingProxyType
+from typing import List, Mapping, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from src.models.card import CardType
 
 
-
 class ActionType(str, Enum):
     income = "Income"
     foreign_aid = "Foreign Aid"
@@ -30,6 +30,8 @@ class CounterActionType(str, Enum):
 
 
 class Action(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     action_type: ActionType
     associated_card_type: Optional[CardType] = None
     requires_target: bool = False
@@ -83,6 +85,8 @@ class ExchangeAction(Action):
 
 
 class CounterAction(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     action_type: ActionType = ActionType.counter
     counter_type: CounterActionType
     associated_card_type: Optional[List[CardType]]
@@ -91,6 +95,8 @@ class CounterAction(BaseModel):
         return f"{self.counter_type.value}"
 
 class NoCounterAction(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     action_type: ActionType = ActionType.no_counter
     counter_type: CounterActionType
     associated_card_type: Optional[List[CardType]]
@@ -137,9 +143,59 @@ class BlockStealCounterAction(CounterAction):
     associated_card_type: CardType = CardType.captain
 
 
+# Actions are frozen, so a single shared instance of each is built once and reused everywhere
+ACTION_CATALOG: Mapping[ActionType, Action] = MappingProxyType(
+    {
+        ActionType.income: IncomeAction(),
+        ActionType.foreign_aid: ForeignAidAction(),
+        ActionType.coup: CoupAction(),
+        ActionType.tax: TaxAction(),
+        ActionType.assassinate: AssassinateAction(),
+        ActionType.steal: StealAction(),
+        ActionType.exchange: ExchangeAction(),
+        ActionType.challenge: ChallengeAction(),
+        ActionType.no_challenge: NoChallengeAction(),
+        ActionType.exchange_cards: ExchangeCardsAction(),
+    }
+)
+
+COUNTER_ACTION_CATALOG: Mapping[CounterActionType, CounterAction] = MappingProxyType(
+    {
+        CounterActionType.block_foreign_aid: BlockForeignAidCounterAction(),
+        CounterActionType.block_assassination: BlockAssassinationCounterAction(),
+        CounterActionType.block_steal: BlockStealCounterAction(),
+    }
+)
+
+NO_COUNTER_ACTION_CATALOG: Mapping[CounterActionType, NoCounterAction] = MappingProxyType(
+    {
+        counter_type: NoCounterAction(
+            counter_type=counter_type, associated_card_type=[counter.associated_card_type]
+        )
+        for counter_type, counter in COUNTER_ACTION_CATALOG.items()
+    }
+)
+
+REMOVE_CARD_ACTION_CATALOG: Mapping[CardType, RemoveCardAction] = MappingProxyType(
+    {card_type: RemoveCardAction(card=card_type) for card_type in CardType}
+)
+
+_COUNTER_ACTION_TYPES: Mapping[ActionType, CounterActionType] = MappingProxyType(
+    {
+        ActionType.foreign_aid: CounterActionType.block_foreign_aid,
+        ActionType.steal: CounterActionType.block_steal,
+        ActionType.assassinate: CounterActionType.block_assassination,
+    }
+)
+
+
+def get_action(action_type: ActionType) -> Action:
+    return ACTION_CATALOG[action_type]
+
+
 def get_counter_action(action_type: ActionType) -> CounterAction:
-    return {
-        ActionType.foreign_aid: BlockForeignAidCounterAction(),
-        ActionType.steal: BlockStealCounterAction(),
-        ActionType.assassinate: BlockAssassinationCounterAction(),
-    }[action_type]
+    return COUNTER_ACTION_CATALOG[_COUNTER_ACTION_TYPES[action_type]]
+
+
+def get_no_counter_action(action_type: ActionType) -> NoCounterAction:
+    return NO_COUNTER_ACTION_CATALOG[_COUNTER_ACTION_TYPES[action_type]]
@@ -0,0 +1,185 @@
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.models.action import ACTION_CATALOG, Action, ActionType, get_counter_action
+from src.models.card import Card, CardType, build_deck, create_card
+
+# Cards are stored as small ints: the index of their type in CardType
+CARD_TYPES: Tuple[CardType, ...] = tuple(CardType)
+CARD_CODES: Dict[CardType, int] = {card_type: code for code, card_type in enumerate(CARD_TYPES)}
+NO_CARD = 0xFF
+
+# The hot loop relies on hands having exactly two slots
+HAND_SIZE = 2
+DECK_COMPOSITION: Tuple[int, ...] = tuple(
+    Counter(card.card_type for card in build_deck())[card_type] for card_type in CARD_TYPES
+)
+
+# Main actions are stored as small ints too: their index in ACTIONS
+ACTIONS: Tuple[Action, ...] = tuple(
+    ACTION_CATALOG[action_type]
+    for action_type in (
+        ActionType.income,
+        ActionType.foreign_aid,
+        ActionType.coup,
+        ActionType.tax,
+        ActionType.assassinate,
+        ActionType.steal,
+        ActionType.exchange,
+    )
+)
+INCOME, FOREIGN_AID, COUP, TAX, ASSASSINATE, STEAL, EXCHANGE = range(len(ACTIONS))
+ACTION_CODES: Dict[ActionType, int] = {
+    action.action_type: code for code, action in enumerate(ACTIONS)
+}
+
+# Per-action rule tables, derived from the pydantic actions so both representations agree
+ACTION_CARD: bytes = bytes(
+    CARD_CODES[action.associated_card_type] if action.associated_card_type else NO_CARD
+    for action in ACTIONS
+)
+ACTION_REQUIRES_TARGET: Tuple[bool, ...] = tuple(action.requires_target for action in ACTIONS)
+ACTION_CAN_BE_CHALLENGED: Tuple[bool, ...] = tuple(action.can_be_challenged for action in ACTIONS)
+ACTION_CAN_BE_COUNTERED: Tuple[bool, ...] = tuple(action.can_be_countered for action in ACTIONS)
+COUNTER_CARD: bytes = bytes(
+    CARD_CODES[get_counter_action(action.action_type).associated_card_type]
+    if action.can_be_countered
+    else NO_CARD
+    for action in ACTIONS
+)
+
+# Same ordering as BasePlayer.available_actions
+_BASE_ACTIONS = (INCOME, FOREIGN_AID, TAX, STEAL, EXCHANGE)
+_ASSASSIN_ACTIONS = _BASE_ACTIONS + (ASSASSINATE,)
+_RICH_ACTIONS = _BASE_ACTIONS + (COUP, ASSASSINATE)
+_FORCED_COUP_ACTIONS = (COUP,)
+
+
+def available_actions(coins: int) -> Sequence[int]:
+    """Actions a player with this many coins can choose from"""
+    if coins >= 10:
+        return _FORCED_COUP_ACTIONS
+    if coins >= 7:
+        return _RICH_ACTIONS
+    if coins >= 3:
+        return _ASSASSIN_ACTIONS
+    return _BASE_ACTIONS
+
+
+class CompactGameState:
+    """
+    Array-backed game state for the hot loop.
+
+    Coins are an unsigned byte per player, hands are HAND_SIZE bytes per player (NO_CARD marks lost
+    influence) and the deck is a bytearray whose end is the top of the deck.
+    """
+
+    __slots__ = ("coins", "hands", "deck", "treasury", "current_player")
+
+    def __init__(
+        self, coins: array, hands: bytearray, deck: bytearray, treasury: int, current_player: int
+    ):
+        self.coins = coins
+        self.hands = hands
+        self.deck = deck
+        self.treasury = treasury
+        self.current_player = current_player
+
+    @property
+    def number_of_players(self) -> int:
+        return len(self.coins)
+
+    def copy(self) -> "CompactGameState":
+        return CompactGameState(
+            array("B", self.coins),
+            bytearray(self.hands),
+            bytearray(self.deck),
+            self.treasury,
+            self.current_player,
+        )
+
+    def hand(self, player: int) -> List[int]:
+        hands = self.hands
+        start = player * HAND_SIZE
+        return [code for code in (hands[start], hands[start + 1]) if code != NO_CARD]
+
+    def influence(self, player: int) -> int:
+        hands = self.hands
+        start = player * HAND_SIZE
+        return (hands[start] != NO_CARD) + (hands[start + 1] != NO_CARD)
+
+    def is_active(self, player: int) -> bool:
+        hands = self.hands
+        start = player * HAND_SIZE
+        return hands[start] != NO_CARD or hands[start + 1] != NO_CARD
+
+    def active_players(self) -> List[int]:
+        hands = self.hands
+        return [
+            player
+            for player in range(len(self.coins))
+            if hands[player * HAND_SIZE] != NO_CARD or hands[player * HAND_SIZE + 1] != NO_CARD
+        ]
+
+    def winner(self) -> Optional[int]:
+        active_players = self.active_players()
+        return active_players[0] if len(active_players) == 1 else None
+
+    def find_card_slot(self, player: int, card: int) -> Optional[int]:
+        start = player * HAND_SIZE
+        for slot in range(start, start + HAND_SIZE):
+            if self.hands[slot] == card:
+                return slot
+        return None
+
+    def card_slots(self, player: int) -> List[int]:
+        start = player * HAND_SIZE
+        return [slot for slot in range(start, start + HAND_SIZE) if self.hands[slot] != NO_CARD]
+
+    def discards(self) -> List[int]:
+        """Number of cards of each type that are out of the game (lost influence)"""
+        discards = list(DECK_COMPOSITION)
+        for code in self.deck:
+            discards[code] -= 1
+        for code in self.hands:
+            if code != NO_CARD:
+                discards[code] -= 1
+        return discards
+
+    def available_actions(self, player: int) -> Sequence[int]:
+        return available_actions(self.coins[player])
+
+    @classmethod
+    def from_models(
+        cls,
+        hands: Sequence[Sequence[Card]],
+        coins: Sequence[int],
+        deck: Sequence[Card],
+        treasury: int,
+        current_player: int,
+    ) -> "CompactGameState":
+        """Convert from the pydantic models, e.g. a snapshot of ResistanceCoupGameHandler"""
+        packed_hands = bytearray([NO_CARD]) * (HAND_SIZE * len(hands))
+        for player, cards in enumerate(hands):
+            for ind, card in enumerate(cards):
+                packed_hands[player * HAND_SIZE + ind] = CARD_CODES[card.card_type]
+
+        return cls(
+            array("B", coins),
+            packed_hands,
+            bytearray(CARD_CODES[card.card_type] for card in deck),
+            treasury,
+            current_player,
+        )
+
+    def hand_cards(self, player: int) -> List[Card]:
+        return to_cards(self.hand(player))
+
+    def deck_cards(self) -> List[Card]:
+        return to_cards(self.deck)
+
+
+def to_cards(codes: Sequence[int]) -> List[Card]:
+    """Convert card codes back to pydantic cards for display or LLM prompts"""
+    return [create_card(CARD_TYPES[code]) for code in codes]
@@ -0,0 +1,59 @@
+from enum import Enum
+from typing import List, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from src.models.action import ActionType
+from src.models.card import CardType
+
+
+class GameEventType(str, Enum):
+    game_start = "game_start"
+    deal = "deal"
+    action = "action"
+    challenge = "challenge"
+    reveal = "reveal"
+    counter = "counter"
+    discard = "discard"
+    exchange = "exchange"
+    elimination = "elimination"
+    game_end = "game_end"
+
+
+# Events that record a player's decision, everything else follows from the rules and the seed
+DECISION_EVENT_TYPES = frozenset(
+    {
+        GameEventType.action,
+        GameEventType.challenge,
+        GameEventType.counter,
+        GameEventType.discard,
+        GameEventType.exchange,
+    }
+)
+
+
+class GameEvent(BaseModel):
+    """
+    A single thing that happened in a game. Players are referred to by seat.
+
+    - game_start: seed and player names
+    - deal: player and the dealt cards
+    - action: player, action_type and target
+    - challenge: player (the challenger), target (the challenged player) and the claimed card_type
+    - reveal: player and the card_type shown to win a challenge
+    - counter: player, the countered action_type and target (the player whose action is countered)
+    - discard: player and the card_type lost
+    - exchange: player and the cards returned to the deck
+    - elimination: player
+    - game_end: player (the winner, if any)
+    """
+
+    event_type: GameEventType
+    turn: int = 0
+    player: Optional[int] = None
+    target: Optional[int] = None
+    action_type: Optional[ActionType] = None
+    card_type: Optional[CardType] = None
+    cards: List[CardType] = Field(default_factory=list)
+    seed: Optional[Union[int, str]] = None
+    players: List[str] = Field(default_factory=list)
@@ -1,21 +1,121 @@
+import asyncio
 import json
-import random
-import time
-from typing import List, Optional, Tuple
-
-from src.models.action import Action, ActionType, ChallengeAction, NoChallengeAction, CounterAction, NoCounterAction, RemoveCardAction
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import Field, PrivateAttr
+
+from src.models.action import (
+    ACTION_CATALOG,
+    REMOVE_CARD_ACTION_CATALOG,
+    Action,
+    ActionType,
+    CounterAction,
+    get_counter_action,
+    get_no_counter_action,
+)
 from src.models.card import Card
+from src.models.players import fallback
+from src.models.event import GameEvent
 from src.models.players.base import BasePlayer
+from src.models.players.beliefs import CardBeliefs
+from src.models.players.challenge_odds import DiscardPile
+from src.models.players.memory import AgentMemory
 
 from src.utils.print import print_text, print_texts, print_panel, print_panel_with_title
-from src.utils.api_interface import client
+from src.utils.api_interface import llm
+from src.utils.llm_backends import estimate_tokens
+from src.utils.tracing import trace_context
+
+# Re-asks after an invalid answer, and the time a whole decision may take, before falling back
+DEFAULT_DECISION_RETRIES = 2
+DEFAULT_DECISION_DEADLINE = 45.0
+
+# Stands in for the memory while the rest of a prompt is measured, see AgentPlayer._fill_memory
+_MEMORY_SLOT = "\x00memory\x00"
+
+_CHALLENGE_DECISIONS = (ACTION_CATALOG[ActionType.challenge], ACTION_CATALOG[ActionType.no_challenge])
+
+_THINKING_TASK = """Think about the current state of the game and your overall strategy.
+
+Weigh the risks and benefits and think about what you think is the best course of action. Output your thoughts in a clear and concise manner."""
+
+# In single call mode the thoughts are returned next to the decision, in this free text field
+_REASONING_FIELD = {
+    "name": "reasoning",
+    "type": "string",
+    "required": True,
+}
+
+
+def _reasoning_feedback(json_content: Dict) -> str:
+    """The reasoning field is free text, so there are no options to point the model to"""
+    reasoning = json_content.get(_REASONING_FIELD["name"])
+    if isinstance(reasoning, str) and reasoning.strip():
+        return ""
+    return 'Please try again and put your thoughts about the game, as text, in the "reasoning" field.\n'
 
 
 class AgentPlayer(BasePlayer):
     is_ai: bool = True
     personality: str
     inner_thoughts: str = ""
-
+    # Structured beliefs and a token budget for what ends up in prompts
+    memory: AgentMemory = Field(default_factory=AgentMemory)
+    think_delay: float = 1.0
+    # Think and decide in one structured completion instead of two sequential ones
+    single_call_decisions: bool = False
+    decision_retries: int = DEFAULT_DECISION_RETRIES
+    decision_deadline: Optional[float] = DEFAULT_DECISION_DEADLINE
+    # How often each decision type was made by the rule based fallback policy
+    fallback_counts: Dict[str, int] = Field(default_factory=dict)
+    # Add the chance that each opponent holds each card to prompts
+    track_beliefs: bool = True
+    # Add the chance that a challenged claim is true, going by own cards and discards
+    challenge_hints: bool = True
+
+    _beliefs: Optional[CardBeliefs] = PrivateAttr(default=None)
+    _discards: DiscardPile = PrivateAttr(default_factory=DiscardPile)
+
+    def reset_player(self):
+        super().reset_player()
+        self.memory.reset()
+        self.fallback_counts = {}
+
+    @property
+    def observes_events(self) -> bool:
+        # Memory and the discard pile (which feeds the fallback challenge policy) follow the events
+        return True
+
+    def observe(self, event: GameEvent) -> None:
+        self.memory.observe(event, self.name)
+        self._discards.observe(event)
+        if not self.track_beliefs:
+            return
+        if self._beliefs is None:
+            self._beliefs = CardBeliefs(self.name)
+        self._beliefs.observe(event)
+
+    @property
+    def memory_prompt(self) -> str:
+        """Beliefs and inner thoughts, before they are cut down to fit a prompt (see _fill_memory)"""
+        return self._render_memory(0)
+
+    def _render_memory(self, reserved_tokens: int) -> str:
+        card_odds = ""
+        if self._beliefs is not None:
+            self._beliefs.update_own_hand(self.cards)
+            card_odds = self._beliefs.render()
+        return self.memory.render(self.inner_thoughts, card_odds, reserved_tokens)
+
+    def _fill_memory(self, prompt: str) -> str:
+        """Put the memory into the prompt, with the inner thoughts cut down so the whole prompt fits the token budget"""
+        reserved_tokens = estimate_tokens(prompt.replace(_MEMORY_SLOT, ""))
+        return prompt.replace(_MEMORY_SLOT, self._render_memory(reserved_tokens))
+
+    async def _complete(self, messages: List[Dict[str, str]], call_site: str, attempt: int = 0, **kwargs) -> str:
+        self.memory.record_prompt(messages)
+        with trace_context(call_site=call_site, player=self.name, attempt=attempt):
+            return await llm.acomplete(messages, **kwargs)
 
     def _system_msg(self, overall_task: str, possible_actions: List, possible_players: List[BasePlayer], task: str) -> str:
         possible_actions_str = [str(action.action_type.value) for action in possible_actions]
@@ -25,7 +125,7 @@ class AgentPlayer(BasePlayer):
 {self.personality}
 
 You have the following inner thoughts and overall strategy:
-{self.inner_thoughts}
+{_MEMORY_SLOT}
 
 Your overall task is to decide the following:
 {overall_task}
@@ -44,36 +144,18 @@ Some actions do not require choosing a player.
 Your task is to decide the following:
 {task}"""
 
-        return system_msg
-
-    def _alter_thoughts(self, messages: List) -> str:
-        # Make a call to the llm to alter the inner thoughts based on the new thoughts, action and player
-        task = f"""You have now thought about the current state of the game and your overall strategy.
-
-Adjust and add your new thought to your inner thoughts. Output your thoughts in a clear and concise manner.
-
-Try to keep track of what cards others likely have based on their actions.
+        return self._fill_memory(system_msg)
 
-Inner thoughts:
-{self.inner_thoughts}
-
-Adjusted & new inner thoughts:"""
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages
-        )
-
-        new_inner_thoughts = response.choices[0].message.content.strip()
-        return new_inner_thoughts
-
-    def make_decision(self, overall_task: str, possible_actions: List, possible_players: List[BasePlayer], messages: List, decision_type: str):
+    async def make_decision(self, overall_task: str, possible_actions: List, possible_players: List[BasePlayer], messages: List, decision_type: str, with_reasoning: bool = False):
         """
         Options:
         1. Separator + parsing actions
         2. GPT functions
         3. JSON mode <- opted for this one for simplicity
         4. Use embedding to match raw text to actions
+
+        With with_reasoning the model also returns its thoughts in a "reasoning" field, so no separate
+        add_new_thought_to_messages call is needed.
         """
         if decision_type == "action":
             required_json = [
@@ -136,7 +218,15 @@ Adjusted & new inner thoughts:"""
         else:
             raise ValueError("Invalid decision type")
 
-        task = f"""You have now thought about the current state of the game and your overall strategy.
+        if with_reasoning:
+            required_json = [_REASONING_FIELD] + required_json
+            preamble = f"""{_THINKING_TASK}
+
+Put your thoughts in the "reasoning" field first."""
+        else:
+            preamble = "You have now thought about the current state of the game and your overall strategy."
+
+        task = f"""{preamble}
 
         You must now make a decision based on your thoughts. Output your decision in key value pairs in json format.
       
@@ -168,15 +258,11 @@ Here is the JSON schema, please fill in the required fields:
         system_msg = self._system_msg(overall_task, possible_actions, possible_players, task)
         messages.append({"role": "system", "content": system_msg})
 
-        for i in range(3):
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
-                response_format={"type": "json_object"}
+        for i in range(self.decision_retries + 1):
+            content = await self._complete(
+                messages, f"decide:{decision_type}", attempt=i, response_format={"type": "json_object"}
             )
 
-            content = response.choices[0].message.content
-
             print_text(f"{decision_type}: Decision from {self.name}: {content}")
 
             try:
@@ -194,15 +280,17 @@ Please try again and provide the json in the correct format\n"""})
                 required = item["required"]
                 enum_values = item.get("enum", [])
 
-                if required and name not in json_content:
+                if item is _REASONING_FIELD:
+                    feedback_str += _reasoning_feedback(json_content)
+                elif required and name not in json_content:
                     feedback_str += f"Please try again and provide the key {name} with one of the following values: {enum_values}\n"
                 elif required and name in json_content:
                     value = json_content[name]
 
-                    if (not value and value is not False) or value not in enum_values:
+                    if (not value and value is not False) or (enum_values and value not in enum_values):
                         # iterate through the enum values to see if there is a string match
                         for enum_value in enum_values:
-                            if enum_value.lower() in value.lower():
+                            if isinstance(enum_value, str) and isinstance(value, str) and enum_value.lower() in value.lower():
                                 feedback_str += f"Did you mean {enum_value}? Please try again and provide a valid value from the possible options: {enum_values}\n"
                                 break
                         else:
@@ -213,14 +301,17 @@ Please try again and provide the json in the correct format\n"""})
                 messages.append({"role": "system", "content": feedback_str})
                 continue
 
+            if with_reasoning:
+                print_panel_with_title(f"{self.name} is thinking the following:", json_content["reasoning"], justify="left")
+
             if decision_type == "action":
                 action = next((a for a in possible_actions if a.action_type.value == json_content["action"]), None)
                 player = None
                 if action.requires_target:
-                    player = next((p for p in possible_players if p.name == json_content["player"]), None)
+                    player = next((p for p in possible_players if p.name == json_content.get("player")), None)
 
                     if not player:
-                        messages.append({"role": "system", "content": f"Invalid player {json_content['player']}. Please try again and choose a valid player. One of the possible players is: {possible_players}"})
+                        messages.append({"role": "system", "content": f"Invalid player {json_content.get('player')}. Please try again and choose a valid player. One of the possible players is: {possible_players}"})
                         continue
 
                     if action.action_type == ActionType.steal and player.coins == 0:
@@ -243,60 +334,78 @@ Please try again and provide the json in the correct format\n"""})
                 # Fail case, just do a random action
         return None
 
-    def add_new_thought_to_messages(self, overall_task: str, possible_actions: List[Action or Card or CounterAction], possible_players: List[BasePlayer]) -> List:
-        task = """Think about the current state of the game and your overall strategy.
-
-Weigh the risks and benefits and think about what you think is the best course of action. Output your thoughts in a clear and concise manner."""
-        system_msg = self._system_msg(overall_task, possible_actions, possible_players, task)
+    async def add_new_thought_to_messages(self, overall_task: str, possible_actions: List[Action or Card or CounterAction], possible_players: List[BasePlayer]) -> List:
+        system_msg = self._system_msg(overall_task, possible_actions, possible_players, _THINKING_TASK)
         messages = [
             {"role": "system", "content": system_msg}
         ]
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages
-        )
-        new_thought = response.choices[0].message.content.strip()
+        new_thought = (await self._complete(messages, "think")).strip()
 
-        #self.inner_thoughts = self._alter_thoughts(new_thought)
         print_panel_with_title(f"{self.name} is thinking the following:", new_thought, justify="left")
 
         messages.append({"role": "assistant", "content": new_thought})
 
         return messages
 
+    async def _decide(self, overall_task: str, possible_actions: List, possible_players: List[BasePlayer], decision_type: str):
+        """
+        Think about the decision and make it within the decision deadline. Returns None when no valid
+        decision was made in time, callers then fall back to the rule based policy.
+        """
+        # Unlike wait_for, a timeout context never swallows a cancellation that races a late answer
+        try:
+            async with asyncio.timeout(self.decision_deadline):
+                decision = await self._think_and_decide(overall_task, possible_actions, possible_players, decision_type)
+        except TimeoutError:
+            decision = None
+
+        if decision is None:
+            print_text(f"{self.name} falls back to a rule based {decision_type} decision")
+            self.fallback_counts[decision_type] = self.fallback_counts.get(decision_type, 0) + 1
+        return decision
+
+    async def _think_and_decide(self, overall_task: str, possible_actions: List, possible_players: List[BasePlayer], decision_type: str):
+        """Think about the decision and make it, in one or two completions depending on single_call_decisions"""
+        if self.single_call_decisions:
+            return await self.make_decision(overall_task, possible_actions, possible_players, [], decision_type, with_reasoning=True)
+
+        messages = await self.add_new_thought_to_messages(overall_task, possible_actions, possible_players)
+        return await self.make_decision(overall_task, possible_actions, possible_players, messages, decision_type)
+
     def choose_action(self, other_players: List[BasePlayer]) -> Tuple[Action, Optional[BasePlayer]]:
+        """Choose the next action to perform"""
+        return llm.run(self.achoose_action(other_players))
+
+    async def achoose_action(self, other_players: List[BasePlayer]) -> Tuple[Action, Optional[BasePlayer]]:
         """Choose the next action to perform"""
         available_actions = self.available_actions()
 
         print_text(f"[bold magenta]{self}[/] is thinking...", with_markup=True)
-        time.sleep(1)
+        if self.think_delay:
+            await asyncio.sleep(self.think_delay)
 
         # Coup is only option
         if len(available_actions) == 1:
             overall_task = "You must coup because you have more than 10 coins. Choose a player to coup."
-            messages = self.add_new_thought_to_messages(overall_task, available_actions, other_players)
-            decision = self.make_decision(overall_task, available_actions, other_players, messages, "action")
+            decision = await self._decide(overall_task, available_actions, other_players, "action")
             if decision is not None:
                 return decision
         else:
             overall_task = "Choose an action to perform. Feel free to bluff if you feel you can get away with it... Even better if you make others think you have a card that you don't have."
-            messages = self.add_new_thought_to_messages(overall_task, available_actions, other_players)
-            decision = self.make_decision(overall_task, available_actions, other_players, messages, "action")
+            decision = await self._decide(overall_task, available_actions, other_players, "action")
             if decision is not None:
                 return decision
 
-        # Fail case, just do a random action
-        target_player = None
-        while True:
-            target_action = random.choice(available_actions)
-            if target_action.requires_target:
-                target_player = random.choice(other_players)
-
-            if self._validate_action(target_action, target_player):
-                return target_action, target_player
+        return fallback.choose_action(self, available_actions, other_players)
 
     def react_to_action(self, event: str, is_current_player: bool) -> str:
+        """
+        Make changes to internal thoughts + output something you want to say (could be nothing)
+        """
+        return llm.run(self.areact_to_action(event, is_current_player))
+
+    async def areact_to_action(self, event: str, is_current_player: bool) -> str:
         """
         Make changes to internal thoughts + output something you want to say (could be nothing)
         """
@@ -309,7 +418,7 @@ You just made the following move:
 {event}
 
 Here are your inner thoughts:
-{self.inner_thoughts}
+{_MEMORY_SLOT}
 
 Why did you make this move?"""
         else:
@@ -321,23 +430,28 @@ The following event just happened:
 {event}
 
 Here are your inner thoughts:
-{self.inner_thoughts}
+{_MEMORY_SLOT}
 
 What is your reaction & thoughts on this event and what might you say to influence the other players?"""
 
-        event_thoughts = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_msg}
-            ]
-        )
-
-        return event_thoughts.choices[0].message.content
+        return await self._complete([{"role": "system", "content": self._fill_memory(system_msg)}], "react")
 
     def adjust_internal_thoughts(self, event: str, is_current_player: bool, conversation: str) -> None:
         """
         Adjust internal thoughts based on the event and conversation that just happened
         """
+        llm.run(self.aadjust_internal_thoughts(event, is_current_player, conversation))
+
+    async def aadjust_internal_thoughts(self, event: str, is_current_player: bool, conversation: str) -> None:
+        """
+        Adjust internal thoughts based on the event and conversation that just happened
+        """
+        self.inner_thoughts = await self.aadjusted_internal_thoughts(event, is_current_player, conversation)
+
+    async def aadjusted_internal_thoughts(self, event: str, is_current_player: bool, conversation: str) -> str:
+        """
+        Return the adjusted internal thoughts without applying them, e.g. for speculative reactions
+        """
         system_msg = f"""You are {self.name}.
         
 You are playing a game of Coup.
@@ -349,47 +463,53 @@ After the event, the following conversation took place:
 {conversation}
 
 Here are your current inner thoughts:
-{self.inner_thoughts}
+{_MEMORY_SLOT}
 
-Adjust your inner thoughts based on the event and conversation. Output your thoughts in a clear and concise manner."""
+Adjust your inner thoughts based on the event and conversation. Output your thoughts in a clear and concise manner, in at most {self.memory.token_budget * 3 // 8} words."""
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_msg}
-            ]
-        )
-
-        self.inner_thoughts = response.choices[0].message.content
+        return await self._complete([{"role": "system", "content": self._fill_memory(system_msg)}], "adjust_thoughts")
 
     def determine_challenge(self, player: BasePlayer, action: Action) -> bool:
+        """Choose whether to challenge the current player"""
+        return llm.run(self.adetermine_challenge(player, action))
+
+    async def adetermine_challenge(self, player: BasePlayer, action: Action) -> bool:
         """Choose whether to challenge the current player"""
         task = f"Do you want to challenge {str(player)} on their attempt to {action.action_type.value}? Keep in mind you also have the option to counter (or bluff a counter) if you don't challenge right now."
-        messages = self.add_new_thought_to_messages(task, [ChallengeAction(), NoChallengeAction()], [player])
-        challenge = self.make_decision(task, [ChallengeAction(), NoChallengeAction()], [player], messages, "challenge")
+        if self.challenge_hints:
+            probability = self._discards.claim_probability(action.associated_card_type, len(player.cards), self.cards)
+            task += f" Going by your cards and the discarded cards, the chance that {str(player)} holds a {action.associated_card_type.value} is {probability:.2f}."
+        challenge = await self._decide(task, _CHALLENGE_DECISIONS, [player], "challenge")
 
         if challenge is not None:
             return challenge
 
-        return random.randint(0, 4) == 0
+        return fallback.determine_challenge(self, action, self._discards.cards())
 
     def determine_counter(self, player: BasePlayer, action: Action) -> bool:
+        """Choose whether to counter the current player's action"""
+        return llm.run(self.adetermine_counter(player, action))
+
+    async def adetermine_counter(self, player: BasePlayer, action: Action) -> bool:
         """Choose whether to counter the current player's action"""
         task = f"Do you want to counter {str(player)} on their attempt to {action.action_type.value}?"
 
-        messages = self.add_new_thought_to_messages(task, [CounterAction(), NoCounterAction()], [player])
-        counter = self.make_decision(task, [CounterAction(), NoCounterAction()], [player], messages, "counter")
+        counter_decisions = [get_counter_action(action.action_type), get_no_counter_action(action.action_type)]
+        counter = await self._decide(task, counter_decisions, [player], "counter")
         if counter is not None:
             return counter
 
-        return random.randint(0, 9) == 0
+        return fallback.determine_counter(self, action)
 
     def remove_card(self) -> None:
         """Choose a card and remove it from your hand"""
-        remove_card_actions = [RemoveCardAction(card=card.card_type) for card in self.cards]
+        llm.run(self.aremove_card())
 
-        messages = self.add_new_thought_to_messages("You must choose a card to remove from your hand", remove_card_actions, [])
-        card_to_remove = self.make_decision("You must choose a card to remove from your hand", remove_card_actions, [], messages, "remove_card")
+    async def aremove_card(self) -> None:
+        """Choose a card and remove it from your hand"""
+        remove_card_actions = [REMOVE_CARD_ACTION_CATALOG[card.card_type] for card in self.cards]
+
+        card_to_remove = await self._decide("You must choose a card to remove from your hand", remove_card_actions, [], "remove_card")
         if card_to_remove:
             for card in self.cards:
                 if card.card_type == card_to_remove.card_type:
@@ -399,18 +519,21 @@ Adjust your inner thoughts based on the event and conversation. Output your thou
             print_texts(f"{self} discards their ", (f"{card_to_remove}", card_to_remove.style), " card")
             return
 
-        # Fail case, just do a random action
-        discarded_card = self.cards.pop(random.randrange(len(self.cards)))
+        [discarded_card] = fallback.choose_cards_to_discard(self.cards, 1)
+        self.cards.remove(discarded_card)
         print_texts(f"{self} discards their ", (f"{discarded_card}", discarded_card.style), " card")
 
     def choose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
         """Perform the exchange action. Pick which 2 cards to send back to the deck"""
+        return llm.run(self.achoose_exchange_cards(exchange_cards))
+
+    async def achoose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
+        """Perform the exchange action. Pick which 2 cards to send back to the deck"""
 
         self.cards += exchange_cards
-        random.shuffle(self.cards)
-        remove_card_actions = [RemoveCardAction(card=card.card_type) for card in self.cards]
-        messages = self.add_new_thought_to_messages("You have drawn 2 cards from the deck, but you have to give 2 back", remove_card_actions, [])
-        cards = self.make_decision("You have drawn 2 cards from the deck, but you have to give 2 back", remove_card_actions, [], messages, "exchange_cards")
+        self._random.shuffle(self.cards)
+        remove_card_actions = [REMOVE_CARD_ACTION_CATALOG[card.card_type] for card in self.cards]
+        cards = await self._decide("You have drawn 2 cards from the deck, but you have to give 2 back", remove_card_actions, [], "exchange_cards")
         print_text(f"{self} exchanges 2 cards")
         if cards is not None:
             (card_1, card_2) = cards
@@ -425,4 +548,7 @@ Adjust your inner thoughts based on the event and conversation. Output your thou
                     break
             return card_1, card_2
 
-        return self.cards.pop(), self.cards.pop()
+        card_1, card_2 = fallback.choose_cards_to_discard(self.cards, 2)
+        self.cards.remove(card_1)
+        self.cards.remove(card_2)
+        return card_1, card_2
@@ -1,68 +1,126 @@
-import random
+import asyncio
 import time
 from typing import List, Optional, Tuple
 
+from pydantic import PrivateAttr
+
 from src.models.action import Action
 from src.models.card import Card
+from src.models.event import GameEvent
 from src.models.players.base import BasePlayer
+from src.models.players.beliefs import DEFAULT_BLUFF_RATE, CardBeliefs
+from src.models.players.challenge_odds import DiscardPile
 from src.utils.print import print_text, print_texts
 
 
 class AIPlayer(BasePlayer):
     is_ai: bool = True
+    think_delay: float = 1.0
+
+    # With a threshold, challenge claims that are less likely than the threshold to be true instead
+    # of challenging at random. The odds come from tracked beliefs, or else from own cards and discards
+    track_beliefs: bool = False
+    bluff_rate: float = DEFAULT_BLUFF_RATE
+    challenge_threshold: Optional[float] = None
+
+    _beliefs: Optional[CardBeliefs] = PrivateAttr(default=None)
+    _discards: DiscardPile = PrivateAttr(default_factory=DiscardPile)
+
+    @property
+    def observes_events(self) -> bool:
+        return self.track_beliefs or self.challenge_threshold is not None
+
+    @property
+    def beliefs(self) -> Optional[CardBeliefs]:
+        """What this player believes about the hands of the others, if it tracks beliefs"""
+        if self._beliefs is not None:
+            self._beliefs.update_own_hand(self.cards)
+        return self._beliefs
+
+    def observe(self, event: GameEvent) -> None:
+        self._discards.observe(event)
+        if not self.track_beliefs:
+            return
+        if self._beliefs is None:
+            self._beliefs = CardBeliefs(self.name, self.bluff_rate)
+        self._beliefs.observe(event)
+
+    def claim_probability(self, player: BasePlayer, action: Action) -> float:
+        """Probability that the player holds the card their action needs"""
+        beliefs = self.beliefs
+        seat = beliefs.seat_of(player.name) if beliefs is not None else None
+        if seat is not None:
+            return beliefs.holds(seat, action.associated_card_type)
+        return self._discards.claim_probability(action.associated_card_type, len(player.cards), self.cards)
 
     def choose_action(self, other_players: List[BasePlayer]) -> Tuple[Action, Optional[BasePlayer]]:
         """Choose the next action to perform"""
 
-        available_actions = self.available_actions()
+        print_text(f"[bold magenta]{self}[/] is thinking...", with_markup=True)
+        if self.think_delay:
+            time.sleep(self.think_delay)
+
+        return self._pick_action(other_players)
 
+    async def achoose_action(
+        self, other_players: List[BasePlayer]
+    ) -> Tuple[Action, Optional[BasePlayer]]:
         print_text(f"[bold magenta]{self}[/] is thinking...", with_markup=True)
-        time.sleep(1)
+        if self.think_delay:
+            await asyncio.sleep(self.think_delay)
+
+        return self._pick_action(other_players)
+
+    def _pick_action(self, other_players: List[BasePlayer]) -> Tuple[Action, Optional[BasePlayer]]:
+        available_actions = self.available_actions()
 
         # Coup is only option
         if len(available_actions) == 1:
-            player = random.choice(other_players)
+            player = self._random.choice(other_players)
             return available_actions[0], player
 
         # Pick any other random choice (might be a bluff)
-        target_action = random.choice(available_actions)
+        target_action = self._random.choice(available_actions)
         target_player = None
 
         if target_action.requires_target:
-            target_player = random.choice(other_players)
+            target_player = self._random.choice(other_players)
 
         # Make sure we have a valid action/player combination
         while not self._validate_action(target_action, target_player):
-            target_action = random.choice(available_actions)
+            target_action = self._random.choice(available_actions)
             if target_action.requires_target:
-                target_player = random.choice(other_players)
+                target_player = self._random.choice(other_players)
 
         return target_action, target_player
 
     def determine_challenge(self, player: BasePlayer, action:Action) -> bool:
         """Choose whether to challenge the current player"""
 
+        if self.challenge_threshold is not None:
+            return self.claim_probability(player, action) < self.challenge_threshold
+
         # 20% chance of challenging
-        return random.randint(0, 4) == 0
+        return self._random.randint(0, 4) == 0
 
     def determine_counter(self, player: BasePlayer, action:Action) -> bool:
         """Choose whether to counter the current player's action"""
 
         # 10% chance of countering
-        return random.randint(0, 9) == 0
+        return self._random.randint(0, 9) == 0
 
     def remove_card(self) -> None:
         """Choose a card and remove it from your hand"""
 
         # Remove a random card
-        discarded_card = self.cards.pop(random.randrange(len(self.cards)))
+        discarded_card = self.cards.pop(self._random.randrange(len(self.cards)))
         print_texts(f"{self} discards their ", (f"{discarded_card}", discarded_card.style), " card")
 
     def choose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
         """Perform the exchange action. Pick which 2 cards to send back to the deck"""
 
         self.cards += exchange_cards
-        random.shuffle(self.cards)
+        self._random.shuffle(self.cards)
         print_text(f"{self} exchanges 2 cards")
 
         return self.cards.pop(), self.cards.pop()
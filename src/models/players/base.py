@@ -1,33 +1,48 @@
+import random
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
-
-from pydantic import BaseModel
-
-from src.models.action import (
-    Action,
-    ActionType,
-    AssassinateAction,
-    CounterAction,
-    CoupAction,
-    ExchangeAction,
-    ForeignAidAction,
-    IncomeAction,
-    StealAction,
-    TaxAction,
-)
+from typing import List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from src.models.action import ACTION_CATALOG, Action, ActionType, CounterAction
 from src.models.card import Card, CardType
+from src.models.event import GameEvent
+
+# Shared, pre-built action lists (actions are frozen so they can be reused by every player)
+_BASE_ACTIONS: Tuple[Action, ...] = tuple(
+    ACTION_CATALOG[action_type]
+    for action_type in (
+        ActionType.income,
+        ActionType.foreign_aid,
+        ActionType.tax,
+        ActionType.steal,
+        ActionType.exchange,
+    )
+)
+_COUP_ONLY_ACTIONS: Tuple[Action, ...] = (ACTION_CATALOG[ActionType.coup],)
+_ASSASSIN_ACTIONS: Tuple[Action, ...] = _BASE_ACTIONS + (ACTION_CATALOG[ActionType.assassinate],)
+_RICH_ACTIONS: Tuple[Action, ...] = _BASE_ACTIONS + (
+    ACTION_CATALOG[ActionType.coup],
+    ACTION_CATALOG[ActionType.assassinate],
+)
 
 
 class BasePlayer(BaseModel, ABC):
     name: str
     coins: int = 0
-    cards: List[Card] = []
+    cards: List[Card] = Field(default_factory=list)
     is_ai: bool
     is_active: bool = False
 
+    # Each player owns its random generator so games can be replayed from a seed
+    _random: random.Random = PrivateAttr(default_factory=random.Random)
+
     def __str__(self):
         return f"{self.name}"
 
+    def seed_random(self, seed: int) -> None:
+        self._random.seed(seed)
+
     def reset_player(self):
         self.coins = 0
         self.cards = []
@@ -42,19 +57,27 @@ class BasePlayer(BaseModel, ABC):
 
         return True
 
-    def available_actions(self) -> List[Action]:
+    def available_actions(self) -> Sequence[Action]:
         # You must coup if you have more than 10 coins
         if self.coins >= 10:
-            return [CoupAction()]
+            return _COUP_ONLY_ACTIONS
 
-        actions = [IncomeAction(), ForeignAidAction(), TaxAction(), StealAction(), ExchangeAction()]
         if self.coins >= 7:
-            actions.append(CoupAction())
+            return _RICH_ACTIONS
 
         if self.coins >= 3:
-            actions.append(AssassinateAction())
+            return _ASSASSIN_ACTIONS
+
+        return _BASE_ACTIONS
+
+    @property
+    def observes_events(self) -> bool:
+        """Whether the game handler should forward its events to observe"""
+        return False
 
-        return actions
+    def observe(self, event: GameEvent) -> None:
+        """Follow the game through its structured events"""
+        pass
 
     def find_card(self, card_type: CardType) -> Optional[Card]:
         for ind, card in enumerate(self.cards):
@@ -89,3 +112,23 @@ class BasePlayer(BaseModel, ABC):
     def choose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
         """Perform the exchange action. Pick which 2 cards to send back to the deck"""
         pass
+
+    # Async protocol used by the game handler. The defaults call the synchronous decisions, players
+    # that wait on something (a person, an LLM) override them so other games can run meanwhile.
+
+    async def achoose_action(
+        self, other_players: List["BasePlayer"]
+    ) -> Tuple[Action, Optional["BasePlayer"]]:
+        return self.choose_action(other_players)
+
+    async def adetermine_challenge(self, player: "BasePlayer", action: Action) -> bool:
+        return self.determine_challenge(player, action)
+
+    async def adetermine_counter(self, player: "BasePlayer", action: Action) -> bool:
+        return self.determine_counter(player, action)
+
+    async def aremove_card(self) -> None:
+        self.remove_card()
+
+    async def achoose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
+        return self.choose_exchange_cards(exchange_cards)
@@ -0,0 +1,276 @@
+from itertools import combinations_with_replacement
+from math import comb, prod
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.models.action import ACTION_CATALOG, get_counter_action
+from src.models.card import Card, CardType
+from src.models.compact_state import CARD_CODES, CARD_TYPES, DECK_COMPOSITION, HAND_SIZE
+from src.models.event import GameEvent, GameEventType
+
+# How much less likely a claim is when the claimant doesn't hold the card
+DEFAULT_BLUFF_RATE = 0.3
+
+# Every hand of each size as sorted card codes: 15 two-card hands, 5 one-card hands and the empty one
+HANDS: Dict[int, Tuple[Tuple[int, ...], ...]] = {
+    size: tuple(combinations_with_replacement(range(len(CARD_TYPES)), size))
+    for size in range(HAND_SIZE + 1)
+}
+_HAND_INDEX: Dict[int, Dict[Tuple[int, ...], int]] = {
+    size: {hand: ind for ind, hand in enumerate(hands)} for size, hands in HANDS.items()
+}
+_HAND_COUNTS: Dict[int, Tuple[Tuple[int, ...], ...]] = {
+    size: tuple(tuple(hand.count(card) for card in range(len(CARD_TYPES))) for hand in hands)
+    for size, hands in HANDS.items()
+}
+
+
+def hand_prior(pool: Sequence[int], size: int) -> List[float]:
+    """Probability of each hand of the given size when dealt from a pool of card counts"""
+    pool = [max(count, 0) for count in pool]
+    total = comb(sum(pool), size)
+    if not total:
+        return [0.0] * len(HANDS[size])
+    return [
+        prod(comb(pool[card], count) for card, count in enumerate(counts)) / total
+        for counts in _HAND_COUNTS[size]
+    ]
+
+
+def _without(hand: Tuple[int, ...], card: int) -> Tuple[int, ...]:
+    rest = list(hand)
+    rest.remove(card)
+    return tuple(rest)
+
+
+def _normalized(weights: List[float]) -> Optional[List[float]]:
+    total = sum(weights)
+    return [weight / total for weight in weights] if total > 0 else None
+
+
+class CardBeliefs:
+    """
+    What one player believes about the hidden cards of every other player.
+
+    Each opponent has a probability distribution over the hands they may hold. It is the
+    hypergeometric prior of dealing their hand from the cards this player can't see (the deck
+    composition minus its own hand and every discarded card), times a likelihood weight per hand.
+    Claims multiply the weights (a hand without the claimed card is `bluff_rate` times as likely),
+    a called bluff rules out hands with the card, and reveals, discards and exchanges transform
+    the distribution of that opponent. Every update touches at most 20 hands per opponent.
+
+    The tracker follows the game through its GameEvents (see BasePlayer.observe), only using what
+    is public or known to this player, and through update_own_hand.
+    """
+
+    def __init__(self, name: str, bluff_rate: float = DEFAULT_BLUFF_RATE):
+        self.name = name
+        self.bluff_rate = bluff_rate
+        self.reset([])
+
+    def reset(self, names: Sequence[str]) -> None:
+        self._names = list(names)
+        self._seat = self._names.index(self.name) if self.name in self._names else None
+        self._own = [0] * len(CARD_TYPES)
+        self._discarded = [0] * len(CARD_TYPES)
+        self._sizes = {seat: HAND_SIZE for seat in range(len(self._names)) if seat != self._seat}
+        self._weights = {seat: [1.0] * len(HANDS[HAND_SIZE]) for seat in self._sizes}
+        self._posteriors: Dict[int, List[float]] = {}
+        self._challenged_claim: Optional[Tuple[int, int]] = None
+
+    def seat_of(self, name: str) -> Optional[int]:
+        return self._names.index(name) if name in self._names else None
+
+    @property
+    def opponents(self) -> List[int]:
+        """Seats of the opponents still in the game"""
+        return [seat for seat, size in self._sizes.items() if size]
+
+    def update_own_hand(self, cards: Sequence[Card]) -> None:
+        self._set_own_hand(card.card_type for card in cards)
+
+    def _set_own_hand(self, card_types: Iterable[CardType]) -> None:
+        own = [0] * len(CARD_TYPES)
+        for card_type in card_types:
+            own[CARD_CODES[card_type]] += 1
+        if own != self._own:
+            self._own = own
+            self._posteriors.clear()
+
+    def _pool(self) -> List[int]:
+        return [
+            total - own - discarded
+            for total, own, discarded in zip(DECK_COMPOSITION, self._own, self._discarded)
+        ]
+
+    def _posterior(self, seat: int) -> List[float]:
+        posterior = self._posteriors.get(seat)
+        if posterior is None:
+            prior = hand_prior(self._pool(), self._sizes[seat])
+            # Evidence that contradicts the pool (e.g. a misread bluff) falls back to the prior
+            posterior = _normalized([p * w for p, w in zip(prior, self._weights[seat])]) or prior
+            self._posteriors[seat] = posterior
+        return posterior
+
+    def _set_distribution(self, seat: int, size: int, distribution: Optional[List[float]]) -> None:
+        """Store a distribution as likelihood weights relative to the current prior"""
+        self._sizes[seat] = size
+        if distribution is None:
+            self._weights[seat] = [1.0] * len(HANDS[size])
+        else:
+            prior = hand_prior(self._pool(), size)
+            self._weights[seat] = [p / q if q else 0.0 for p, q in zip(distribution, prior)]
+        self._posteriors.pop(seat, None)
+
+    def _holding(self, seat: int, card: int) -> Optional[List[float]]:
+        """Distribution over the rest of the hand, given that the opponent holds the card"""
+        size = self._sizes[seat]
+        rest = [0.0] * len(HANDS[size - 1])
+        for hand, probability in zip(HANDS[size], self._posterior(seat)):
+            if card in hand:
+                rest[_HAND_INDEX[size - 1][_without(hand, card)]] += probability
+        return _normalized(rest)
+
+    def _claim(self, seat: int, card: int) -> None:
+        weights = self._weights[seat]
+        for ind, hand in enumerate(HANDS[self._sizes[seat]]):
+            if card not in hand:
+                weights[ind] *= self.bluff_rate
+        self._posteriors.pop(seat, None)
+
+    def _rule_out(self, seat: int, card: int) -> None:
+        weights = self._weights[seat]
+        for ind, hand in enumerate(HANDS[self._sizes[seat]]):
+            if card in hand:
+                weights[ind] = 0.0
+        self._posteriors.pop(seat, None)
+
+    def _discard(self, seat: int, card: int) -> None:
+        rest = self._holding(seat, card)
+        self._discarded[card] += 1
+        self._posteriors.clear()
+        self._set_distribution(seat, self._sizes[seat] - 1, rest)
+
+    def _reveal(self, seat: int, card: int) -> None:
+        """The revealed card is shuffled into the deck and replaced by a random one"""
+        size = self._sizes[seat]
+        rest = self._holding(seat, card) or hand_prior(self._pool(), size - 1)
+
+        pool = self._pool()
+        swapped = [0.0] * len(HANDS[size])
+        for hand, probability in zip(HANDS[size - 1], rest):
+            available = [max(pool[drawn] - hand.count(drawn), 0) for drawn in range(len(pool))]
+            total = sum(available)
+            for drawn, count in enumerate(available):
+                if count:
+                    new_hand = tuple(sorted(hand + (drawn,)))
+                    swapped[_HAND_INDEX[size][new_hand]] += probability * count / total
+        self._set_distribution(seat, size, _normalized(swapped))
+
+    def _is_opponent(self, seat: Optional[int]) -> bool:
+        return self._sizes.get(seat, 0) > 0
+
+    def _on_game_start(self, event: GameEvent) -> None:
+        self.reset(event.players)
+
+    def _on_deal(self, event: GameEvent) -> None:
+        if event.player == self._seat:
+            self._set_own_hand(event.cards)
+
+    def _on_action(self, event: GameEvent) -> None:
+        card_type = ACTION_CATALOG[event.action_type].associated_card_type
+        if card_type is not None and self._is_opponent(event.player):
+            self._claim(event.player, CARD_CODES[card_type])
+
+    def _on_counter(self, event: GameEvent) -> None:
+        if self._is_opponent(event.player):
+            card_type = get_counter_action(event.action_type).associated_card_type
+            self._claim(event.player, CARD_CODES[card_type])
+
+    def _on_challenge(self, event: GameEvent) -> None:
+        self._challenged_claim = (event.target, CARD_CODES[event.card_type])
+
+    def _on_reveal(self, event: GameEvent) -> None:
+        self._challenged_claim = None
+        card = CARD_CODES[event.card_type]
+        if self._is_opponent(event.player):
+            self._reveal(event.player, card)
+        elif event.player == self._seat:
+            self._own[card] -= 1
+            self._posteriors.clear()
+
+    def _on_discard(self, event: GameEvent) -> None:
+        seat = event.player
+        card = CARD_CODES[event.card_type]
+        if not self._is_opponent(seat):
+            self._challenged_claim = None
+            self._discarded[card] += 1
+            if seat == self._seat and self._own[card]:
+                self._own[card] -= 1
+            self._posteriors.clear()
+            return
+
+        # A claimant that loses a card right after being challenged was bluffing
+        if self._challenged_claim and self._challenged_claim[0] == seat:
+            self._rule_out(seat, self._challenged_claim[1])
+        self._challenged_claim = None
+        self._discard(seat, card)
+
+    def _on_exchange(self, event: GameEvent) -> None:
+        # The new hand is a choice out of the old one and two random cards, start over
+        if self._is_opponent(event.player):
+            self._set_distribution(event.player, self._sizes[event.player], None)
+
+    _EVENT_HANDLERS = {
+        GameEventType.game_start: _on_game_start,
+        GameEventType.deal: _on_deal,
+        GameEventType.action: _on_action,
+        GameEventType.counter: _on_counter,
+        GameEventType.challenge: _on_challenge,
+        GameEventType.reveal: _on_reveal,
+        GameEventType.discard: _on_discard,
+        GameEventType.exchange: _on_exchange,
+    }
+
+    def observe(self, event: GameEvent) -> None:
+        handler = self._EVENT_HANDLERS.get(event.event_type)
+        if handler is not None:
+            handler(self, event)
+
+    def hand_probabilities(self, seat: int) -> Dict[Tuple[CardType, ...], float]:
+        """Probability of every hand the opponent may hold"""
+        size = self._sizes.get(seat, 0)
+        if not size:
+            return {}
+        return {
+            tuple(CARD_TYPES[card] for card in hand): probability
+            for hand, probability in zip(HANDS[size], self._posterior(seat))
+            if probability
+        }
+
+    def holds(self, seat: int, card_type: CardType) -> float:
+        """Probability that the opponent holds at least one card of the type"""
+        size = self._sizes.get(seat, 0)
+        if not size:
+            return 0.0
+        card = CARD_CODES[card_type]
+        return sum(
+            probability
+            for hand, probability in zip(HANDS[size], self._posterior(seat))
+            if card in hand
+        )
+
+    def card_probabilities(self, seat: int) -> Dict[CardType, float]:
+        return {card_type: self.holds(seat, card_type) for card_type in CARD_TYPES}
+
+    def _render_odds(self, seat: int) -> str:
+        return ", ".join(
+            f"{card_type.value} {probability:.2f}"
+            for card_type, probability in self.card_probabilities(seat).items()
+        )
+
+    def render(self) -> str:
+        """Compact numbers for prompts: the chance that each opponent holds each card"""
+        lines = [f"- {self._names[seat]}: {self._render_odds(seat)}" for seat in self.opponents]
+        if not lines:
+            return ""
+        return "Chance that each player holds at least one of each card:\n" + "\n".join(lines)
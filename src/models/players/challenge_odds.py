@@ -0,0 +1,74 @@
+from array import array
+from functools import lru_cache
+from math import comb
+from typing import List, Sequence
+
+from src.models.card import Card, CardType
+from src.models.compact_state import CARD_CODES, CARD_TYPES, DECK_COMPOSITION, HAND_SIZE
+from src.models.event import GameEvent, GameEventType
+
+_DECK_SIZE = sum(DECK_COMPOSITION)
+_MAX_COPIES = max(DECK_COMPOSITION)
+
+
+@lru_cache(maxsize=None)
+def _table() -> array:
+    """
+    P(a hand of k cards dealt from n hidden cards holds at least one of u copies) for every
+    k <= HAND_SIZE, n <= deck size and u <= copies per card, as a flat array of 32-bit floats.
+    Built on first use.
+    """
+    table = array("f")
+    for hand_size in range(HAND_SIZE + 1):
+        for hidden_cards in range(_DECK_SIZE + 1):
+            for hidden_copies in range(_MAX_COPIES + 1):
+                total = comb(hidden_cards, hand_size)
+                missing = comb(max(hidden_cards - hidden_copies, 0), hand_size)
+                table.append(
+                    1 - missing / total if total and hidden_copies <= hidden_cards else 0.0
+                )
+    return table
+
+
+def claim_probability(hidden_copies: int, hidden_cards: int, hand_size: int) -> float:
+    """
+    Probability that a player with hand_size cards holds the claimed card, when hidden_copies of it
+    are among the hidden_cards the asking player can't see (the deck and every other hand)
+    """
+    hidden_cards = min(max(hidden_cards, 0), _DECK_SIZE)
+    hidden_copies = min(max(hidden_copies, 0), _MAX_COPIES)
+    hand_size = min(max(hand_size, 0), HAND_SIZE)
+    return _table()[
+        (hand_size * (_DECK_SIZE + 1) + hidden_cards) * (_MAX_COPIES + 1) + hidden_copies
+    ]
+
+
+class DiscardPile:
+    """The cards lost so far in a game, followed through its events"""
+
+    def __init__(self):
+        self.counts = [0] * len(CARD_TYPES)
+
+    def observe(self, event: GameEvent) -> None:
+        if event.event_type == GameEventType.game_start:
+            self.counts = [0] * len(CARD_TYPES)
+        elif event.event_type == GameEventType.discard:
+            self.counts[CARD_CODES[event.card_type]] += 1
+
+    def cards(self) -> List[CardType]:
+        """Every card lost so far, own cards included"""
+        return [
+            card_type for card_type, count in zip(CARD_TYPES, self.counts) for _ in range(count)
+        ]
+
+    def claim_probability(
+        self, card_type: CardType, hand_size: int, own_cards: Sequence[Card]
+    ) -> float:
+        """Probability that a claimant with hand_size cards holds the card, going by own cards and discards"""
+        card = CARD_CODES[card_type]
+        own_copies = sum(own_card.card_type == card_type for own_card in own_cards)
+        return claim_probability(
+            DECK_COMPOSITION[card] - own_copies - self.counts[card],
+            _DECK_SIZE - len(own_cards) - sum(self.counts),
+            hand_size,
+        )
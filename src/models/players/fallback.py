@@ -0,0 +1,72 @@
+"""
+Cheap, deterministic decisions for when an LLM decision can't be obtained in time.
+
+The policy never bluffs: it only claims cards it holds, and only challenges claims that are unlikely
+given the cards it can see.
+"""
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from src.models.action import Action, ActionType, CounterAction, get_counter_action
+from src.models.card import Card, CardType
+from src.models.players.base import BasePlayer
+
+# Most valuable first, the least valuable cards are given up first
+CARD_VALUES: Tuple[CardType, ...] = (
+    CardType.duke,
+    CardType.assassin,
+    CardType.captain,
+    CardType.contessa,
+    CardType.ambassador,
+)
+
+
+def _card_value(card: Card) -> int:
+    return len(CARD_VALUES) - CARD_VALUES.index(card.card_type)
+
+
+def _most_dangerous(players: Sequence[BasePlayer]) -> BasePlayer:
+    return max(players, key=lambda player: (len(player.cards), player.coins))
+
+
+def choose_action(
+    player: BasePlayer, available_actions: Sequence[Action], other_players: Sequence[BasePlayer]
+) -> Tuple[Action, Optional[BasePlayer]]:
+    """Coup or assassinate the most dangerous opponent when possible, otherwise collect coins"""
+    actions = {action.action_type: action for action in available_actions}
+    held = {card.card_type for card in player.cards}
+
+    if ActionType.coup in actions:
+        return actions[ActionType.coup], _most_dangerous(other_players)
+    if ActionType.assassinate in actions and CardType.assassin in held:
+        return actions[ActionType.assassinate], _most_dangerous(other_players)
+    if CardType.duke in held:
+        return actions[ActionType.tax], None
+    if CardType.captain in held:
+        richest = max(other_players, key=lambda other: other.coins)
+        if richest.coins >= 2:
+            return actions[ActionType.steal], richest
+    return actions[ActionType.income], None
+
+
+def determine_challenge(
+    player: BasePlayer, action: Union[Action, CounterAction], discarded: Iterable[CardType] = ()
+) -> bool:
+    """
+    Challenge when at most one copy of the claimed card is unaccounted for. Only own cards and
+    discarded cards count, a card revealed to win a challenge is shuffled back into the deck.
+    """
+    seen = Counter(card.card_type for card in player.cards)
+    seen.update(discarded)
+    return seen[action.associated_card_type] >= 2
+
+
+def determine_counter(player: BasePlayer, action: Action) -> bool:
+    """Counter only with the required card in hand"""
+    counter_card_type = get_counter_action(action.action_type).associated_card_type
+    return any(card.card_type == counter_card_type for card in player.cards)
+
+
+def choose_cards_to_discard(cards: Sequence[Card], count: int) -> List[Card]:
+    """The least valuable cards, e.g. to lose influence or to return after an exchange"""
+    return sorted(cards, key=_card_value)[:count]
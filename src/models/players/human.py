@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Optional, Tuple
 
 from src.models.action import Action
@@ -136,3 +137,22 @@ class HumanPlayer(BasePlayer):
         second_card = self.cards.pop(int(second_card_ind))
 
         return first_card, second_card
+
+    # Prompts block on the terminal, so they run in a worker thread to keep the event loop responsive
+
+    async def achoose_action(
+        self, other_players: List[BasePlayer]
+    ) -> Tuple[Action, Optional[BasePlayer]]:
+        return await asyncio.to_thread(self.choose_action, other_players)
+
+    async def adetermine_challenge(self, player: BasePlayer, action: Action) -> bool:
+        return await asyncio.to_thread(self.determine_challenge, player, action)
+
+    async def adetermine_counter(self, player: BasePlayer, action: Action) -> bool:
+        return await asyncio.to_thread(self.determine_counter, player, action)
+
+    async def aremove_card(self) -> None:
+        await asyncio.to_thread(self.remove_card)
+
+    async def achoose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
+        return await asyncio.to_thread(self.choose_exchange_cards, exchange_cards)
@@ -0,0 +1,499 @@
+import math
+import time
+from collections import Counter
+from itertools import combinations
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from pydantic import PrivateAttr
+
+from src.handler.compact_handler import CompactGameHandler, RandomPolicy
+from src.models.action import Action, CounterAction
+from src.models.card import Card
+from src.models.compact_state import (
+    ACTION_CODES,
+    ACTION_REQUIRES_TARGET,
+    ACTIONS,
+    CARD_CODES,
+    CARD_TYPES,
+    HAND_SIZE,
+    STEAL,
+    CompactGameState,
+)
+from src.models.event import GameEvent, GameEventType
+from src.models.players.base import BasePlayer
+from src.models.players.beliefs import DEFAULT_BLUFF_RATE, CardBeliefs
+from src.models.players.replay import ReplayCursor, ReplayError
+from src.utils.print import print_text, print_texts
+
+DEFAULT_ITERATIONS = 200
+DEFAULT_ROLLOUT_TURNS = 100
+DEFAULT_EXPLORATION = 0.7
+
+# A choice in the search tree: who decides, what kind of decision it is and the option taken
+Choice = Tuple[int, GameEventType, object]
+
+
+class _Inconsistent(Exception):
+    """The determinized game can't follow what actually happened this turn"""
+
+
+class _Node:
+    __slots__ = ("player", "children", "visits", "wins", "available")
+
+    def __init__(self, player: Optional[int] = None):
+        # The player whose choice leads to this node, its wins are counted for that player
+        self.player = player
+        self.children: Dict[Choice, "_Node"] = {}
+        self.visits = 0
+        self.wins = 0.0
+        self.available = 0
+
+    def child(self, choice: Choice) -> "_Node":
+        node = self.children.get(choice)
+        if node is None:
+            node = self.children[choice] = _Node(choice[0])
+        return node
+
+    def upper_bound(self, exploration: float) -> float:
+        """UCB1 with the number of times the node was available instead of the parent's visits"""
+        return self.wins / self.visits + exploration * math.sqrt(
+            math.log(self.available) / self.visits
+        )
+
+
+class _SearchPolicy(RandomPolicy):
+    """
+    Plays every seat of a determinized game: first the decisions observed this turn, then the
+    search tree from the decision being searched, then random moves like AIPlayer.
+    """
+
+    def __init__(
+        self,
+        root: _Node,
+        events: List[GameEvent],
+        seat: int,
+        decision: GameEventType,
+        exploration: float,
+    ):
+        super().__init__()
+        self._cursor = ReplayCursor(events)
+        self._seat = seat
+        self._decision = decision
+        self._exploration = exploration
+        self.node = root
+        self.decision_node: Optional[_Node] = None
+        self.path: List[_Node] = []
+        self.searching = True
+
+    def _choose(
+        self, player: int, decision: GameEventType, options: Callable[[], List[object]]
+    ) -> Optional[object]:
+        """The option to play, None for a random move"""
+        if self.decision_node is None:
+            option = self._follow(player, decision)
+            if self.decision_node is None:
+                self.node = self.node.child((player, decision, option))
+                return option
+
+        if not self.searching:
+            return None
+
+        children = self.node.children
+        choices = [(player, decision, option) for option in options()]
+        for choice in choices:
+            if choice in children:
+                children[choice].available += 1
+
+        unexplored = [choice for choice in choices if choice not in children]
+        if unexplored:
+            # Expand a single node per iteration, the rest of the game is played randomly
+            choice = self._random.choice(unexplored)
+            self.node = self.node.child(choice)
+            self.node.available += 1
+            self.searching = False
+        else:
+            choice = max(
+                choices, key=lambda choice: children[choice].upper_bound(self._exploration)
+            )
+            self.node = children[choice]
+
+        self.path.append(self.node)
+        return choice[2]
+
+    def _follow(self, player: int, decision: GameEventType) -> object:
+        """Replay an observed decision, or start searching at the decision being made"""
+        cursor = self._cursor
+        if cursor.exhausted and player == self._seat and decision == self._decision:
+            self.decision_node = self.node
+            return None
+
+        try:
+            if decision in (GameEventType.challenge, GameEventType.counter):
+                # Only positive answers are observed, players asked meanwhile declined
+                return cursor.take_if(decision, player) is not None
+            event = cursor.take(decision, player)
+        except ReplayError as error:
+            raise _Inconsistent from error
+
+        if decision == GameEventType.action:
+            return ACTION_CODES[event.action_type], event.target
+        if decision == GameEventType.discard:
+            return CARD_CODES[event.card_type]
+        raise _Inconsistent(f"Unexpected {decision.value} decision")
+
+    def choose_action(self, state: CompactGameState, player: int) -> Tuple[int, Optional[int]]:
+        choice = self._choose(player, GameEventType.action, lambda: _action_options(state, player))
+        if choice is None:
+            return super().choose_action(state, player)
+        return choice
+
+    def determine_challenge(
+        self, state: CompactGameState, player: int, claimant: int, card: int
+    ) -> bool:
+        choice = self._choose(player, GameEventType.challenge, lambda: [False, True])
+        if choice is None:
+            return super().determine_challenge(state, player, claimant, card)
+        return choice
+
+    def determine_counter(
+        self, state: CompactGameState, player: int, actor: int, action: int
+    ) -> bool:
+        choice = self._choose(player, GameEventType.counter, lambda: [False, True])
+        if choice is None:
+            return super().determine_counter(state, player, actor, action)
+        return choice
+
+    def remove_card(self, state: CompactGameState, player: int) -> int:
+        choice = self._choose(
+            player, GameEventType.discard, lambda: sorted(set(state.hand(player)))
+        )
+        if choice is None:
+            return super().remove_card(state, player)
+
+        slot = state.find_card_slot(player, choice)
+        if slot is None:
+            raise _Inconsistent(f"Seat {player} can't discard a card it doesn't hold")
+        return slot
+
+    def choose_exchange_cards(
+        self, state: CompactGameState, player: int, cards: List[int]
+    ) -> Tuple[int, int]:
+        choice = self._choose(
+            player, GameEventType.exchange, lambda: sorted(set(combinations(sorted(cards), 2)))
+        )
+        if choice is None:
+            return super().choose_exchange_cards(state, player, cards)
+        return choice
+
+
+class _SearchHandler(CompactGameHandler):
+    """CompactGameHandler that deals the searching player the cards it actually drew this turn"""
+
+    def __init__(self, number_of_players: int, policy: _SearchPolicy, seat: int, seed: int):
+        super().__init__(number_of_players, [policy] * number_of_players, seed)
+        self.seat = seat
+        self.swap_draws: List[int] = []
+        self.exchange_draws: List[int] = []
+
+    def _put_on_top(self, card: int) -> None:
+        deck = self.state.deck
+        if card not in deck:
+            raise _Inconsistent("A card drawn this turn is not in the determinized deck")
+        deck.remove(card)
+        deck.append(card)
+
+    def _swap_card(self, slot: int) -> None:
+        if slot // HAND_SIZE != self.seat or not self.swap_draws:
+            super()._swap_card(slot)
+            return
+
+        state = self.state
+        state.deck.append(state.hands[slot])
+        self._shuffle_deck()
+        self._put_on_top(self.swap_draws.pop())
+        self._replace_card(slot, state.deck.pop())
+
+    def _exchange_cards(self, player: int) -> None:
+        if player == self.seat:
+            for card in self.exchange_draws:
+                self._put_on_top(card)
+            self.exchange_draws = []
+        super()._exchange_cards(player)
+
+
+def _action_options(state: CompactGameState, player: int) -> List[Tuple[int, Optional[int]]]:
+    other_players = [other for other in state.active_players() if other != player]
+    options = []
+    for action in state.available_actions(player):
+        if not ACTION_REQUIRES_TARGET[action]:
+            options.append((action, None))
+            continue
+        # Can't steal from player with 0 coins
+        options.extend(
+            (action, target) for target in other_players if action != STEAL or state.coins[target]
+        )
+    return options
+
+
+class MCTSPlayer(BasePlayer):
+    """
+    Information set Monte Carlo tree search over the compact engine, no network calls needed.
+
+    Every iteration deals the cards this player can't see at random (consistent with the cards
+    revealed and discarded this turn), replays what happened so far this turn, descends the search
+    tree and plays the game out randomly on CompactGameHandler. The tree covers the current turn
+    and is kept between the decisions of that turn. A search stops after `iterations` iterations or
+    `time_budget` seconds, whichever comes first. With `use_beliefs` the hands of the opponents are
+    dealt from CardBeliefs instead, so claims make the claimed cards more likely.
+
+    The game handler binds the player to its state and forwards its events, see
+    ResistanceCoupGameHandler.setup_game.
+    """
+
+    is_ai: bool = True
+    iterations: int = DEFAULT_ITERATIONS
+    time_budget: Optional[float] = None
+    exploration: float = DEFAULT_EXPLORATION
+    rollout_turns: int = DEFAULT_ROLLOUT_TURNS
+    use_beliefs: bool = False
+    bluff_rate: float = DEFAULT_BLUFF_RATE
+
+    _snapshot: Optional[Callable[[], CompactGameState]] = PrivateAttr(default=None)
+    _seat_of: Optional[Callable[[BasePlayer], Optional[int]]] = PrivateAttr(default=None)
+    _turn_start: Optional[CompactGameState] = PrivateAttr(default=None)
+    _turn_events: List[GameEvent] = PrivateAttr(default_factory=list)
+    _root: _Node = PrivateAttr(default_factory=_Node)
+    _beliefs: Optional[CardBeliefs] = PrivateAttr(default=None)
+    _belief_hands: Dict[int, List[Tuple[Tuple[int, ...], float]]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    def bind(
+        self,
+        snapshot: Callable[[], CompactGameState],
+        seat_of: Callable[[BasePlayer], Optional[int]],
+    ) -> None:
+        """Give the player access to the game state (it only looks at public information)"""
+        self._snapshot = snapshot
+        self._seat_of = seat_of
+
+    @property
+    def observes_events(self) -> bool:
+        return True
+
+    @property
+    def seat(self) -> int:
+        return self._seat_of(self)
+
+    def _start_turn(self) -> None:
+        self._turn_start = self._snapshot()
+        self._turn_events = []
+        self._root = _Node()
+
+    def observe(self, event: GameEvent) -> None:
+        """Follow the game, the tree is reset whenever another player starts a turn"""
+        if self.use_beliefs:
+            if self._beliefs is None:
+                self._beliefs = CardBeliefs(self.name, self.bluff_rate)
+            self._beliefs.observe(event)
+
+        if event.event_type == GameEventType.game_start:
+            self._turn_start = None
+            self._turn_events = []
+            self._root = _Node()
+        elif event.event_type == GameEventType.action:
+            if event.player != self.seat:
+                self._start_turn()
+            self._turn_events = [event]
+        elif self._turn_start is not None:
+            self._turn_events.append(event)
+
+    def _turn_cards(self, event_types: Tuple[GameEventType, ...]) -> Dict[int, Counter]:
+        cards: Dict[int, Counter] = {}
+        for event in self._turn_events:
+            if event.event_type in event_types:
+                cards.setdefault(event.player, Counter())[CARD_CODES[event.card_type]] += 1
+        return cards
+
+    def _determinize(self, exchange_draws: List[int]) -> Tuple[CompactGameState, List[int]]:
+        """A random game consistent with what this player saw, and the card it was dealt in a swap"""
+        seat = self.seat
+        state = self._turn_start.copy()
+
+        # Cards shown this turn were in the hands at the start of the turn
+        shown = self._turn_cards((GameEventType.reveal, GameEventType.discard))
+        own_start = Counter(state.hand(seat))
+        own_now = Counter(CARD_CODES[card.card_type] for card in self.cards)
+        swap_draws = list((own_now - (own_start - shown.get(seat, Counter()))).elements())
+
+        hidden = list(state.deck)
+        for player in range(state.number_of_players):
+            if player != seat:
+                hidden.extend(state.hand(player))
+
+        known: Dict[int, List[int]] = {
+            player: list(cards.elements()) for player, cards in shown.items() if player != seat
+        }
+        for card in [card for cards in known.values() for card in cards] + exchange_draws:
+            if card not in hidden:
+                raise _Inconsistent("The cards seen this turn don't add up")
+            hidden.remove(card)
+
+        # A card dealt in a swap may be the revealed card itself, which is in no deck yet
+        drawn_from_deck = [card for card in swap_draws if card in hidden]
+        for card in drawn_from_deck:
+            hidden.remove(card)
+        self._random.shuffle(hidden)
+
+        for player in range(state.number_of_players):
+            if player == seat:
+                continue
+            slots = state.card_slots(player)
+            cards = known.get(player, [])
+            if not cards and player in self._belief_hands:
+                cards = self._deal_believed_hand(self._belief_hands[player], len(slots), hidden)
+            cards = cards + [hidden.pop() for _ in range(len(slots) - len(cards))]
+            for slot, card in zip(slots, cards):
+                state.hands[slot] = card
+
+        deck = hidden + drawn_from_deck + exchange_draws
+        self._random.shuffle(deck)
+        state.deck = bytearray(deck)
+        return state, swap_draws
+
+    def _deal_believed_hand(
+        self, hands: List[Tuple[Tuple[int, ...], float]], size: int, hidden: List[int]
+    ) -> List[int]:
+        """Draw a hand from the beliefs about a player, out of the cards that are still hidden"""
+        available = Counter(hidden)
+        candidates = [
+            (hand, probability)
+            for hand, probability in hands
+            if len(hand) == size and not Counter(hand) - available
+        ]
+        if not candidates:
+            return []
+
+        hand = self._random.choices(
+            [hand for hand, _ in candidates], [probability for _, probability in candidates]
+        )[0]
+        for card in hand:
+            hidden.remove(card)
+        return list(hand)
+
+    def _iterate(self, decision: GameEventType, exchange_draws: List[int]) -> Optional[_Node]:
+        """Run a single iteration, returns the node of the decision being searched"""
+        state, swap_draws = self._determinize(exchange_draws)
+        policy = _SearchPolicy(self._root, self._turn_events, self.seat, decision, self.exploration)
+        handler = _SearchHandler(
+            state.number_of_players, policy, self.seat, self._random.getrandbits(64)
+        )
+        policy.seed_random(self._random.getrandbits(64))
+        handler.swap_draws = swap_draws
+        handler.exchange_draws = list(exchange_draws)
+        handler.load_state(state)
+
+        game_over = handler.handle_turn()
+        if policy.decision_node is None:
+            raise _Inconsistent("The decision was never reached")
+
+        policy.searching = False
+        winner = state.winner() if game_over else handler.play_game(self.rollout_turns)[0]
+
+        share = 1 / len(handler.state.active_players())
+        for node in policy.path:
+            node.visits += 1
+            node.wins += share if winner is None else float(winner == node.player)
+        return policy.decision_node
+
+    def _search(
+        self, decision: GameEventType, exchange_draws: Optional[List[int]] = None
+    ) -> object:
+        if self._snapshot is None:
+            raise RuntimeError(f"{self} needs to be bound to a game handler")
+        if self._turn_start is None:
+            self._start_turn()
+
+        exchange_draws = exchange_draws or []
+        self._belief_hands = {}
+        if self._beliefs is not None:
+            self._beliefs.update_own_hand(self.cards)
+            self._belief_hands = {
+                seat: [
+                    (tuple(CARD_CODES[card_type] for card_type in hand), probability)
+                    for hand, probability in self._beliefs.hand_probabilities(seat).items()
+                ]
+                for seat in self._beliefs.opponents
+            }
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        decision_node = None
+        iterations = 0
+        attempts = 0
+        while iterations < self.iterations and attempts < 4 * self.iterations:
+            out_of_time = deadline is not None and time.perf_counter() > deadline
+            if out_of_time and decision_node is not None:
+                break
+            attempts += 1
+            try:
+                decision_node = self._iterate(decision, exchange_draws)
+            except _Inconsistent:
+                continue
+            iterations += 1
+
+        seat = self.seat
+        options = [
+            choice
+            for choice in (decision_node.children if decision_node else {})
+            if choice[0] == seat and choice[1] == decision
+        ]
+        if not options:
+            return None
+        return max(options, key=lambda choice: decision_node.children[choice].visits)[2]
+
+    def choose_action(self, other_players: List[BasePlayer]) -> Tuple[Action, Optional[BasePlayer]]:
+        """Choose the next action to perform"""
+        print_text(f"[bold magenta]{self}[/] is thinking...", with_markup=True)
+        self._start_turn()
+
+        choice = self._search(GameEventType.action)
+        if choice is None:
+            choice = self._random.choice(_action_options(self._turn_start, self.seat))
+
+        action, target = choice
+        target_player = None
+        if target is not None:
+            target_player = next(
+                player for player in other_players if self._seat_of(player) == target
+            )
+        return ACTIONS[action], target_player
+
+    def determine_challenge(self, player: BasePlayer, action: Union[Action, CounterAction]) -> bool:
+        """Choose whether to challenge the current player"""
+        return bool(self._search(GameEventType.challenge))
+
+    def determine_counter(self, player: BasePlayer, action: Action) -> bool:
+        """Choose whether to counter the current player's action"""
+        return bool(self._search(GameEventType.counter))
+
+    def remove_card(self) -> None:
+        """Choose a card and remove it from your hand"""
+        card = self._search(GameEventType.discard)
+        if card is None:
+            discarded_card = self.cards.pop(self._random.randrange(len(self.cards)))
+        else:
+            discarded_card = self.find_card(CARD_TYPES[card])
+        print_texts(f"{self} discards their ", (f"{discarded_card}", discarded_card.style), " card")
+
+    def choose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
+        """Perform the exchange action. Pick which 2 cards to send back to the deck"""
+        returned = self._search(
+            GameEventType.exchange, [CARD_CODES[card.card_type] for card in exchange_cards]
+        )
+        print_text(f"{self} exchanges 2 cards")
+
+        self.cards += exchange_cards
+        if returned is None:
+            self._random.shuffle(self.cards)
+            return self.cards.pop(), self.cards.pop()
+        first_card, second_card = [self.find_card(CARD_TYPES[card]) for card in returned]
+        return first_card, second_card
@@ -0,0 +1,131 @@
+from collections import Counter
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.models.action import ACTION_CATALOG, get_counter_action
+from src.models.card import CardType
+from src.models.event import GameEvent, GameEventType
+from src.utils.llm_backends import estimate_tokens
+
+# Token budget of each prompt an agent sends, the inner thoughts are cut down to fit it
+DEFAULT_TOKEN_BUDGET = 1200
+# Coin counts kept per opponent, older ones are dropped
+MAX_COIN_HISTORY = 6
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to roughly max_tokens, preferably at the end of a sentence"""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    truncated = text[: max_tokens * 4]
+    sentence_end = max(truncated.rfind(". "), truncated.rfind(".\n"))
+    if sentence_end > len(truncated) // 2:
+        return truncated[: sentence_end + 1]
+    return truncated.rsplit(" ", 1)[0] + "..."
+
+
+class OpponentBeliefs(BaseModel):
+    """What an agent observed about a single opponent"""
+
+    claims: Counter = Field(default_factory=Counter)
+    # Cards shown to win a challenge go back into the deck, discarded cards are out of the game
+    reveals: List[CardType] = Field(default_factory=list)
+    discards: List[CardType] = Field(default_factory=list)
+    coin_history: List[int] = Field(default_factory=list)
+
+    def render(self, name: str) -> str:
+        parts = []
+        if self.claims:
+            claims = ", ".join(
+                f"{card_type.value} x{count}" for card_type, count in self.claims.items()
+            )
+            parts.append(f"claimed {claims}")
+        if self.reveals:
+            parts.append("revealed " + ", ".join(card_type.value for card_type in self.reveals))
+        if self.discards:
+            parts.append("lost " + ", ".join(card_type.value for card_type in self.discards))
+        if self.coin_history:
+            parts.append("coins " + " -> ".join(str(coins) for coins in self.coin_history))
+
+        return f"- {name}: " + ("; ".join(parts) or "nothing observed yet")
+
+
+class AgentMemory(BaseModel):
+    """
+    Bounded memory of an agent: structured beliefs about each opponent plus a rolling summary.
+
+    Claims, reveals and discards are followed through the game events (see observe), coin counts are
+    fed by the handler at the start of each turn. The token budget covers a whole
+    prompt: the beliefs come first and the free text summary (the agent's inner thoughts) is cut down
+    to whatever the rest of the prompt leaves, so prompt size no longer grows over a long game. The tokens sent per
+    turn are tracked in prompt_tokens.
+    """
+
+    token_budget: int = DEFAULT_TOKEN_BUDGET
+    opponents: Dict[str, OpponentBeliefs] = Field(default_factory=dict)
+    turn: int = 0
+    prompt_tokens: Dict[int, int] = Field(default_factory=dict)
+    # Player names by seat, from the game_start event
+    names: List[str] = Field(default_factory=list)
+
+    def reset(self) -> None:
+        # The names are kept, the game_start event comes before the players are reset
+        self.opponents = {}
+        self.turn = 0
+        self.prompt_tokens = {}
+
+    def _opponent(self, name: str) -> OpponentBeliefs:
+        return self.opponents.setdefault(name, OpponentBeliefs())
+
+    def start_turn(self, turn: int, coins: Dict[str, int]) -> None:
+        self.turn = turn
+        for name, count in coins.items():
+            history = self._opponent(name).coin_history
+            history.append(count)
+            del history[:-MAX_COIN_HISTORY]
+
+    def observe(self, event: GameEvent, own_name: str) -> None:
+        """Follow the claims, reveals and discards of the other players"""
+        if event.event_type == GameEventType.game_start:
+            self.names = list(event.players)
+            return
+        if event.player is None or event.player >= len(self.names):
+            return
+        name = self.names[event.player]
+        if name == own_name:
+            return
+
+        if event.event_type == GameEventType.action:
+            card_type = ACTION_CATALOG[event.action_type].associated_card_type
+            if card_type is not None:
+                self._opponent(name).claims[card_type] += 1
+        elif event.event_type == GameEventType.counter:
+            card_type = get_counter_action(event.action_type).associated_card_type
+            self._opponent(name).claims[card_type] += 1
+        elif event.event_type == GameEventType.reveal:
+            self._opponent(name).reveals.append(event.card_type)
+        elif event.event_type == GameEventType.discard:
+            self._opponent(name).discards.append(event.card_type)
+
+    def record_prompt(self, messages: List[Dict[str, str]]) -> None:
+        tokens = sum(estimate_tokens(message["content"]) for message in messages)
+        self.prompt_tokens[self.turn] = self.prompt_tokens.get(self.turn, 0) + tokens
+
+    def render(
+        self, summary: Optional[str] = None, card_odds: str = "", reserved_tokens: int = 0
+    ) -> str:
+        """
+        Render beliefs, card odds (see CardBeliefs.render) and summary, so that together with the
+        reserved_tokens of the rest of the prompt they stay within the token budget
+        """
+        beliefs = "\n".join(beliefs.render(name) for name, beliefs in self.opponents.items())
+        if beliefs:
+            beliefs = f"What you observed about the other players:\n{beliefs}"
+
+        used_tokens = reserved_tokens + estimate_tokens(beliefs) + estimate_tokens(card_odds)
+        summary = truncate_to_tokens(summary or "", self.token_budget - used_tokens)
+        return "\n\n".join(part for part in (beliefs, card_odds, summary) if part)
@@ -0,0 +1,107 @@
+from typing import List, Optional, Sequence, Tuple
+
+from pydantic import PrivateAttr
+
+from src.models.action import ACTION_CATALOG, Action
+from src.models.card import Card, CardType
+from src.models.event import DECISION_EVENT_TYPES, GameEvent, GameEventType
+from src.models.players.base import BasePlayer
+
+
+class ReplayError(ValueError):
+    """The game being replayed diverged from the recorded events"""
+
+
+class ReplayCursor:
+    """
+    Position in the recorded decisions of a game, shared by all ReplayPlayers of that game.
+
+    Only positive challenge and counter decisions are recorded, a player that is asked while the next
+    decision isn't theirs declined.
+    """
+
+    def __init__(self, events: Sequence[GameEvent]):
+        self._decisions = [event for event in events if event.event_type in DECISION_EVENT_TYPES]
+        self._position = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self._position == len(self._decisions)
+
+    def peek(self) -> Optional[GameEvent]:
+        return None if self.exhausted else self._decisions[self._position]
+
+    def take_if(self, event_type: GameEventType, player: int) -> Optional[GameEvent]:
+        event = self.peek()
+        if event is None or event.event_type != event_type or event.player != player:
+            return None
+        self._position += 1
+        return event
+
+    def take(self, event_type: GameEventType, player: int) -> GameEvent:
+        event = self.take_if(event_type, player)
+        if event is None:
+            raise ReplayError(
+                f"Expected a {event_type.value} decision of seat {player}, the log has {self.peek()}"
+            )
+        return event
+
+
+class ReplayPlayer(BasePlayer):
+    """Plays back the recorded decisions of one seat, see src.handler.replay"""
+
+    is_ai: bool = True
+    seat: int
+
+    _cursor: ReplayCursor = PrivateAttr()
+
+    def bind(self, cursor: ReplayCursor) -> None:
+        self._cursor = cursor
+
+    def _remove_card_type(self, event: GameEvent, card_type: CardType) -> Card:
+        card = self.find_card(card_type)
+        if card is None:
+            raise ReplayError(f"{self} can't give up a {card_type.value} it doesn't hold ({event})")
+        return card
+
+    def choose_action(self, other_players: List[BasePlayer]) -> Tuple[Action, Optional[BasePlayer]]:
+        """Choose the next action to perform"""
+        event = self._cursor.take(GameEventType.action, self.seat)
+
+        target_player = None
+        if event.target is not None:
+            target_player = next(
+                (
+                    player
+                    for player in other_players
+                    if getattr(player, "seat", None) == event.target
+                ),
+                None,
+            )
+            if target_player is None:
+                raise ReplayError(f"Seat {event.target} can't be targeted ({event})")
+
+        return ACTION_CATALOG[event.action_type], target_player
+
+    def determine_challenge(self, player: BasePlayer, action: Action) -> bool:
+        """Choose whether to challenge the current player"""
+        return self._cursor.take_if(GameEventType.challenge, self.seat) is not None
+
+    def determine_counter(self, player: BasePlayer, action: Action) -> bool:
+        """Choose whether to counter the current player's action"""
+        return self._cursor.take_if(GameEventType.counter, self.seat) is not None
+
+    def remove_card(self) -> None:
+        """Choose a card and remove it from your hand"""
+        event = self._cursor.take(GameEventType.discard, self.seat)
+        self._remove_card_type(event, event.card_type)
+
+    def choose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
+        """Perform the exchange action. Pick which 2 cards to send back to the deck"""
+        event = self._cursor.take(GameEventType.exchange, self.seat)
+
+        self.cards += exchange_cards
+        first_card, second_card = [
+            self._remove_card_type(event, card_type) for card_type in event.cards
+        ]
+        return first_card, second_card
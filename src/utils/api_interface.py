@@ -1,9 +1,240 @@
-import os
-from openai import OpenAI
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, Dict, List, Optional, TypeVar
+
 from dotenv import load_dotenv
+
+from src.utils.llm_backends import LLMBackend, OpenAIBackend, backend_from_env, estimate_tokens
+from src.utils.llm_cache import DEFAULT_MAX_ENTRIES, LLMCache, cache_key
+from src.utils.tracing import tracer
+
 load_dotenv()
 
-client = OpenAI(
-    # This is the default and can be omitted
-    api_key=os.environ.get("OPENAI_API_KEY"),
-)
\ No newline at end of file
+T = TypeVar("T")
+
+DEFAULT_MODEL = "gpt-4o"
+PERSONALITY_MODEL = "gpt-4"
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 16
+DEFAULT_REQUEST_TIMEOUT = 60.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.5
+
+
+class LLMClient:
+    """
+    Shared async client for every LLM call in the game.
+
+    A single backend (by default the OpenAI API over a pooled keep-alive connection pool, see
+    llm_backends for the offline ScriptedBackend) lives on a dedicated background event loop.
+    Requests are bounded by a global semaphore, time out individually and are retried with
+    exponential backoff. Synchronous code can use `complete`/`run`, async code on any event loop
+    can await `acomplete`. An optional LLMCache answers repeated requests without a round trip
+    (see `enable_cache`).
+    """
+
+    def __init__(
+        self,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ):
+        self.max_concurrent_requests = max_concurrent_requests
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._backend: Optional[LLMBackend] = backend_from_env()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.cache: Optional[LLMCache] = None
+
+    @property
+    def backend(self) -> LLMBackend:
+        # Only ever called on the client loop, so the connection pool is bound to it
+        if self._backend is None:
+            self._backend = OpenAIBackend(self.timeout, self.max_concurrent_requests)
+        return self._backend
+
+    def use_backend(self, backend: LLMBackend) -> None:
+        """Swap the backend answering requests, e.g. for a ScriptedBackend in offline benchmarks"""
+        self._backend = backend
+
+    def enable_cache(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+    ) -> LLMCache:
+        """
+        Cache completions keyed on model, messages, temperature and response format.
+
+        Note that cached responses are replayed even for sampled (temperature > 0) requests, which is
+        what makes regression runs and replays reproducible.
+        """
+        self.cache = LLMCache(max_entries=max_entries, ttl=ttl, path=path)
+        return self.cache
+
+    def disable_cache(self) -> None:
+        self.cache = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-client", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        return self._semaphore
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: Optional[float],
+        response_format: Optional[Dict[str, str]],
+    ) -> str:
+        started_at = time.time()
+        cache = self.cache
+        key = None
+        if cache is not None:
+            key = cache_key(model, messages, temperature, response_format)
+            content = cache.get(key)
+            if content is not None:
+                tracer.record(started_at, cached=True)
+                return content
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._get_semaphore():
+                    response = await self.backend.create(
+                        model, messages, temperature=temperature, response_format=response_format
+                    )
+                if cache is not None:
+                    cache.set(key, response.content)
+                tracer.record(
+                    started_at,
+                    prompt_tokens=response.prompt_tokens,
+                    completion_tokens=response.completion_tokens,
+                    retries=attempt,
+                )
+                return response.content
+            except self.backend.retryable_errors as e:
+                if attempt == self.max_retries:
+                    tracer.record(started_at, retries=attempt, error=type(e).__name__)
+                    raise
+
+                # Exponential backoff with jitter, outside of the semaphore
+                await asyncio.sleep(self.retry_backoff * 2**attempt * (1 + random.random()))
+
+    async def _stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: Optional[float],
+        on_text: Callable[[str], None],
+    ) -> str:
+        started_at = time.time()
+        cache = self.cache
+        key = None
+        if cache is not None:
+            key = cache_key(model, messages, temperature)
+            content = cache.get(key)
+            if content is not None:
+                tracer.record(started_at, cached=True)
+                on_text(content)
+                return content
+
+        for attempt in range(self.max_retries + 1):
+            chunks: List[str] = []
+            try:
+                async with self._get_semaphore():
+                    async for chunk in self.backend.stream(model, messages, temperature=temperature):
+                        chunks.append(chunk)
+                        on_text("".join(chunks))
+                content = "".join(chunks)
+                if cache is not None:
+                    cache.set(key, content)
+                # Streamed responses carry no usage, so tokens are estimated
+                tracer.record(
+                    started_at,
+                    prompt_tokens=sum(estimate_tokens(message["content"]) for message in messages),
+                    completion_tokens=estimate_tokens(content),
+                    retries=attempt,
+                )
+                return content
+            except self.backend.retryable_errors as e:
+                # Text that was already shown can't be taken back
+                if attempt == self.max_retries or chunks:
+                    tracer.record(started_at, retries=attempt, error=type(e).__name__)
+                    raise
+
+                await asyncio.sleep(self.retry_backoff * 2**attempt * (1 + random.random()))
+
+    def _on_client_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coroutine: Coroutine[Any, Any, T]) -> Future:
+        """Schedule a coroutine on the client loop and return a concurrent future"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the client loop and block until it is done"""
+        if self._on_client_loop():
+            coroutine.close()
+            raise RuntimeError("LLMClient.run can't block the client loop, await the coroutine instead")
+        return self.submit(coroutine).result()
+
+    async def acomplete(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL,
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Return the content of a chat completion, from any event loop"""
+        coroutine = self._complete(messages, model, temperature, response_format)
+        if self._on_client_loop():
+            return await coroutine
+        return await asyncio.wrap_future(self.submit(coroutine))
+
+    async def astream(
+        self,
+        messages: List[Dict[str, str]],
+        on_text: Callable[[str], None],
+        model: str = DEFAULT_MODEL,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """
+        Return the content of a free text chat completion, calling on_text with the text received
+        so far as it streams in. Note that on_text is called from the client loop thread.
+        """
+        coroutine = self._stream(messages, model, temperature, on_text)
+        if self._on_client_loop():
+            return await coroutine
+        return await asyncio.wrap_future(self.submit(coroutine))
+
+    def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL,
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Blocking variant of acomplete for synchronous code"""
+        return self.run(self._complete(messages, model, temperature, response_format))
+
+
+llm = LLMClient()
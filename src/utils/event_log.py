@@ -0,0 +1,159 @@
+import json
+import struct
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+from src.models.action import ActionType
+from src.models.card import CardType
+from src.models.event import GameEvent, GameEventType
+
+# Binary records: event type, turn, player, target, action type, card type and payload length,
+# followed by the payload (card codes, or the JSON encoded seed and player names of a game start)
+_RECORD = struct.Struct("<BHBBBBH")
+_NONE = 0xFF
+
+_EVENT_TYPES = tuple(GameEventType)
+_EVENT_TYPE_CODES = {event_type: code for code, event_type in enumerate(_EVENT_TYPES)}
+_ACTION_TYPES = tuple(ActionType)
+_ACTION_TYPE_CODES = {action_type: code for code, action_type in enumerate(_ACTION_TYPES)}
+_CARD_TYPES = tuple(CardType)
+_CARD_TYPE_CODES = {card_type: code for code, card_type in enumerate(_CARD_TYPES)}
+
+
+def _code(value: Optional[int]) -> int:
+    return _NONE if value is None else value
+
+
+def _value(code: int) -> Optional[int]:
+    return None if code == _NONE else code
+
+
+def encode_event(event: GameEvent) -> bytes:
+    if event.event_type == GameEventType.game_start:
+        payload = json.dumps({"seed": event.seed, "players": event.players}).encode("utf-8")
+    else:
+        payload = bytes(_CARD_TYPE_CODES[card_type] for card_type in event.cards)
+
+    header = _RECORD.pack(
+        _EVENT_TYPE_CODES[event.event_type],
+        event.turn,
+        _code(event.player),
+        _code(event.target),
+        _NONE if event.action_type is None else _ACTION_TYPE_CODES[event.action_type],
+        _NONE if event.card_type is None else _CARD_TYPE_CODES[event.card_type],
+        len(payload),
+    )
+    return header + payload
+
+
+def decode_events(stream: BinaryIO) -> Iterator[GameEvent]:
+    while header := stream.read(_RECORD.size):
+        if len(header) < _RECORD.size:
+            raise ValueError("Truncated event record")
+
+        event_type, turn, player, target, action_type, card_type, length = _RECORD.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError("Truncated event payload")
+
+        event = GameEvent(
+            event_type=_EVENT_TYPES[event_type],
+            turn=turn,
+            player=_value(player),
+            target=_value(target),
+            action_type=None if action_type == _NONE else _ACTION_TYPES[action_type],
+            card_type=None if card_type == _NONE else _CARD_TYPES[card_type],
+        )
+        if event.event_type == GameEventType.game_start:
+            start = json.loads(payload)
+            event.seed = start["seed"]
+            event.players = start["players"]
+        else:
+            event.cards = [_CARD_TYPES[code] for code in payload]
+
+        yield event
+
+
+class EventLog(ABC):
+    """Sink for the events of a ResistanceCoupGameHandler"""
+
+    @abstractmethod
+    def write(self, event: GameEvent) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class MemoryEventLog(EventLog):
+    """Keeps the events in a list, e.g. to verify a replay"""
+
+    def __init__(self):
+        self.events: List[GameEvent] = []
+
+    def write(self, event: GameEvent) -> None:
+        self.events.append(event)
+
+
+class JsonlEventLog(EventLog):
+    """Appends one JSON object per event, easy to inspect and to load into analysis tools"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, event: GameEvent) -> None:
+        self._file.write(event.model_dump_json(exclude_defaults=True) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BinaryEventLog(EventLog):
+    """Appends fixed size binary records (9 bytes for most events), for millions of games"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "ab")
+
+    def write(self, event: GameEvent) -> None:
+        self._file.write(encode_event(event))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def open_event_log(path: str) -> EventLog:
+    """A JSONL log for .jsonl files, a binary one otherwise"""
+    return JsonlEventLog(path) if path.endswith(".jsonl") else BinaryEventLog(path)
+
+
+def read_events(path: str) -> Iterator[GameEvent]:
+    """Read the events of a log written by open_event_log"""
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield GameEvent.model_validate_json(line)
+    else:
+        with open(path, "rb") as file:
+            yield from decode_events(file)
+
+
+def split_games(events: Iterable[GameEvent]) -> Iterator[List[GameEvent]]:
+    """Group a stream of events into games, each starting with its game_start event"""
+    game: List[GameEvent] = []
+    for event in events:
+        if event.event_type == GameEventType.game_start and game:
+            yield game
+            game = []
+        game.append(event)
+
+    if game:
+        yield game
@@ -0,0 +1,255 @@
+import ast
+import asyncio
+import json
+import os
+import random
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+# Marker after which make_decision embeds its required JSON schema (as a python literal)
+SCHEMA_MARKER = "Here is the JSON schema, please fill in the required fields:"
+
+
+class LLMResponse(BaseModel):
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class LLMBackend(ABC):
+    """Something that can answer chat completion requests"""
+
+    # Transient failures worth retrying, anything else is raised straight away
+    retryable_errors: Tuple[type, ...] = ()
+
+    @abstractmethod
+    async def create(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> LLMResponse:
+        """Return a single chat completion"""
+        pass
+
+    async def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """Yield a free text chat completion in chunks as it is generated"""
+        response = await self.create(model, messages, temperature=temperature)
+        yield response.content
+
+
+class OpenAIBackend(LLMBackend):
+    """The OpenAI chat completions API, over a pooled keep-alive connection pool"""
+
+    def __init__(self, timeout: float, max_connections: int):
+        # Imported here as the openai package takes most of a second to import
+        import httpx
+        from openai import (
+            APIConnectionError,
+            APITimeoutError,
+            AsyncOpenAI,
+            DefaultAsyncHttpxClient,
+            InternalServerError,
+            RateLimitError,
+        )
+
+        self.retryable_errors = (
+            APIConnectionError,
+            APITimeoutError,
+            RateLimitError,
+            InternalServerError,
+        )
+        self._client = AsyncOpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            timeout=timeout,
+            # Retries are handled by LLMClient so they also respect its semaphore
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+            ),
+        )
+
+    async def create(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> LLMResponse:
+        kwargs: Dict[str, Any] = {}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+
+        response = await self._client.chat.completions.create(
+            model=model, messages=messages, **kwargs
+        )
+
+        usage = response.usage
+        return LLMResponse(
+            content=response.choices[0].message.content,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+        )
+
+    async def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        kwargs: Dict[str, Any] = {}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+
+        chunks = await self._client.chat.completions.create(
+            model=model, messages=messages, stream=True, **kwargs
+        )
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgets and fake usage"""
+    return max(1, len(text) // 4)
+
+
+class ScriptedBackend(LLMBackend):
+    """
+    Offline stand-in for the OpenAI backend, for tests and benchmarks on air-gapped machines.
+
+    Free-text requests get a short canned reply. JSON requests get a random valid decision for the
+    schema that make_decision embeds in its prompt, except for a configurable share of malformed
+    replies (invalid JSON or an invalid value) that exercise the retry path. Each request waits for
+    the configured latency, either a fixed number of seconds or a (min, max) range.
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, Tuple[float, float]] = 0.0,
+        malformed_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.malformed_rate = malformed_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+
+    def _latency(self) -> float:
+        if isinstance(self.latency, tuple):
+            return self._random.uniform(*self.latency)
+        return self.latency
+
+    @staticmethod
+    def _find_schema(messages: List[Dict[str, str]]) -> Optional[List[Dict[str, Any]]]:
+        for message in reversed(messages):
+            content = message["content"]
+            if SCHEMA_MARKER in content:
+                try:
+                    return ast.literal_eval(content.rsplit(SCHEMA_MARKER, 1)[1].strip())
+                except (SyntaxError, ValueError):
+                    return None
+        return None
+
+    def _decision(self, schema: List[Dict[str, Any]]) -> Dict[str, Any]:
+        decision = {}
+
+        # Fields sharing the same options (e.g. the two exchanged cards) never pick the same position
+        used_positions: Dict[Tuple, set] = {}
+        for item in schema:
+            # Free text fields, e.g. the reasoning of single call decisions
+            if "enum" not in item:
+                decision[item["name"]] = "Scripted reasoning."
+                continue
+
+            options = item["enum"]
+            used = used_positions.setdefault(tuple(options), set())
+            free_positions = [ind for ind in range(len(options)) if ind not in used]
+            if not free_positions:
+                continue
+
+            ind = self._random.choice(free_positions)
+            used.add(ind)
+            decision[item["name"]] = options[ind]
+
+        return decision
+
+    def _malformed(self, decision: Dict[str, Any]) -> str:
+        if not decision or self._random.random() < 0.5:
+            return json.dumps(decision)[:-1] or "{"
+        key = self._random.choice(list(decision))
+        return json.dumps({**decision, key: "Not an option"})
+
+    def _reply(self, model: str) -> str:
+        return f"Scripted reply #{self.requests} from {model}."
+
+    async def create(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> LLMResponse:
+        self.requests += 1
+
+        latency = self._latency()
+        if latency:
+            await asyncio.sleep(latency)
+
+        if response_format and response_format.get("type") == "json_object":
+            decision = self._decision(self._find_schema(messages) or [])
+            if self._random.random() < self.malformed_rate:
+                content = self._malformed(decision)
+            else:
+                content = json.dumps(decision)
+        else:
+            content = self._reply(model)
+
+        return LLMResponse(
+            content=content,
+            prompt_tokens=sum(estimate_tokens(message["content"]) for message in messages),
+            completion_tokens=estimate_tokens(content),
+        )
+
+    async def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        # The latency is spread over the words, like tokens trickling in
+        self.requests += 1
+        words = self._reply(model).split(" ")
+        latency = self._latency()
+        for ind, word in enumerate(words):
+            if latency:
+                await asyncio.sleep(latency / len(words))
+            yield word if ind == 0 else " " + word
+
+
+def backend_from_env() -> Optional[LLMBackend]:
+    """
+    Select a backend from the environment, e.g. COUP_LLM_BACKEND=scripted for offline runs.
+
+    COUP_LLM_LATENCY and COUP_LLM_MALFORMED_RATE configure the scripted backend.
+    """
+    if os.environ.get("COUP_LLM_BACKEND", "openai").lower() != "scripted":
+        return None
+
+    return ScriptedBackend(
+        latency=float(os.environ.get("COUP_LLM_LATENCY", "0")),
+        malformed_rate=float(os.environ.get("COUP_LLM_MALFORMED_RATE", "0")),
+    )
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+from typing import List, Optional, Set
+
+from pydantic import BaseModel, ValidationError
+
+from src.utils.api_interface import PERSONALITY_MODEL, llm
+from src.utils.tracing import trace_context
+
+DEFAULT_POOL_SIZE = 20
+DEFAULT_POOL_PATH = os.path.join(os.path.expanduser("~"), ".cache", "coup", "personalities.json")
+
+GENDERS = ("male", "female")
+
+logger = logging.getLogger(__name__)
+
+
+class Personality(BaseModel):
+    name: str
+    gender: str
+    personality: str
+
+
+def random_name(gender: str, taken: Set[str]) -> str:
+    """A random first name that isn't taken yet"""
+    import names
+
+    name = names.get_first_name(gender=gender)
+    while name in taken:
+        name = names.get_first_name(gender=gender)
+    return name
+
+
+async def generate_personality(name: str, gender: str) -> str:
+    system_msg = f"""Generate a personality for a {gender} named {name}.
+    They are playing the board game Coup, so you can include elements that will make them interesting players.
+    You can be creative with personalities, ranging from a calm, strategic to a loud, aggressive player.
+    You may even include various emotional tendencies...
+    Just generate the personality. Don't say anything else like 'Sure, here is a personality'."""
+
+    with trace_context(call_site="personality", player=name):
+        return await llm.acomplete(
+            [{"role": "system", "content": system_msg}], model=PERSONALITY_MODEL, temperature=1.0
+        )
+
+
+class PersonalityPool:
+    """
+    On-disk pool of pre-generated personalities, so starting a game doesn't wait on the LLM.
+
+    Drawn personalities are removed from the pool. Once fewer than low_water_mark are left, the pool
+    is refilled up to size in the background, saving after every new personality. Draws and refills
+    run on the LLM client loop, a failed refill is logged and retried on the next draw.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_POOL_PATH,
+        size: int = DEFAULT_POOL_SIZE,
+        low_water_mark: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.path = path
+        self.size = size
+        self.low_water_mark = size // 2 if low_water_mark is None else low_water_mark
+
+        # Picks the genders of refilled personalities, and the draws that don't bring their own
+        self._random = rng or random.Random()
+        self._lock = threading.Lock()
+        self._refill_task: Optional[asyncio.Task] = None
+        self._personalities = self._load()
+
+    def __len__(self) -> int:
+        return len(self._personalities)
+
+    def _load(self) -> List[Personality]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return [Personality(**personality) for personality in json.load(file)]
+        except FileNotFoundError:
+            return []
+        except (json.JSONDecodeError, TypeError, ValidationError):
+            # A corrupt pool is simply regenerated
+            return []
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            data = [personality.model_dump() for personality in self._personalities]
+
+        # Write then rename, so an interrupted save never leaves a corrupt pool behind
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+        os.replace(temporary_path, self.path)
+
+    async def draw(self, count: int, rng: Optional[random.Random] = None) -> List[Personality]:
+        """Take count personalities with unique names, generating whatever the pool can't provide"""
+        rng = rng or self._random
+
+        drawn: List[Personality] = []
+        with self._lock:
+            rng.shuffle(self._personalities)
+            for personality in list(self._personalities):
+                if len(drawn) == count:
+                    break
+                if personality.name not in {other.name for other in drawn}:
+                    self._personalities.remove(personality)
+                    drawn.append(personality)
+        if drawn:
+            self._save()
+
+        taken = {personality.name for personality in drawn}
+        missing = []
+        for _ in range(count - len(drawn)):
+            gender = rng.choice(GENDERS)
+            name = random_name(gender, taken)
+            taken.add(name)
+            missing.append((name, gender))
+
+        generated = await asyncio.gather(
+            *[generate_personality(name, gender) for name, gender in missing]
+        )
+        drawn += [
+            Personality(name=name, gender=gender, personality=personality)
+            for (name, gender), personality in zip(missing, generated)
+        ]
+
+        self.refill_in_background()
+        return drawn
+
+    def refill_in_background(self) -> None:
+        """Start refilling the pool if it runs low, must be called on the LLM client loop"""
+        if len(self) >= self.low_water_mark:
+            return
+        if self._refill_task is not None and not self._refill_task.done():
+            return
+
+        self._refill_task = asyncio.get_running_loop().create_task(self.refill())
+        self._refill_task.add_done_callback(self._log_refill_failure)
+
+    @staticmethod
+    def _log_refill_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Refilling the personality pool failed", exc_info=task.exception())
+
+    async def refill(self) -> None:
+        """Generate personalities until the pool is full"""
+        with self._lock:
+            taken = {personality.name for personality in self._personalities}
+
+        async def _add(name: str, gender: str) -> None:
+            personality = await generate_personality(name, gender)
+            with self._lock:
+                self._personalities.append(
+                    Personality(name=name, gender=gender, personality=personality)
+                )
+            self._save()
+
+        additions = []
+        for _ in range(self.size - len(self)):
+            gender = self._random.choice(GENDERS)
+            name = random_name(gender, taken)
+            taken.add(name)
+            additions.append(_add(name, gender))
+
+        await asyncio.gather(*additions)
+
+
+def pool_from_env() -> PersonalityPool:
+    """Pool configured by COUP_PERSONALITY_POOL (path) and COUP_PERSONALITY_POOL_SIZE"""
+    return PersonalityPool(
+        path=os.environ.get("COUP_PERSONALITY_POOL", DEFAULT_POOL_PATH),
+        size=int(os.environ.get("COUP_PERSONALITY_POOL_SIZE", DEFAULT_POOL_SIZE)),
+    )
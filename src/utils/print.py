@@ -1,7 +1,12 @@
 import random
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, List, Optional, Tuple
 
 from rich.console import Console, JustifyMethod
 from rich.highlighter import Highlighter
+from rich.live import Live
 from rich.panel import Panel
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
@@ -13,6 +18,63 @@ from src.models.players.base import BasePlayer
 
 console = Console()
 
+_quiet_lock = threading.Lock()
+_quiet_depth = 0
+
+
+@contextmanager
+def quiet_output():
+    """Suppress all console output while the context is active (used for headless games)"""
+    global _quiet_depth
+
+    with _quiet_lock:
+        _quiet_depth += 1
+    try:
+        yield
+    finally:
+        with _quiet_lock:
+            _quiet_depth -= 1
+
+
+def is_quiet() -> bool:
+    return _quiet_depth > 0
+
+
+# console.print arguments
+_Printed = Tuple[tuple, dict]
+# Output held back by deferred_output in the current task
+_deferred: ContextVar[Optional[List[_Printed]]] = ContextVar("deferred_output", default=None)
+
+
+@contextmanager
+def deferred_output() -> Iterator[List[_Printed]]:
+    """
+    Hold back the console output of the current task (or thread) while the context is active, e.g.
+    for work whose result may be thrown away. Pass the yielded buffer to flush_output to print it.
+    """
+    buffer: List[_Printed] = []
+    token = _deferred.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _deferred.reset(token)
+
+
+def flush_output(buffer: List[_Printed]) -> None:
+    """Print the output held back by deferred_output"""
+    for objects, kwargs in buffer:
+        _print(*objects, **kwargs)
+    buffer.clear()
+
+
+def _print(*objects: Any, **kwargs: Any) -> None:
+    buffer = _deferred.get()
+    if buffer is not None:
+        buffer.append((objects, kwargs))
+        return
+
+    console.print(*objects, **kwargs)
+
 
 class RainbowHighlighter(Highlighter):
     def highlight(self, text):
@@ -21,10 +83,16 @@ class RainbowHighlighter(Highlighter):
 
 
 def print_blank():
-    console.print()
+    if is_quiet():
+        return
+
+    _print()
 
 
 def print_text(content: str, style: str = "", rainbow: bool = False, with_markup: bool = False):
+    if is_quiet():
+        return
+
     print_blank()
 
     text = Text(content)
@@ -38,46 +106,86 @@ def print_text(content: str, style: str = "", rainbow: bool = False, with_markup
     if rainbow:
         text = RainbowHighlighter()(text)
 
-    console.print(text)
+    _print(text)
 
 
 def print_texts(*parts):
+    if is_quiet():
+        return
+
     print_blank()
 
     text = Text.assemble(*parts)
 
-    console.print(text)
+    _print(text)
 
 
 def print_tree(root: str, content: list[str]):
+    if is_quiet():
+        return
+
     print_blank()
 
     tree = Tree(root)
     for line in content:
         tree.add(line)
-    console.print(tree)
+    _print(tree)
 
 
 def print_table(table: Table, justify: JustifyMethod = "center"):
+    if is_quiet():
+        return
+
     print_blank()
 
-    console.print(table, justify=justify)
+    _print(table, justify=justify)
 
 
 def print_panel_with_title(title: str, content: str, justify: JustifyMethod = "center"):
+    if is_quiet():
+        return
+
     print_blank()
 
     panel = Panel(content, title=title)
-    console.print(panel, justify=justify)
+    _print(panel, justify=justify)
+
+
+@contextmanager
+def live_panel(title: str) -> Iterator[Callable[[str], None]]:
+    """
+    Show a panel that is redrawn while its content streams in. Yields an update function that takes
+    the text so far, only complete lines are shown until the context exits.
+    """
+    if is_quiet():
+        yield lambda content: None
+        return
+
+    print_blank()
+
+    content_so_far = ""
+    with Live(Panel("", title=title), console=console, refresh_per_second=8) as live:
+
+        def update(content: str) -> None:
+            nonlocal content_so_far
+            content_so_far = content
+            if "\n" in content:
+                live.update(Panel(content.rsplit("\n", 1)[0], title=title))
+
+        yield update
+        live.update(Panel(content_so_far, title=title))
 
 
 def print_panel(panel: Panel or str, justify: JustifyMethod = "center"):
+    if is_quiet():
+        return
+
     print_blank()
 
     if isinstance(panel, str):
         panel = Panel(panel)
 
-    console.print(panel, justify=justify)
+    _print(panel, justify=justify)
 
 
 def print_prompt(content: str, empty_allowed=False) -> str:
@@ -94,6 +202,43 @@ def print_confirm(content: str) -> bool:
     return Confirm.ask(content)
 
 
+def print_llm_summary(summary: dict):
+    """Print the per call site latency and token summary of a Tracer"""
+    if is_quiet() or not summary["call_sites"]:
+        return
+
+    table = Table(
+        "Call site",
+        "Calls",
+        "p50 (s)",
+        "p95 (s)",
+        "Prompt tokens",
+        "Completion tokens",
+        "Retries",
+        "Re-asks",
+        title="LLM calls",
+    )
+    for call_site, stats in summary["call_sites"].items():
+        table.add_row(
+            call_site,
+            str(stats["calls"]),
+            f"{stats['p50']:.2f}",
+            f"{stats['p95']:.2f}",
+            str(stats["prompt_tokens"]),
+            str(stats["completion_tokens"]),
+            str(stats["retries"]),
+            str(stats["reasks"]),
+        )
+    print_table(table)
+
+    tokens_per_turn = summary["tokens_per_turn"]
+    if tokens_per_turn:
+        print_text(
+            f"Tokens per turn: {sum(tokens_per_turn.values()) / len(tokens_per_turn):.0f} on average, "
+            f"{max(tokens_per_turn.values())} at most"
+        )
+
+
 def build_action_report_string(
         player: BasePlayer, action: Action, target_player: BasePlayer
 ) -> str:
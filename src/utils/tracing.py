@@ -0,0 +1,173 @@
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+# Keep the most recent calls only, so tracing long sessions stays bounded
+DEFAULT_MAX_RECORDS = 100_000
+
+# Who is calling the LLM, propagated through asyncio tasks and the LLM client loop
+_call_site: ContextVar[str] = ContextVar("llm_call_site", default="unknown")
+_player: ContextVar[Optional[str]] = ContextVar("llm_player", default=None)
+_turn: ContextVar[Optional[int]] = ContextVar("llm_turn", default=None)
+_attempt: ContextVar[int] = ContextVar("llm_attempt", default=0)
+# Records held back by held_records instead of being collected straight away
+_held: ContextVar[Optional[List["LLMCallRecord"]]] = ContextVar("llm_held_records", default=None)
+
+
+class LLMCallRecord(BaseModel):
+    call_site: str
+    player: Optional[str] = None
+    turn: Optional[int] = None
+    # Re-asks after an invalid answer (e.g. make_decision) count up from 0
+    attempt: int = 0
+    started_at: float
+    latency: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Transport level retries (timeouts, rate limits, ...)
+    retries: int = 0
+    cached: bool = False
+    error: Optional[str] = None
+
+
+@contextmanager
+def trace_context(
+    call_site: Optional[str] = None,
+    player: Optional[str] = None,
+    attempt: Optional[int] = None,
+) -> Iterator[None]:
+    """Attribute the LLM calls made inside the context to a call site, player and attempt"""
+    tokens = []
+    for var, value in ((_call_site, call_site), (_player, player), (_attempt, attempt)):
+        if value is not None:
+            tokens.append((var, var.set(value)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+@contextmanager
+def held_records() -> Iterator[List[LLMCallRecord]]:
+    """
+    Hold back the records of the LLM calls made inside the context, e.g. for work whose result may
+    be thrown away. Pass the yielded list to Tracer.keep to collect them.
+    """
+    held: List[LLMCallRecord] = []
+    token = _held.set(held)
+    try:
+        yield held
+    finally:
+        _held.reset(token)
+
+
+def set_trace_turn(turn: Optional[int]) -> None:
+    """Attribute the following LLM calls (from this thread or task) to a turn"""
+    _turn.set(turn)
+
+
+class Tracer:
+    """Collects a record of every LLM call, see LLMClient"""
+
+    def __init__(self, max_records: int = DEFAULT_MAX_RECORDS):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._records: Deque[LLMCallRecord] = deque(maxlen=max_records)
+
+    @property
+    def records(self) -> List[LLMCallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def record(
+        self,
+        started_at: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        retries: int = 0,
+        cached: bool = False,
+        error: Optional[str] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+
+        record = LLMCallRecord(
+            call_site=_call_site.get(),
+            player=_player.get(),
+            turn=_turn.get(),
+            attempt=_attempt.get(),
+            started_at=started_at,
+            latency=time.time() - started_at,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            retries=retries,
+            cached=cached,
+            error=error,
+        )
+        held = _held.get()
+        if held is not None:
+            held.append(record)
+            return
+
+        with self._lock:
+            self._records.append(record)
+
+    def keep(self, held: List[LLMCallRecord]) -> None:
+        """Collect the records held back by held_records"""
+        with self._lock:
+            self._records.extend(held)
+        held.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def export_jsonl(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            for record in self.records:
+                file.write(record.model_dump_json() + "\n")
+
+    def summary(self) -> Dict[str, Any]:
+        """Latency percentiles, tokens and retries per call site, and tokens per turn"""
+        records = self.records
+
+        call_sites: Dict[str, Dict[str, Any]] = {}
+        for call_site in sorted({record.call_site for record in records}):
+            site_records = [record for record in records if record.call_site == call_site]
+            latencies = sorted(record.latency for record in site_records)
+            call_sites[call_site] = {
+                "calls": len(site_records),
+                "p50": _percentile(latencies, 0.5),
+                "p95": _percentile(latencies, 0.95),
+                "mean": statistics.fmean(latencies),
+                "prompt_tokens": sum(record.prompt_tokens for record in site_records),
+                "completion_tokens": sum(record.completion_tokens for record in site_records),
+                "retries": sum(record.retries for record in site_records),
+                "reasks": sum(record.attempt > 0 for record in site_records),
+                "cached": sum(record.cached for record in site_records),
+                "errors": sum(record.error is not None for record in site_records),
+            }
+
+        tokens_per_turn: Counter = Counter()
+        for record in records:
+            if record.turn is not None:
+                tokens_per_turn[record.turn] += record.prompt_tokens + record.completion_tokens
+
+        return {"call_sites": call_sites, "tokens_per_turn": dict(sorted(tokens_per_turn.items()))}
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))]
+
+
+tracer = Tracer()
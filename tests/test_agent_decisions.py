@@ -0,0 +1,82 @@
+from typing import Dict, List, Optional
+
+import pytest
+
+from src.models.action import ACTION_CATALOG, ActionType
+from src.models.card import CardType, create_card
+from src.models.players.agent import AgentPlayer
+from src.models.players.memory import AgentMemory
+from src.utils.api_interface import llm
+from src.utils.llm_backends import LLMBackend, LLMResponse, estimate_tokens
+
+
+class QueuedBackend(LLMBackend):
+    """Answers with the queued replies, in order"""
+
+    def __init__(self, replies: List[str]):
+        self.replies = list(replies)
+
+    async def create(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> LLMResponse:
+        return LLMResponse(content=self.replies.pop(0))
+
+
+@pytest.fixture
+def replies():
+    """Queue the replies of the shared client, and give it its backend back afterwards"""
+    previous = llm._backend
+
+    def queue(*contents: str) -> None:
+        llm.use_backend(QueuedBackend(contents))
+
+    yield queue
+    llm._backend = previous
+
+
+def decide_challenge(player: AgentPlayer, messages: List[Dict[str, str]]):
+    return llm.run(
+        player.make_decision(
+            "Do you challenge?",
+            [ACTION_CATALOG[ActionType.challenge], ACTION_CATALOG[ActionType.no_challenge]],
+            [],
+            messages,
+            "challenge",
+            with_reasoning=True,
+        )
+    )
+
+
+@pytest.mark.parametrize("reasoning", ['"reasoning": "",', '"reasoning": 3,', ""])
+def test_missing_reasoning_gets_its_own_feedback(replies, reasoning):
+    replies(
+        f'{{{reasoning} "challenge": true}}',
+        '{"reasoning": "They already lost a Duke", "challenge": true}',
+    )
+    player = AgentPlayer(name="Ada", personality="calm", cards=[create_card(CardType.duke)])
+    messages = []
+
+    assert decide_challenge(player, messages) is True
+    feedback = messages[-1]["content"]
+    assert '"reasoning" field' in feedback
+    assert "options" not in feedback
+
+
+def test_token_budget_covers_the_whole_prompt():
+    player = AgentPlayer(
+        name="Ada",
+        personality="Calm and patient. " * 20,
+        cards=[create_card(CardType.duke)],
+        inner_thoughts="Ben bluffs a lot. " * 200,
+        memory=AgentMemory(token_budget=400),
+    )
+    system_msg = player._system_msg(
+        "Do you challenge?", list(ACTION_CATALOG.values()), [], "Make your decision."
+    )
+
+    assert estimate_tokens(system_msg) <= 400
+    assert "Ben bluffs a lot." in system_msg
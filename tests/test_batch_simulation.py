@@ -0,0 +1,30 @@
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.handler.batch_simulation import parity_report  # noqa: E402
+
+GAMES = 2000
+# Win rates may differ by 4 standard errors of the difference of two independent estimates
+WIN_RATE_ERRORS = 4
+AVERAGE_TURNS_TOLERANCE = 0.03
+ACTION_SHARE_TOLERANCE = 0.01
+
+
+@pytest.mark.parametrize("number_of_players", [2, 4, 6])
+def test_batch_simulator_matches_the_game_handler(number_of_players):
+    report = parity_report(number_of_players, GAMES, seed=1)
+
+    handler_turns, batch_turns = report["average_turns"]
+    assert abs(batch_turns - handler_turns) <= AVERAGE_TURNS_TOLERANCE * handler_turns
+    assert report["unfinished_rate"] == (0.0, 0.0)
+
+    for name, (handler_value, batch_value) in report.items():
+        if name.startswith("win_rate"):
+            win_rate = (handler_value + batch_value) / 2
+            tolerance = WIN_RATE_ERRORS * math.sqrt(2 * win_rate * (1 - win_rate) / GAMES)
+            assert abs(batch_value - handler_value) <= tolerance, name
+        elif name.startswith("action_share"):
+            assert abs(batch_value - handler_value) <= ACTION_SHARE_TOLERANCE, name
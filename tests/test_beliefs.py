@@ -0,0 +1,103 @@
+from math import comb
+
+import pytest
+
+from src.models.action import ActionType
+from src.models.card import CardType
+from src.models.event import GameEvent, GameEventType
+from src.models.players.beliefs import CardBeliefs
+
+NAMES = ["Me", "AI 1", "AI 2"]
+
+
+def event(event_type: GameEventType, **fields) -> GameEvent:
+    return GameEvent(event_type=event_type, **fields)
+
+
+def build_beliefs(bluff_rate: float = 0.3) -> CardBeliefs:
+    """Beliefs of seat 0, holding a Duke and a Captain"""
+    beliefs = CardBeliefs("Me", bluff_rate)
+    beliefs.observe(event(GameEventType.game_start, players=NAMES))
+    beliefs.observe(event(GameEventType.deal, player=0, cards=[CardType.duke, CardType.captain]))
+    return beliefs
+
+
+def assert_normalized(beliefs: CardBeliefs, seat: int) -> None:
+    assert sum(beliefs.hand_probabilities(seat).values()) == pytest.approx(1.0)
+
+
+def test_prior_is_hypergeometric():
+    beliefs = build_beliefs()
+
+    # 2 of the 13 cards this player can't see are Dukes
+    assert beliefs.holds(1, CardType.duke) == pytest.approx(1 - comb(11, 2) / comb(13, 2))
+    assert beliefs.opponents == [1, 2]
+    assert_normalized(beliefs, 1)
+
+
+def test_claim_makes_the_card_more_likely():
+    beliefs = build_beliefs()
+    prior = beliefs.holds(1, CardType.duke)
+
+    beliefs.observe(event(GameEventType.action, player=1, action_type=ActionType.tax))
+
+    assert beliefs.holds(1, CardType.duke) > prior
+    assert beliefs.holds(2, CardType.duke) == pytest.approx(prior)
+    assert_normalized(beliefs, 1)
+
+
+def test_claims_are_ignored_with_a_bluff_rate_of_one():
+    beliefs = build_beliefs(bluff_rate=1.0)
+    prior = beliefs.holds(1, CardType.duke)
+
+    beliefs.observe(event(GameEventType.action, player=1, action_type=ActionType.tax))
+
+    assert beliefs.holds(1, CardType.duke) == pytest.approx(prior)
+
+
+def test_called_bluff_rules_the_card_out():
+    beliefs = build_beliefs()
+    beliefs.observe(event(GameEventType.action, player=1, action_type=ActionType.tax))
+    beliefs.observe(event(GameEventType.challenge, player=2, target=1, card_type=CardType.duke))
+    beliefs.observe(event(GameEventType.discard, player=1, card_type=CardType.contessa))
+
+    assert beliefs.holds(1, CardType.duke) == 0.0
+    assert all(len(hand) == 1 for hand in beliefs.hand_probabilities(1))
+    assert_normalized(beliefs, 1)
+
+
+def test_reveal_replaces_the_card_with_a_random_one():
+    beliefs = build_beliefs()
+    beliefs.observe(event(GameEventType.action, player=1, action_type=ActionType.tax))
+    claimed = beliefs.holds(1, CardType.duke)
+    beliefs.observe(event(GameEventType.challenge, player=2, target=1, card_type=CardType.duke))
+    beliefs.observe(event(GameEventType.reveal, player=1, card_type=CardType.duke))
+    # The challenger loses a card, which isn't a proven bluff of the claimant
+    beliefs.observe(event(GameEventType.discard, player=2, card_type=CardType.ambassador))
+
+    assert 0.0 < beliefs.holds(1, CardType.duke) < claimed
+    assert all(len(hand) == 2 for hand in beliefs.hand_probabilities(1))
+    assert_normalized(beliefs, 1)
+    assert_normalized(beliefs, 2)
+
+
+def test_exchange_forgets_the_claims():
+    beliefs = build_beliefs()
+    prior = beliefs.holds(1, CardType.duke)
+    beliefs.observe(event(GameEventType.action, player=1, action_type=ActionType.tax))
+    beliefs.observe(event(GameEventType.action, player=1, action_type=ActionType.exchange))
+    beliefs.observe(event(GameEventType.exchange, player=1, cards=[CardType.duke, CardType.duke]))
+
+    assert beliefs.holds(1, CardType.duke) == pytest.approx(prior)
+    assert_normalized(beliefs, 1)
+
+
+def test_discard_updates_every_opponent():
+    beliefs = build_beliefs()
+    beliefs.observe(event(GameEventType.discard, player=1, card_type=CardType.duke))
+
+    # 1 Duke left among the 12 cards this player can't see
+    assert beliefs.holds(2, CardType.duke) == pytest.approx(1 - comb(11, 2) / comb(12, 2))
+    # Of the 23 equally likely hands with a Duke, one holds a second Duke
+    assert beliefs.holds(1, CardType.duke) == pytest.approx(1 / 23)
+    assert "AI 1" in beliefs.render()
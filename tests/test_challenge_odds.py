@@ -0,0 +1,53 @@
+from math import comb
+
+import pytest
+
+from src.models.card import CardType, create_card
+from src.models.compact_state import CARD_CODES
+from src.models.event import GameEvent, GameEventType
+from src.models.players.challenge_odds import DiscardPile, claim_probability
+
+
+def hypergeometric(hidden_copies: int, hidden_cards: int, hand_size: int) -> float:
+    """Probability that a hand dealt from the hidden cards holds at least one of the copies"""
+    return 1 - comb(hidden_cards - hidden_copies, hand_size) / comb(hidden_cards, hand_size)
+
+
+@pytest.mark.parametrize(
+    "hidden_copies, hidden_cards, hand_size",
+    [(3, 13, 2), (3, 13, 1), (2, 11, 2), (1, 9, 2), (1, 5, 1), (2, 2, 2)],
+)
+def test_table_matches_the_closed_form(hidden_copies, hidden_cards, hand_size):
+    assert claim_probability(hidden_copies, hidden_cards, hand_size) == pytest.approx(
+        hypergeometric(hidden_copies, hidden_cards, hand_size), abs=1e-6
+    )
+
+
+def test_no_hidden_copies_means_a_bluff():
+    assert claim_probability(0, 10, 2) == 0.0
+
+
+def test_discard_pile_follows_the_game():
+    pile = DiscardPile()
+    own_cards = [create_card(CardType.duke), create_card(CardType.captain)]
+
+    # Own Duke: 2 of 13 hidden cards are Dukes
+    assert pile.claim_probability(CardType.duke, 2, own_cards) == pytest.approx(
+        hypergeometric(2, 13, 2)
+    )
+
+    pile.observe(GameEvent(event_type=GameEventType.discard, player=1, card_type=CardType.duke))
+    pile.observe(GameEvent(event_type=GameEventType.discard, player=2, card_type=CardType.contessa))
+    # Reveals go back into the deck and don't change the odds
+    pile.observe(GameEvent(event_type=GameEventType.reveal, player=1, card_type=CardType.duke))
+
+    assert pile.counts[CARD_CODES[CardType.duke]] == 1
+    assert pile.counts[CARD_CODES[CardType.contessa]] == 1
+    assert sum(pile.counts) == 2
+    assert sorted(pile.cards()) == sorted([CardType.duke, CardType.contessa])
+    assert pile.claim_probability(CardType.duke, 1, own_cards) == pytest.approx(
+        hypergeometric(1, 11, 1)
+    )
+
+    pile.observe(GameEvent(event_type=GameEventType.game_start, players=["AI 1", "AI 2", "AI 3"]))
+    assert sum(pile.counts) == 0
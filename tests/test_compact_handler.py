@@ -0,0 +1,81 @@
+from collections import Counter
+from typing import List, Tuple
+
+import pytest
+
+from src.handler.compact_handler import CompactGameHandler
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.handler.simulation import build_ai_players, simulate_compact_games, simulate_games
+from src.models.compact_state import ACTIONS, CompactGameState
+from src.models.event import GameEvent, GameEventType
+from src.utils.event_log import MemoryEventLog
+from src.utils.print import quiet_output
+
+GAMES = 200
+MAX_TURNS = 1000
+
+
+@pytest.mark.parametrize("number_of_players", [2, 4, 6])
+def test_seeded_compact_games_match_the_game_handler(number_of_players):
+    handler_results = simulate_games(number_of_players, GAMES, seed=7)
+    compact_results = simulate_compact_games(number_of_players, GAMES, seed=7)
+
+    assert compact_results == handler_results
+
+
+def snapshot(state: CompactGameState) -> Tuple:
+    players = range(state.number_of_players)
+    return (
+        list(state.coins),
+        [state.hand(player) for player in players],
+        bytes(state.deck),
+        state.treasury,
+        state.current_player,
+    )
+
+
+def play_side_by_side(number_of_players: int, seed: str) -> List[GameEvent]:
+    """Play a seeded game on both handlers, checking that every turn leaves the same state"""
+    event_log = MemoryEventLog()
+    handler = ResistanceCoupGameHandler(
+        number_of_players, players=build_ai_players(number_of_players), event_log=event_log
+    )
+    compact = CompactGameHandler(number_of_players)
+
+    with quiet_output():
+        handler.setup_game(seed)
+        compact.setup_game(seed)
+        assert snapshot(compact.state) == snapshot(handler.to_compact_state())
+
+        for turn_count in range(1, MAX_TURNS + 1):
+            end_state = handler.handle_turn(turn_count)
+            assert compact.handle_turn() == end_state
+            assert snapshot(compact.state) == snapshot(handler.to_compact_state()), turn_count
+            if end_state:
+                break
+
+    return event_log.events
+
+
+def test_compact_turns_match_the_game_handler_for_every_kind_of_turn():
+    events = [
+        event
+        for game_id in range(40)
+        for event in play_side_by_side(3 + game_id % 2, f"parity:{game_id}")
+    ]
+
+    # Every action, plus challenges that fail and succeed, counters and challenged counters
+    chosen_actions = {
+        event.action_type for event in events if event.event_type == GameEventType.action
+    }
+    assert chosen_actions == {action.action_type for action in ACTIONS}
+    kinds = Counter(event.event_type for event in events)
+    assert kinds[GameEventType.reveal] > 0
+    assert kinds[GameEventType.challenge] > kinds[GameEventType.reveal]
+    assert kinds[GameEventType.counter] > 0
+    assert kinds[GameEventType.exchange] > 0
+    countered_then_challenged = any(
+        first.event_type == GameEventType.counter and second.event_type == GameEventType.challenge
+        for first, second in zip(events, events[1:])
+    )
+    assert countered_then_challenged
@@ -0,0 +1,91 @@
+import asyncio
+import io
+from typing import Dict, List, Optional
+
+import pytest
+from rich.console import Console
+
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.models.action import ACTION_CATALOG, ActionType
+from src.models.players.agent import AgentPlayer
+from src.models.players.ai import AIPlayer
+from src.utils.api_interface import llm
+from src.utils import print as print_module
+from src.utils.event_loop import run_sync
+from src.utils.llm_backends import LLMBackend, LLMResponse
+from src.utils.tracing import tracer
+
+TAX = ACTION_CATALOG[ActionType.tax]
+
+
+class FirstAgentChallenges(LLMBackend):
+    """
+    Agent 1 challenges, Agent 2 is still deciding when it does and Agent 3 already answered invalid
+    JSON (so it fell back)
+    """
+
+    async def create(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> LLMResponse:
+        if response_format is None:
+            await asyncio.sleep(0.01)
+            return LLMResponse(content="Thinking", prompt_tokens=10, completion_tokens=1)
+        if "Your name is Agent 1" in messages[0]["content"]:
+            await asyncio.sleep(0.05)
+            return LLMResponse(content='{"challenge": true}', prompt_tokens=10, completion_tokens=5)
+        if "Your name is Agent 2" in messages[0]["content"]:
+            await asyncio.sleep(0.2)
+            return LLMResponse(
+                content='{"challenge": false}', prompt_tokens=10, completion_tokens=5
+            )
+        return LLMResponse(content="not json", prompt_tokens=10, completion_tokens=2)
+
+
+@pytest.fixture
+def first_agent_challenges():
+    """Answer the agents offline, and give the shared client its backend back afterwards"""
+    previous = llm._backend
+    llm.use_backend(FirstAgentChallenges())
+    tracer.clear()
+    yield
+    llm._backend = previous
+    tracer.clear()
+
+
+def test_discarded_deliberations_leave_no_trace(first_agent_challenges, monkeypatch):
+    output = io.StringIO()
+    monkeypatch.setattr(print_module, "console", Console(file=output, width=120))
+    claimant = AIPlayer(name="AI", think_delay=0)
+    agents = [
+        AgentPlayer(
+            name=f"Agent {seat}",
+            personality="calm",
+            think_delay=0,
+            decision_retries=0,
+            challenge_hints=False,
+        )
+        for seat in range(1, 4)
+    ]
+    handler = ResistanceCoupGameHandler(4, players=[claimant] + agents, concurrent_polling=True)
+    handler.setup_game(seed=0)
+
+    async def poll():
+        challenger = await handler._poll_players(
+            agents, lambda player: player.adetermine_challenge(claimant, TAX)
+        )
+        # Give deliberations that were not stopped the time to finish
+        await asyncio.sleep(0.3)
+        return challenger
+
+    assert run_sync(poll()) is agents[0]
+    assert "Agent 1 is thinking" in output.getvalue()
+    assert "Agent 2" not in output.getvalue()
+    assert "Agent 3" not in output.getvalue()
+    assert handler.decision_fallbacks == {}
+    assert {
+        record.player for record in tracer.records if record.call_site.startswith("decide")
+    } == {"Agent 1"}
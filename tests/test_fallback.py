@@ -0,0 +1,116 @@
+from typing import Dict, List, Optional
+
+import pytest
+
+from src.models.action import ACTION_CATALOG, ActionType
+from src.models.card import CardType, create_card
+from src.models.event import GameEvent, GameEventType
+from src.models.players import fallback
+from src.models.players.agent import AgentPlayer
+from src.models.players.ai import AIPlayer
+from src.models.players.challenge_odds import DiscardPile
+from src.models.players.memory import AgentMemory
+from src.utils.api_interface import llm
+from src.utils.llm_backends import LLMBackend, LLMResponse
+
+TAX = ACTION_CATALOG[ActionType.tax]
+
+
+class InvalidBackend(LLMBackend):
+    """Never answers valid JSON, so agents fall back"""
+
+    async def create(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> LLMResponse:
+        return LLMResponse(content="not json")
+
+
+@pytest.fixture
+def invalid_answers():
+    """Answer the agents offline, and give the shared client its backend back afterwards"""
+    previous = llm._backend
+    llm.use_backend(InvalidBackend())
+    yield
+    llm._backend = previous
+
+
+def build_player() -> AIPlayer:
+    return AIPlayer(name="AI 1", cards=[create_card(CardType.duke), create_card(CardType.captain)])
+
+
+def observe_game(memory: AgentMemory, *events: GameEvent) -> None:
+    start = GameEvent(event_type=GameEventType.game_start, players=["Ada", "AI 2"])
+    for event in (start,) + events:
+        memory.observe(event, "Ada")
+
+
+def test_card_revealed_in_a_defence_does_not_count_as_seen():
+    pile = DiscardPile()
+    # The Duke shown to win a challenge is shuffled back into the deck
+    pile.observe(GameEvent(event_type=GameEventType.reveal, player=1, card_type=CardType.duke))
+
+    assert pile.cards() == []
+    assert not fallback.determine_challenge(build_player(), TAX, pile.cards())
+
+
+def test_discarded_card_counts_as_seen():
+    pile = DiscardPile()
+    pile.observe(GameEvent(event_type=GameEventType.discard, player=1, card_type=CardType.duke))
+
+    assert pile.cards() == [CardType.duke]
+    assert fallback.determine_challenge(build_player(), TAX, pile.cards())
+
+
+def test_memory_follows_the_events_of_the_other_players():
+    memory = AgentMemory()
+    observe_game(
+        memory,
+        GameEvent(event_type=GameEventType.action, player=1, action_type=ActionType.tax),
+        GameEvent(event_type=GameEventType.counter, player=1, action_type=ActionType.steal),
+        GameEvent(event_type=GameEventType.reveal, player=1, card_type=CardType.duke),
+        GameEvent(event_type=GameEventType.discard, player=1, card_type=CardType.captain),
+        # Ada's own moves are not remembered as observations
+        GameEvent(event_type=GameEventType.action, player=0, action_type=ActionType.tax),
+        GameEvent(event_type=GameEventType.discard, player=0, card_type=CardType.contessa),
+    )
+
+    assert list(memory.opponents) == ["AI 2"]
+    assert memory.opponents["AI 2"].claims == {CardType.duke: 1, CardType.captain: 1}
+    assert "revealed Duke; lost Captain" in memory.render()
+
+
+def test_agent_fallback_counts_reset_between_games():
+    player = AgentPlayer(name="Ada", personality="Calm")
+    player.fallback_counts["challenge"] = 2
+    observe_game(
+        player.memory,
+        GameEvent(event_type=GameEventType.discard, player=1, card_type=CardType.duke),
+    )
+
+    player.reset_player()
+
+    assert player.fallback_counts == {}
+    assert player.memory.opponents == {}
+
+
+def test_agent_fallback_counts_own_discards(invalid_answers):
+    player = AgentPlayer(
+        name="Ada",
+        personality="Calm",
+        cards=[create_card(CardType.duke)],
+        think_delay=0,
+        decision_retries=0,
+        track_beliefs=False,
+        challenge_hints=False,
+    )
+    claimant = build_player()
+    # Ada lost her other Duke earlier
+    assert player.observes_events
+    player.observe(GameEvent(event_type=GameEventType.discard, player=0, card_type=CardType.duke))
+
+    assert llm.run(player.adetermine_challenge(claimant, TAX))
+    assert player.fallback_counts == {"challenge": 1}
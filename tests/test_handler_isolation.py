@@ -0,0 +1,75 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.handler.simulation import asimulate_game, game_seed, simulate_game
+from src.models.event import GameEvent
+from src.models.players.ai import AIPlayer
+from src.utils.event_log import MemoryEventLog
+
+NUMBER_OF_PLAYERS = 4
+GAMES = 8
+THINK_DELAY = 0.001
+
+Outcome = Tuple[str, int, List[GameEvent]]
+
+
+def build_handler() -> Tuple[ResistanceCoupGameHandler, MemoryEventLog]:
+    """
+    A handler with its own players and event log. One player tracks card beliefs, and the short
+    think delay makes concurrent games interleave.
+    """
+    players = [
+        AIPlayer(name=f"AI {seat + 1}", think_delay=THINK_DELAY)
+        for seat in range(NUMBER_OF_PLAYERS)
+    ]
+    players[0] = AIPlayer(
+        name="AI 1", think_delay=THINK_DELAY, track_beliefs=True, challenge_threshold=0.3
+    )
+    event_log = MemoryEventLog()
+    return (
+        ResistanceCoupGameHandler(NUMBER_OF_PLAYERS, players=players, event_log=event_log),
+        event_log,
+    )
+
+
+def play(game_id: int) -> Outcome:
+    handler, event_log = build_handler()
+    result = simulate_game(handler, seed=game_seed(0, game_id))
+    return result.winner, result.turn_count, event_log.events
+
+
+async def aplay(game_id: int) -> Outcome:
+    handler, event_log = build_handler()
+    result = await asimulate_game(handler, seed=game_seed(0, game_id))
+    return result.winner, result.turn_count, event_log.events
+
+
+def test_games_on_threads_match_sequential_games():
+    sequential = [play(game_id) for game_id in range(GAMES)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        threaded = list(executor.map(play, range(GAMES)))
+
+    assert threaded == sequential
+
+
+def test_games_on_one_event_loop_match_sequential_games():
+    sequential = [play(game_id) for game_id in range(GAMES)]
+
+    async def play_all() -> List[Outcome]:
+        return await asyncio.gather(*(aplay(game_id) for game_id in range(GAMES)))
+
+    assert asyncio.run(play_all()) == sequential
+
+
+def test_reused_handler_matches_fresh_handlers():
+    handler, event_log = build_handler()
+    reused = []
+    for game_id in range(GAMES):
+        start = len(event_log.events)
+        result = simulate_game(handler, seed=game_seed(0, game_id))
+        reused.append((result.winner, result.turn_count, event_log.events[start:]))
+
+    assert reused == [play(game_id) for game_id in range(GAMES)]
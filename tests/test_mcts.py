@@ -0,0 +1,85 @@
+import time
+from typing import List, Optional, Tuple
+
+from pydantic import Field
+
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.handler.simulation import game_seed, simulate_game
+from src.models.action import Action
+from src.models.card import Card
+from src.models.players.ai import AIPlayer
+from src.models.players.base import BasePlayer
+from src.models.players.mcts import MCTSPlayer
+
+NUMBER_OF_PLAYERS = 4
+TIME_BUDGET = 0.01
+
+
+class CheckedMCTSPlayer(MCTSPlayer):
+    """MCTSPlayer that checks every decision against the rules and times it"""
+
+    decision_times: List[float] = Field(default_factory=list)
+
+    def choose_action(self, other_players: List[BasePlayer]) -> Tuple[Action, Optional[BasePlayer]]:
+        start = time.perf_counter()
+        action, target_player = super().choose_action(other_players)
+        self.decision_times.append(time.perf_counter() - start)
+
+        assert action in self.available_actions()
+        if action.requires_target:
+            assert target_player in other_players and target_player.cards
+            assert self._validate_action(action, target_player)
+        else:
+            assert target_player is None
+        return action, target_player
+
+    def remove_card(self) -> None:
+        cards = len(self.cards)
+        super().remove_card()
+        assert len(self.cards) == cards - 1
+
+    def choose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
+        hand = sorted(card.card_type for card in self.cards + exchange_cards)
+        start = time.perf_counter()
+        first_card, second_card = super().choose_exchange_cards(exchange_cards)
+        self.decision_times.append(time.perf_counter() - start)
+
+        assert sorted(card.card_type for card in self.cards + [first_card, second_card]) == hand
+        return first_card, second_card
+
+
+def build_handler(mcts_player: MCTSPlayer) -> ResistanceCoupGameHandler:
+    players = [mcts_player] + [
+        AIPlayer(name=f"AI {seat}", think_delay=0) for seat in range(1, NUMBER_OF_PLAYERS)
+    ]
+    return ResistanceCoupGameHandler(NUMBER_OF_PLAYERS, players=players)
+
+
+def test_moves_are_legal_under_an_iteration_budget():
+    player = CheckedMCTSPlayer(name="MCTS", iterations=50)
+    for game_id in range(5):
+        simulate_game(build_handler(player), seed=game_seed(0, game_id))
+
+    assert player.decision_times
+
+
+def test_moves_are_legal_and_on_time_under_a_time_budget():
+    player = CheckedMCTSPlayer(name="MCTS", iterations=10**6, time_budget=TIME_BUDGET)
+    for game_id in range(3):
+        simulate_game(build_handler(player), seed=game_seed(0, game_id))
+
+    # One iteration may run past the budget, never many
+    assert max(player.decision_times) < TIME_BUDGET + 0.1
+
+
+def test_seeded_win_rate_against_random_players():
+    games = 40
+    wins = 0
+    for game_id in range(games):
+        player = MCTSPlayer(name="MCTS", iterations=50)
+        result = simulate_game(build_handler(player), seed=game_seed(0, game_id))
+        wins += result.winner == "MCTS"
+
+    # A random player wins about a quarter of the games, 20 wins out of 40 has a chance below
+    # 0.1% of happening at that rate
+    assert wins >= games // 2
@@ -0,0 +1,72 @@
+from array import array
+from typing import List
+
+import pytest
+
+from src.handler.open_hand_lookahead import OpenHandLookahead
+from src.models.card import CardType
+from src.models.compact_state import CARD_CODES, COUP, DECK_COMPOSITION, NO_CARD, CompactGameState
+
+DUKE = CARD_CODES[CardType.duke]
+CONTESSA = CARD_CODES[CardType.contessa]
+CAPTAIN = CARD_CODES[CardType.captain]
+TOTAL_COINS = 50
+
+
+def build_state(
+    hands: List[List[int]], coins: List[int], current_player: int = 0
+) -> CompactGameState:
+    """A state where every card that isn't in a hand has been discarded or is in the deck"""
+    packed = bytearray()
+    deck = list(DECK_COMPOSITION)
+    for hand in hands:
+        packed.extend(hand + [NO_CARD] * (2 - len(hand)))
+        for card in hand:
+            deck[card] -= 1
+
+    return CompactGameState(
+        array("B", coins),
+        packed,
+        bytearray(card for card, count in enumerate(deck) for _ in range(count)),
+        TOTAL_COINS - sum(coins),
+        current_player,
+    )
+
+
+def test_forced_coup_wins():
+    state = build_state([[DUKE, CAPTAIN], [CONTESSA]], [10, 0])
+    lookahead = OpenHandLookahead(depth=1)
+
+    assert lookahead.action_scores(state) == {(COUP, 1): 1.0}
+    assert lookahead.best_action(state) == ((COUP, 1), 1.0)
+    assert lookahead.score(state) == 1.0
+
+
+def test_forced_loss_against_a_coup_next_turn():
+    # Whatever the player to move does, the opponent still has 7 coins to coup their last card
+    state = build_state([[DUKE], [CONTESSA]], [0, 9])
+
+    assert OpenHandLookahead(depth=2).score(state) == 0.0
+
+
+def test_score_is_from_the_player_to_move():
+    state = build_state([[CONTESSA], [DUKE, CAPTAIN]], [9, 10], current_player=1)
+
+    assert OpenHandLookahead(depth=1).score(state) == 1.0
+
+
+def test_scores_are_bounded_and_the_best_action_scores_highest():
+    state = build_state([[DUKE, CAPTAIN], [CONTESSA, CAPTAIN]], [2, 2])
+    lookahead = OpenHandLookahead(depth=2)
+    scores = lookahead.action_scores(state)
+
+    assert all(0.0 <= score <= 1.0 for score in scores.values())
+    best, best_score = lookahead.best_action(state)
+    assert best_score == max(scores.values()) == scores[best]
+
+
+def test_needs_two_active_players():
+    state = build_state([[DUKE], [CONTESSA], [CAPTAIN]], [0, 0, 0])
+
+    with pytest.raises(ValueError):
+        OpenHandLookahead().action_scores(state)
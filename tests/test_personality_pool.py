@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import random
+from typing import Set
+
+from src.utils import personality_pool
+from src.utils.personality_pool import PersonalityPool
+
+
+def numbered_name(gender: str, taken: Set[str]) -> str:
+    return f"{gender} {len(taken)}"
+
+
+async def fake_personality(name: str, gender: str) -> str:
+    return f"{name} plays calmly"
+
+
+async def failing_personality(name: str, gender: str) -> str:
+    raise RuntimeError("The LLM is down")
+
+
+async def refill_in_background(pool: PersonalityPool) -> None:
+    pool.refill_in_background()
+    await asyncio.wait([pool._refill_task])
+    # Let the done callbacks run
+    await asyncio.sleep(0)
+
+
+def test_seeded_refills_pick_the_same_personalities(tmp_path, monkeypatch):
+    monkeypatch.setattr(personality_pool, "random_name", numbered_name)
+    monkeypatch.setattr(personality_pool, "generate_personality", fake_personality)
+
+    pools = [
+        PersonalityPool(path=str(tmp_path / f"pool_{ind}.json"), size=8, rng=random.Random(5))
+        for ind in range(2)
+    ]
+    for pool in pools:
+        asyncio.run(refill_in_background(pool))
+
+    assert len(pools[0]) == 8
+    assert pools[0]._personalities == pools[1]._personalities
+
+
+def test_failed_refill_is_logged(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(personality_pool, "random_name", numbered_name)
+    monkeypatch.setattr(personality_pool, "generate_personality", failing_personality)
+    pool = PersonalityPool(path=str(tmp_path / "pool.json"), size=4)
+
+    with caplog.at_level(logging.WARNING, logger=personality_pool.__name__):
+        asyncio.run(refill_in_background(pool))
+
+    assert len(pool) == 0
+    assert "Refilling the personality pool failed" in caplog.text
+    assert "The LLM is down" in caplog.text
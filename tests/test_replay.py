@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from src.handler.replay import replay_game, verify_replay
+from src.handler.simulation import simulate_games
+from src.models.event import GameEventType
+from src.utils.event_log import (
+    MemoryEventLog,
+    decode_events,
+    encode_event,
+    open_event_log,
+    read_events,
+    split_games,
+)
+
+NUMBER_OF_PLAYERS = 4
+GAMES = 20
+
+
+@pytest.fixture(scope="module")
+def recorded_games():
+    event_log = MemoryEventLog()
+    simulate_games(NUMBER_OF_PLAYERS, GAMES, seed=3, event_log=event_log)
+    return list(split_games(event_log.events))
+
+
+def test_seeded_games_replay_exactly(recorded_games):
+    assert len(recorded_games) == GAMES
+    for events in recorded_games:
+        assert verify_replay(events)
+
+
+def test_tampered_game_does_not_verify(recorded_games):
+    events = list(recorded_games[0])
+    action = next(
+        ind for ind, event in enumerate(events) if event.event_type == GameEventType.action
+    )
+    events[action] = events[action].model_copy(update={"turn": events[action].turn + 1})
+
+    assert not verify_replay(events)
+    assert replay_game(recorded_games[0]) == recorded_games[0]
+
+
+def test_binary_records_round_trip(recorded_games):
+    events = [event for game in recorded_games for event in game]
+    stream = io.BytesIO(b"".join(encode_event(event) for event in events))
+
+    assert list(decode_events(stream)) == events
+
+
+def test_truncated_binary_record_is_rejected(recorded_games):
+    record = encode_event(recorded_games[0][0])
+
+    with pytest.raises(ValueError):
+        list(decode_events(io.BytesIO(record[:-1])))
+
+
+@pytest.mark.parametrize("file_name", ["games.bin", "games.jsonl"])
+def test_event_log_files_round_trip(tmp_path, recorded_games, file_name):
+    path = str(tmp_path / file_name)
+    with open_event_log(path) as event_log:
+        for game in recorded_games:
+            for event in game:
+                event_log.write(event)
+
+    assert list(split_games(read_events(path))) == recorded_games
@@ -0,0 +1,77 @@
+from typing import List, Optional, Tuple
+
+import pytest
+
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.models.action import ACTION_CATALOG, Action, ActionType
+from src.models.card import Card
+from src.models.event import GameEventType
+from src.models.players.agent import AgentPlayer
+from src.models.players.base import BasePlayer
+from src.utils.api_interface import llm
+from src.utils.llm_backends import ScriptedBackend
+
+
+class ScriptedHuman(BasePlayer):
+    """A human player that always claims the same action and never challenges or counters"""
+
+    is_ai: bool = False
+    action_type: ActionType = ActionType.tax
+
+    def choose_action(self, other_players: List[BasePlayer]) -> Tuple[Action, Optional[BasePlayer]]:
+        return ACTION_CATALOG[self.action_type], None
+
+    def determine_challenge(self, player: BasePlayer, action: Action) -> bool:
+        return False
+
+    def determine_counter(self, player: BasePlayer, action: Action) -> bool:
+        return False
+
+    def remove_card(self) -> None:
+        self.cards.pop()
+
+    def choose_exchange_cards(self, exchange_cards: list[Card]) -> Tuple[Card, Card]:
+        self.cards += exchange_cards
+        return self.cards.pop(), self.cards.pop()
+
+
+@pytest.fixture
+def scripted_backend():
+    """Answer the agents offline, and give the shared client its backend back afterwards"""
+    previous = llm._backend
+    llm.use_backend(ScriptedBackend())
+    yield
+    llm._backend = previous
+
+
+def test_speculated_reaction_is_reused_with_card_beliefs(scripted_backend):
+    human = ScriptedHuman(name="Human")
+    agents = [
+        AgentPlayer(name=f"Agent {seat}", personality="calm", think_delay=0, track_beliefs=True)
+        for seat in range(1, 4)
+    ]
+    handler = ResistanceCoupGameHandler(4, players=[human] + agents)
+    handler.setup_game(seed=0)
+
+    # The human is to move and has claimed Tax before, so Tax is the predicted action
+    handler._current_player_index = 0
+    handler._player_action_counts[human.name][ActionType.tax] = 1
+
+    # Note when the belief trackers get to see the action
+    observed = []
+    for agent in agents:
+        beliefs = agent._beliefs
+
+        def observe(event, beliefs=beliefs, observe=beliefs.observe):
+            if event.event_type == GameEventType.action:
+                observed.append(dict(handler.speculation_stats))
+            observe(event)
+
+        beliefs.observe = observe
+
+    handler.handle_turn(1)
+
+    assert handler.speculation_stats["hits"] == 1
+    assert handler.speculation_stats["misses"] == 0
+    # The claim still reaches every belief tracker, once the agents have reacted to it
+    assert observed == [{"hits": 1}] * len(agents)